@@ -1,6 +1,8 @@
 from json import dumps, loads
 from typing import TYPE_CHECKING, Any
 
+from sequence.kernel.quantum_state import State, BINARY_MAGIC
+
 if TYPE_CHECKING:
     from socket import socket
 
@@ -9,21 +11,44 @@ BYTE_ORDER = "big"
 
 
 def send_msg_with_length(socket: "socket", msg: Any):
-    msg_byte = dumps(msg)
-    data = len(msg_byte).to_bytes(LEN_BYTE_LEN, BYTE_ORDER) + msg_byte.encode(
-        'utf-8')
-    socket.sendall(data)
+    """Sends a length-prefixed message.
+
+    `State` objects are sent in binary format (see `State.serialize_binary`) without copying the state buffer;
+    all other messages are sent as JSON.
+    """
+
+    if isinstance(msg, State):
+        buffers = msg.serialize_binary()
+        length = sum(len(buf) for buf in buffers)
+        socket.sendall(length.to_bytes(LEN_BYTE_LEN, BYTE_ORDER))
+        for buf in buffers:
+            socket.sendall(buf)
+    else:
+        msg_byte = dumps(msg).encode('utf-8')
+        socket.sendall(len(msg_byte).to_bytes(LEN_BYTE_LEN, BYTE_ORDER) + msg_byte)
+
+
+def _recv_exact(socket: "socket", length: int) -> bytearray:
+    data = bytearray(length)
+    view = memoryview(data)
+    received = 0
+    while received < length:
+        size = socket.recv_into(view[received:], length - received)
+        if size == 0:
+            raise ConnectionError("Socket closed before full message was received")
+        received += size
+    return data
 
 
 def recv_msg_with_length(socket: "socket") -> Any:
-    length_byte = socket.recv(LEN_BYTE_LEN)
-    length = int.from_bytes(length_byte, BYTE_ORDER)
-    all_data = ''
-    while len(all_data) < length:
-        received_data = socket.recv(length)
-        if all_data == '':
-            all_data = received_data
-        else:
-            all_data += received_data
+    """Receives a length-prefixed message.
+
+    Binary messages are returned as `State` objects viewing the receive buffer; JSON messages are decoded.
+    """
+
+    length = int.from_bytes(_recv_exact(socket, LEN_BYTE_LEN), BYTE_ORDER)
+    all_data = _recv_exact(socket, length)
+    if all_data[:len(BINARY_MAGIC)] == BINARY_MAGIC:
+        return State.deserialize_binary(all_data)
     received_msg = loads(all_data)
     return received_msg
@@ -18,7 +18,7 @@ class ParallelQuantumManagerKet(QuantumManagerKet):
 
     def __init__(self, states):
         super().__init__()
-        self.states = states
+        self.set_states(states)
 
     def run_circuit(self, circuit: "Circuit", keys: List[int],
                     meas_samp=None) -> Dict[int, int]:
@@ -34,7 +34,7 @@ class ParallelQuantumManagerDensity(QuantumManagerDensity):
 
     def __init__(self, states):
         super().__init__()
-        self.states = states
+        self.set_states(states)
 
     def run_circuit(self, circuit: "Circuit", keys: List[int],
                     meas_samp=None) -> Dict[int, int]:
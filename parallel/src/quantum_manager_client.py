@@ -11,6 +11,7 @@ from time import time
 from uuid import uuid4
 from sequence.kernel.quantum_manager import QuantumManagerKet, QuantumManagerDensity, KetState, \
     KET_STATE_FORMALISM, DENSITY_MATRIX_FORMALISM
+from sequence.kernel.quantum_state import State
 from sequence.components.circuit import Circuit
 from .communication import send_msg_with_length, recv_msg_with_length
 
@@ -101,6 +102,9 @@ class QuantumManagerClient:
         else:
             state_raw = self._send_message(QuantumManagerMsgType.GET, [key],
                                            [])
+            if isinstance(state_raw, State):
+                return state_raw
+            # JSON reply (e.g. from C++ server)
             state = KetState([0, 1], [0])
             state.deserialize(state_raw)
             return state
@@ -164,6 +168,14 @@ class QuantumManagerClient:
         self._send_message(QuantumManagerMsgType.REMOVE, [key], [])
         self.qm.remove(key)
 
+    def set_owner(self, key: int, owner: any) -> None:
+        # ownership is only tracked for qubits of the local quantum manager (for `get_leak_report`)
+        self.qm.set_owner(key, owner)
+
+    def release(self, key: int) -> None:
+        # keys are uuids and are never recycled; releasing is equivalent to removing
+        self.remove(key)
+
     def kill(self) -> None:
         """Method to terminate the connected server.
 
@@ -196,8 +196,8 @@ def start_server(ip: str, port: int, client_num, formalism="KET", log_file="serv
 
                 elif msg.type == QuantumManagerMsgType.GET:
                     assert len(msg.args) == 0
-                    state = qm.get(msg.keys[0])
-                    return_val = state.serialize()
+                    # states are sent in binary format (see `communication.send_msg_with_length`)
+                    return_val = qm.get(msg.keys[0])
 
                 elif msg.type == QuantumManagerMsgType.RUN:
                     assert len(msg.args) == 2 or len(msg.args) == 3
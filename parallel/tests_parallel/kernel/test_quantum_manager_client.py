@@ -0,0 +1,40 @@
+from socket import socket
+
+from sequence.kernel.timeline import Timeline
+from sequence.kernel.quantum_manager import KET_STATE_FORMALISM
+from sequence.components.memory import Memory, MemoryArray
+from sequence.components.photon import Photon
+from sequence.utils.encoding import absorptive
+
+from psequence.quantum_manager_client import QuantumManagerClient
+
+
+def build_client():
+    # listening socket accepting the client connection (no messages are exchanged with the server)
+    server = socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    ip, port = server.getsockname()
+    return server, QuantumManagerClient(KET_STATE_FORMALISM, ip, port)
+
+
+def test_client_memory():
+    server, client = build_client()
+    tl = Timeline()
+    tl.quantum_manager = client
+
+    memory = Memory("mem", tl, fidelity=1, frequency=0, efficiency=1, coherence_time=-1, wavelength=500)
+    assert memory.qstate_key in client.managed_qubits
+
+    # keys of the client are 128-bit integers
+    memory_array = MemoryArray("memory_array", tl, num_memories=2)
+    for memory in memory_array:
+        assert memory.qstate_key in client.managed_qubits
+
+    photon = Photon("", tl, encoding_type=absorptive, use_qm=True)
+    key = photon.quantum_state
+    assert client.qm.get_leak_report() == []
+    del photon
+    assert client.qm.get_leak_report() == [key]
+
+    server.close()
@@ -6,14 +6,14 @@ Also defined is a function to automatically construct a BSM of a specified type.
 """
 
 from abc import abstractmethod
-from typing import TYPE_CHECKING, Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
 
 if TYPE_CHECKING:
     from ..kernel.quantum_manager import QuantumManager
     from ..kernel.quantum_state import State
     from ..kernel.timeline import Timeline
 
-from numpy import outer, add, zeros, array_equal
+from numpy import outer, add, zeros, array_equal, asarray, diagonal
 
 from .circuit import Circuit
 from .detector import Detector
@@ -84,6 +84,46 @@ def _set_pure_state(keys: List[int], ket_state: List[complex], qm: "QuantumManag
                                   "function of bsm.py".format(qm.formalism))
 
 
+def _measure_pair(keys: List[int], states: List["State"], samples: List[float]) -> Tuple[int, int]:
+    """Function to sample the computational basis measurement results of two qubits jointly.
+
+    Gives the same results as measuring each key in turn with the quantum manager using the given samples,
+    but uses the outcome distribution of the (at most two-qubit) states directly and does not update the states.
+
+    Args:
+        keys (List[int]): keys of the two qubits.
+        states (List[State]): states stored at each key (ket vectors or density matrices).
+        samples (List[float]): random samples used for each measurement result.
+
+    Returns:
+        Tuple[int, int]: measurement results, or None if the qubits are entangled with other subsystems.
+    """
+
+    state0, state1 = states
+    if state0 is state1:
+        if len(state0.keys) != 2:
+            return None
+        probabilities = _basis_probabilities(state0.state).reshape((2, 2))
+        if state0.keys[0] != keys[0]:
+            probabilities = probabilities.T
+    elif len(state0.keys) == 1 and len(state1.keys) == 1:
+        probabilities = outer(_basis_probabilities(state0.state), _basis_probabilities(state1.state))
+    else:
+        return None
+
+    meas0 = 0 if samples[0] < probabilities[0].sum() else 1
+    conditional = probabilities[meas0]
+    meas1 = 0 if samples[1] < conditional[0] / conditional.sum() else 1
+    return meas0, meas1
+
+
+def _basis_probabilities(state) -> "array":
+    state = asarray(state)
+    if state.ndim == 1:
+        return abs(state) ** 2
+    return diagonal(state).real
+
+
 def _eq_psi_plus(state: "State", formalism: str):
     if formalism == KET_STATE_FORMALISM:
         return array_equal(state.state, BSM._psi_plus)
@@ -171,6 +211,8 @@ class BSM(Entity):
         # check if photon arrived later than current photon
         if self.photon_arrival_time < self.timeline.now():
             # clear photons
+            for reference in self.photons:
+                reference.release()
             self.photons = [photon]
             # set arrival time
             self.photon_arrival_time = self.timeline.now()
@@ -199,6 +241,12 @@ class BSM(Entity):
         for detector in self.detectors:
             detector.__setattr__(arg_name, value)
 
+    def flush_dark_counts(self) -> None:
+        """Method to record pending dark counts of attached detectors in lazy mode (see `Detector.flush_dark_counts`)."""
+
+        for detector in self.detectors:
+            detector.flush_dark_counts()
+
 
 class PolarizationBSM(BSM):
     """Class modeling a polarization BSM device.
@@ -467,8 +515,23 @@ class SingleAtomBSM(BSM):
             key0, key1 = p0.quantum_state, p1.quantum_state
             keys = [key0, key1]
             state0, state1 = qm.get(key0), qm.get(key1)
-            meas0, meas1 = [qm.run_circuit(self._meas_circuit, [key], self.get_generator().random())[key]
-                            for key in keys]
+            samples = [self.get_generator().random(), self.get_generator().random()]
+
+            result = None
+            if qm.formalism in (KET_STATE_FORMALISM, DENSITY_MATRIX_FORMALISM):
+                # sample both results from the joint outcome distribution; states are set below
+                result = _measure_pair(keys, [state0, state1], samples)
+            if result is None:
+                meas0, meas1 = [qm.run_circuit(self._meas_circuit, [key], sample)[key]
+                                for key, sample in zip(keys, samples)]
+            else:
+                meas0, meas1 = result
+                if not meas0 ^ meas1:
+                    for key, meas in zip(keys, result):
+                        if meas:
+                            qm.set_to_one(key)
+                        else:
+                            qm.set_to_zero(key)
 
             log.logger.debug(self.name + " measured photons as {}, {}".format(meas0, meas1))
 
@@ -592,6 +655,9 @@ class AbsorptiveBSM(BSM):
                 combined = other_keys_0 + other_keys_1
                 self.timeline.quantum_manager.set(combined, BSM._psi_plus)
 
+            for reference in self.photons:
+                reference.release()
+
     def trigger(self, detector: Detector, info: Dict[str, Any]):
         """See base class.
 
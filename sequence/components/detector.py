@@ -8,7 +8,7 @@ QSDetector is defined as an abstract template and as implementations for polariz
 
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, Any, Dict, List
-from numpy import eye, kron, exp, sqrt
+from numpy import eye, kron, exp, sqrt, cumsum, empty, int64, ndarray
 from scipy.linalg import fractional_matrix_power
 from math import factorial
 
@@ -41,12 +41,18 @@ class Detector(Entity):
         count_rate (float): maximum detection rate; defines detector cooldown time.
         time_resolution (int): minimum resolving power of photon arrival time (in ps).
         photon_counter (int): counts number of detection events.
+        lazy_dark_counts (bool): whether dark counts are generated in batches and recorded when the detector
+            is next used (see `flush_dark_counts`), instead of by scheduled events (default False).
     """
 
     _meas_circuit = Circuit(1)
     _meas_circuit.measure(0)
 
-    def __init__(self, name: str, timeline: "Timeline", efficiency: float = 0.9, dark_count: float = 0, count_rate: float = 25e6, time_resolution: int = 150):
+    # number of dark count times generated at once in lazy mode
+    _DARK_COUNT_BATCH = 256
+
+    def __init__(self, name: str, timeline: "Timeline", efficiency: float = 0.9, dark_count: float = 0, count_rate: float = 25e6, time_resolution: int = 150,
+                 lazy_dark_counts: bool = False):
         Entity.__init__(self, name, timeline)  # Detector is part of the QSDetector, and does not have its own name
         self.efficiency = efficiency
         self.dark_count = dark_count  # measured in 1/s
@@ -54,12 +60,17 @@ class Detector(Entity):
         self.time_resolution = time_resolution  # measured in ps
         self.next_detection_time = -1
         self.photon_counter = 0
+        self.lazy_dark_counts = lazy_dark_counts
+        self._dark_count_times = [timeline.now()]  # times of generated dark counts in lazy mode
+        self._dark_count_index = 1  # index of next dark count to record
 
     def init(self):
         """Implementation of Entity interface (see base class)."""
         self.next_detection_time = -1
         self.photon_counter = 0
-        if self.dark_count > 0:
+        self._dark_count_times = [self.timeline.now()]
+        self._dark_count_index = 1
+        if self.dark_count > 0 and not self.lazy_dark_counts:
             self.add_dark_count()
 
     def get(self, photon=None, **kwargs) -> None:
@@ -82,6 +93,9 @@ class Detector(Entity):
             if not res[key]:
                 return
 
+        if photon:
+            photon.release()  # photon is absorbed by the detector
+
         if self.get_generator().random() < self.efficiency:
             self.record_detection()
         else:
@@ -109,6 +123,35 @@ class Detector(Entity):
         self.timeline.schedule(event1)
         self.timeline.schedule(event2)
 
+    def flush_dark_counts(self, time: int = None) -> None:
+        """Method to record the dark counts up to a given time, in lazy dark count mode.
+
+        Dark count times are generated in batches, with exponentially distributed gaps (a Poisson process).
+        They are recorded in order (including the detector dead time) before each photon detection
+        of this detector or of another detector with the same observers (see `record_detection`),
+        and when `QSDetector.get_photon_times` is called.
+        Observers are notified with the dark count time, but the simulation time is not changed.
+
+        Args:
+            time (int): time up to which dark counts are recorded (default None to use the current time).
+        """
+
+        if not self.lazy_dark_counts or self.dark_count <= 0:
+            return
+        if time is None:
+            time = self.timeline.now()
+
+        while True:
+            if self._dark_count_index == len(self._dark_count_times):
+                gaps = self.get_generator().exponential(1 / self.dark_count, self._DARK_COUNT_BATCH) * 1e12
+                self._dark_count_times = (cumsum(gaps.astype(int64)) + self._dark_count_times[-1]).tolist()
+                self._dark_count_index = 0
+            dark_count_time = self._dark_count_times[self._dark_count_index]
+            if dark_count_time > time:
+                break
+            self._dark_count_index += 1
+            self._record(dark_count_time)
+
     def record_detection(self):
         """Method to record a detection event.
 
@@ -117,7 +160,15 @@ class Detector(Entity):
         """
 
         now = self.timeline.now()
+        # record earlier lazy dark counts first, including those of the other detectors of observers
+        # (e.g. of a QSDetector or BSM), so that observers are notified in time order
+        self.flush_dark_counts(now)
+        for observer in self._observers:
+            if hasattr(observer, "flush_dark_counts"):
+                observer.flush_dark_counts()
+        self._record(now)
 
+    def _record(self, now: int) -> None:
         if now > self.next_detection_time:
             time = round(now / self.time_resolution) * self.time_resolution
             self.notify({'time': time})
@@ -130,6 +181,54 @@ class Detector(Entity):
             observer.trigger(self, info)
 
 
+class TimeBuffer:
+    """Growable buffer of detection times, stored in an int64 array.
+
+    The array doubles in size when full.
+    `take` returns the recorded times without copying, and starts a new array for later times.
+    """
+
+    _INITIAL_CAPACITY = 64
+
+    def __init__(self):
+        self._data = empty(self._INITIAL_CAPACITY, dtype=int64)
+        self._size = 0
+
+    def append(self, time: int) -> None:
+        if self._size == len(self._data):
+            data = empty(2 * len(self._data), dtype=int64)
+            data[:self._size] = self._data
+            self._data = data
+        self._data[self._size] = time
+        self._size += 1
+
+    def view(self) -> ndarray:
+        """Method to get the recorded times (a view of the buffer, valid until the next `append` or `take`)."""
+
+        return self._data[:self._size]
+
+    def take(self) -> ndarray:
+        """Method to get the recorded times and clear the buffer.
+
+        Returns:
+            ndarray: recorded times. The array is not reused by the buffer.
+        """
+
+        times = self._data[:self._size]
+        self._data = empty(len(self._data), dtype=int64)
+        self._size = 0
+        return times
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        return self.view()[index]
+
+    def __iter__(self):
+        return iter(self.view().tolist())
+
+
 class QSDetector(Entity, ABC):
     """Abstract QSDetector parent class.
 
@@ -140,7 +239,7 @@ class QSDetector(Entity, ABC):
         timeline (Timeline): timeline for simulation.
         components (List[entity]): list of all aggregated hardware components.
         detectors (List[Detector]): list of attached detectors.
-        trigger_times (List[List[int]]): tracks simulation time of detection events for each detector.
+        trigger_times (List[TimeBuffer]): tracks simulation time of detection events for each detector.
     """
 
     def __init__(self, name: str, timeline: "Timeline"):
@@ -183,8 +282,32 @@ class QSDetector(Entity, ABC):
         detector.count_rate = count_rate
         detector.time_resolution = time_resolution
 
-    def get_photon_times(self):
-        return self.trigger_times
+    def get_photon_times(self) -> List[List[int]]:
+        """Method to get the detection times of each detector, and clear them.
+
+        Returns:
+            List[List[int]]: list of detection times (in ps) for each detector.
+        """
+
+        return [times.tolist() for times in self.get_photon_time_arrays()]
+
+    def get_photon_time_arrays(self) -> List[ndarray]:
+        """Method to get the detection times of each detector as arrays, and clear them.
+
+        The arrays are not copied from the detection buffers; later detections are recorded in new buffers.
+
+        Returns:
+            List[ndarray]: int64 array of detection times (in ps) for each detector.
+        """
+
+        self.flush_dark_counts()
+        return [buffer.take() for buffer in self.trigger_times]
+
+    def flush_dark_counts(self) -> None:
+        """Method to record pending dark counts of attached detectors in lazy mode (see `Detector.flush_dark_counts`)."""
+
+        for detector in self.detectors:
+            detector.flush_dark_counts()
 
     @abstractmethod
     def set_basis_list(self, basis_list: List[int], start_time: int, frequency: float) -> None:
@@ -201,7 +324,7 @@ class QSDetectorPolarization(QSDetector):
         name (str): label for QSDetector instance.
         timeline (Timeline): timeline for simulation.
         detectors (List[Detector]): list of attached detectors (length 2).
-        trigger_times (List[List[int]]): tracks simulation time of detection events for each detector.
+        trigger_times (List[TimeBuffer]): tracks simulation time of detection events for each detector.
         splitter (BeamSplitter): internal beamsplitter object.
     """
 
@@ -214,7 +337,7 @@ class QSDetectorPolarization(QSDetector):
         self.splitter = BeamSplitter(name + ".splitter", timeline)
         self.splitter.add_receiver(self.detectors[0])
         self.splitter.add_receiver(self.detectors[1])
-        self.trigger_times = [[], []]
+        self.trigger_times = [TimeBuffer(), TimeBuffer()]
 
         self.components = [self.splitter] + self.detectors
 
@@ -238,11 +361,6 @@ class QSDetectorPolarization(QSDetector):
 
         self.splitter.get(photon)
 
-    def get_photon_times(self):
-        times = self.trigger_times
-        self.trigger_times = [[], []]
-        return times
-
     def set_basis_list(self, basis_list: List[int], start_time: int, frequency: float) -> None:
         self.splitter.set_basis_list(basis_list, start_time, frequency)
 
@@ -261,7 +379,7 @@ class QSDetectorTimeBin(QSDetector):
         name (str): label for QSDetector instance.
         timeline (Timeline): timeline for simulation.
         detectors (List[Detector]): list of attached detectors (length 3).
-        trigger_times (List[List[int]]): tracks simulation time of detection events for each detector.
+        trigger_times (List[TimeBuffer]): tracks simulation time of detection events for each detector.
         switch (Switch): internal optical switch component.
         interferometer (Interferometer): internal interferometer component.
     """
@@ -277,7 +395,7 @@ class QSDetectorTimeBin(QSDetector):
         self.switch.add_receiver(self.interferometer)
 
         self.components = [self.switch, self.interferometer] + self.detectors
-        self.trigger_times = [[], [], []]
+        self.trigger_times = [TimeBuffer(), TimeBuffer(), TimeBuffer()]
 
     def init(self):
         """Implementation of Entity interface (see base class)."""
@@ -299,10 +417,6 @@ class QSDetectorTimeBin(QSDetector):
 
         self.switch.get(photon)
 
-    def get_photon_times(self):
-        times, self.trigger_times = self.trigger_times, [[], [], []]
-        return times
-
     def set_basis_list(self, basis_list: List[int], start_time: int, frequency: float) -> None:
         self.switch.set_basis_list(basis_list, start_time, frequency)
 
@@ -320,7 +434,7 @@ class QSDetectorFockDirect(QSDetector):
         timeline (Timeline): timeline for simulation.
         src_list (List[str]): list of two sources which send photons to this detector (length 2).
         detectors (List[Detector]): list of attached detectors (length 2).
-        trigger_times (List[List[int]]): tracks simulation time of detection events for each detector.
+        trigger_times (List[TimeBuffer]): tracks simulation time of detection events for each detector.
         arrival_times (List[List[int]]): tracks simulation time of Photon arrival at each input port
     """
 
@@ -334,7 +448,7 @@ class QSDetectorFockDirect(QSDetector):
             self.detectors.append(d)
         self.components = self.detectors
 
-        self.trigger_times = [[], []]
+        self.trigger_times = [TimeBuffer(), TimeBuffer()]
         self.arrival_times = [[], []]
 
         self.povms = [None] * 4
@@ -385,17 +499,13 @@ class QSDetectorFockDirect(QSDetector):
             result = self.timeline.quantum_manager.measure([key], self.povms[2:4], samp)
         else:
             raise Exception("too many input ports for QSDFockDirect {}".format(self.name))
+        photon.release()
 
         assert result in list(range(len(self.povms))), "The measurement outcome is not valid."
         if result == 1:
             # trigger time recording will be done by SPD
             self.detectors[input_port].record_detection()
 
-    def get_photon_times(self) -> List[List[int]]:
-        trigger_times = self.trigger_times
-        self.trigger_times = [[], []]
-        return trigger_times
-
     # does nothing for this class
     def set_basis_list(self, basis_list: List[int], start_time: int, frequency: int) -> None:
         pass
@@ -417,7 +527,7 @@ class QSDetectorFockInterference(QSDetector):
         src_list (List[str]): list of two sources which send photons to this detector (length 2).
         detectors (List[Detector]): list of attached detectors (length 2).
         phase (float): relative phase between two input optical paths.
-        trigger_times (List[List[int]]): tracks simulation time of detection events for each detector.
+        trigger_times (List[TimeBuffer]): tracks simulation time of detection events for each detector.
         detect_info (List[List[Dict]]): tracks detection information, including simulation time of detection events
             and detection outcome for each detector.
         arrival_times (List[List[int]]): tracks simulation time of arrival of photons at each input mode.
@@ -440,7 +550,7 @@ class QSDetectorFockInterference(QSDetector):
             self.detectors.append(d)
         self.components = self.detectors
 
-        self.trigger_times = [[], []]
+        self.trigger_times = [TimeBuffer(), TimeBuffer()]
         self.detect_info = [[], []]
         self.arrival_times = [[], []]
         self.temporary_photon_info = [{}, {}]
@@ -530,6 +640,8 @@ class QSDetectorFockInterference(QSDetector):
             # determine the outcome
             samp = self.get_generator().random()  # random measurement sample
             result = self.timeline.quantum_manager.measure([key0, key1], self.povms, samp)
+            photon0.release()
+            photon1.release()
 
             assert result in list(range(len(self.povms))), "The measurement outcome is not valid."
             if result == 0:
@@ -590,16 +702,12 @@ class QSDetectorFockInterference(QSDetector):
             self.beamsplitter.get(photon)
         """
 
-    def get_photon_times(self) -> List[List[int]]:
-        """Method to get detector trigger times and detection information.
+    def get_photon_time_arrays(self) -> List[ndarray]:
+        """Method to get detector trigger times.
         Will clear `trigger_times` and `detect_info`.
         """
-        trigger_times = self.trigger_times
-        # detect_info = self.detect_info
-        self.trigger_times = [[], []]
         self.detect_info = [[], []]
-        # return trigger_times, detect_info
-        return trigger_times
+        return super().get_photon_time_arrays()
 
     # does nothing for this class
     def set_basis_list(self, basis_list: List[int], start_time: int, frequency: float) -> None:
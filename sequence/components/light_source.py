@@ -4,9 +4,13 @@ This module defines the LightSource class to supply individual photons and the S
 These classes should be connected to one or two entities, respectively, that are capable of receiving photons.
 """
 
-from typing import List
+from typing import List, TYPE_CHECKING
 
-from numpy import multiply, sqrt, zeros, kron, outer
+from numpy import array, multiply, sqrt, zeros, kron, outer, arange, repeat, cumsum, concatenate, searchsorted
+
+if TYPE_CHECKING:
+    from numpy.random import Generator
+    from .optical_channel import QuantumChannel
 
 from .photon import Photon
 from ..kernel.entity import Entity
@@ -31,6 +35,8 @@ class LightSource(Entity):
         encoding_type (Dict[str, Any]): encoding scheme of emitted photons (as defined in the encoding module).
         phase_error (float): phase error applied to qubits.
         photon_counter (int): counter for number of photons emitted.
+        loss_channel (QuantumChannel): channel whose loss is sampled on emission, so that only surviving photons
+            are created (default None; see `QuantumChannel.set_loss_skipping`).
     """
 
     def __init__(self, name, timeline, frequency=8e7, wavelength=1550, bandwidth=0, mean_photon_num=0.1,
@@ -56,6 +62,7 @@ class LightSource(Entity):
         self.encoding_type = encoding_type
         self.phase_error = phase_error
         self.photon_counter = 0
+        self.loss_channel = None
 
     def init(self):
         """Implementation of Entity interface (see base class)."""
@@ -68,6 +75,9 @@ class LightSource(Entity):
 
         Will emit photons for a length of time determined by the `state_list` parameter.
         The number of photons emitted per period is calculated as a poisson random variable.
+        Photon numbers, phase errors and wavelengths of all periods are sampled at once and stored in a `PhotonBatch`;
+        photon objects are only created at their emission time, by a single event rescheduled for each emission.
+        If `loss_channel` is set, only the photons surviving the channel loss are kept.
 
         Arguments:
             state_list (List[List[complex]]): list of complex coefficient arrays to send as photon-encoded qubits.
@@ -75,28 +85,110 @@ class LightSource(Entity):
 
         log.logger.info("{} emitting {} photons".format(self.name, len(state_list)))
 
-        time = self.timeline.now()
+        num_pulses = len(state_list)
         period = int(round(1e12 / self.frequency))
+        rng = self.get_generator()
 
-        for i, state in enumerate(state_list):
-            num_photons = self.get_generator().poisson(self.mean_photon_num)
-
-            if self.get_generator().random() < self.phase_error:
-                state = multiply([1, -1], state)
-
-            for _ in range(num_photons):
-                wavelength = self.linewidth * self.get_generator().standard_normal() + self.wavelength
-                new_photon = Photon(str(i), self.timeline,
-                                    wavelength=wavelength,
-                                    location=self.owner,
-                                    encoding_type=self.encoding_type,
-                                    quantum_state=state)
-                process = Process(self._receivers[0], "get", [new_photon])
-                event = Event(time, process)
-                self.timeline.schedule(event)
-                self.photon_counter += 1
+        num_photons = rng.poisson(self.mean_photon_num, num_pulses)
+        phase_errors = rng.random(num_pulses) < self.phase_error
+        pulses = repeat(arange(num_pulses), num_photons)
+        self.photon_counter += len(pulses)
+        if self.loss_channel is not None:
+            pulses = pulses[sample_survivors(len(pulses), 1 - self.loss_channel.loss, rng)]
+        if len(pulses) == 0:
+            return
+        wavelengths = self.linewidth * rng.standard_normal(len(pulses)) + self.wavelength
+        times = self.timeline.now() + pulses * period
+
+        batch = PhotonBatch(times.tolist(), pulses.tolist(), wavelengths.tolist(), state_list, phase_errors)
+
+        process = Process(self, "send_batch", [batch])
+        batch.event = Event(batch.times[0], process)
+        self.timeline.schedule(batch.event)
+
+    def send_batch(self, batch: "PhotonBatch") -> None:
+        """Method to send the photons of a batch due at the current time to the receiver.
+
+        Reschedules the batch event for the next emission time, if photons remain.
+
+        Arguments:
+            batch (PhotonBatch): batch of photons generated by `emit`.
+        """
 
-            time += period
+        now = self.timeline.now()
+        receiver = self._receivers[0]
+        times = batch.times
+        i = batch.next_index
+
+        while i < len(times) and times[i] == now:
+            pulse = batch.pulses[i]
+            state = batch.state_list[pulse]
+            if batch.phase_errors[pulse]:
+                state = (state[0], -state[1])
+            new_photon = Photon(str(pulse), self.timeline,
+                                wavelength=batch.wavelengths[i],
+                                location=self.owner,
+                                encoding_type=self.encoding_type,
+                                quantum_state=state)
+            receiver.get(new_photon)
+            i += 1
+
+        batch.next_index = i
+        if i < len(times):
+            batch.event.time = times[i]
+            self.timeline.schedule(batch.event)
+
+
+def sample_survivors(num_photons: int, transmissivity: float, rng: "Generator") -> array:
+    """Function to sample which of a sequence of photons survive a lossy channel.
+
+    Each photon survives independently with probability `transmissivity`.
+    Gaps between surviving photons are drawn from a geometric distribution,
+    so the cost is proportional to the number of survivors.
+
+    Args:
+        num_photons (int): number of photons sent.
+        transmissivity (float): survival probability of each photon.
+        rng (Generator): random number generator to use.
+
+    Returns:
+        array: sorted indices of the surviving photons.
+    """
+
+    if transmissivity >= 1:
+        return arange(num_photons)
+    if num_photons == 0 or transmissivity <= 0:
+        return arange(0)
+
+    expected = num_photons * transmissivity
+    indices = cumsum(rng.geometric(transmissivity, int(expected + 5 * sqrt(expected)) + 1)) - 1
+    while indices[-1] < num_photons:
+        gaps = rng.geometric(transmissivity, int(expected) + 1)
+        indices = concatenate([indices, indices[-1] + cumsum(gaps)])
+    return indices[:searchsorted(indices, num_photons)]
+
+
+class PhotonBatch:
+    """Photons emitted by one call of `LightSource.emit`, stored in arrays.
+
+    Attributes:
+        times (List[int]): emission time of each photon (in ps), in non-decreasing order.
+        pulses (List[int]): index in `state_list` of the emission period of each photon.
+        wavelengths (List[float]): wavelength of each photon (in nm).
+        state_list (List[List[complex]]): states emitted in each period.
+        phase_errors (np.array): boolean array marking periods with a phase error.
+        next_index (int): index of the next photon to send.
+        event (Event): event sending the photons due at the next emission time.
+    """
+
+    def __init__(self, times: List[int], pulses: List[int], wavelengths: List[float], state_list, phase_errors):
+        self.times = times
+        self.pulses = pulses
+        self.wavelengths = wavelengths
+        self.state_list = state_list
+        self.phase_errors = phase_errors
+        self.next_index = 0
+        self.event = None
 
 
 class SPDCSource(LightSource):
@@ -6,9 +6,11 @@ Photons should be routed to a BSM device for entanglement generation, or through
 """
 
 from copy import copy
+from functools import lru_cache
+from heapq import heappush, heappop, heapify
 from math import inf
 from typing import Any, List, TYPE_CHECKING, Dict, Callable, Union
-from numpy import exp, array
+from numpy import exp, array, empty, float64, int64, arange, stack
 from scipy import stats
 
 if TYPE_CHECKING:
@@ -19,6 +21,8 @@ from .photon import Photon
 from ..kernel.entity import Entity
 from ..kernel.event import Event
 from ..kernel.process import Process
+from ..kernel.quantum_manager import QuantumManagerDensity, QuantumManagerTrajectory
+from ..kernel.quantum_utils import build_channel_superoperator, build_pauli_kraus_operators
 from ..utils.encoding import single_atom, single_heralded
 from ..constants import EPSILON
 from ..utils import log
@@ -29,21 +33,129 @@ def const(t):
     return 1
 
 
+# memory attributes stored by memory arrays in structure-of-arrays form (one column per attribute)
+# (expiration and update times are integer simulation times, with -1 if no expiration is scheduled or no state is held)
+MEMORY_COLUMNS = {"fidelity": float64, "raw_fidelity": float64, "frequency": float64, "efficiency": float64,
+                  "coherence_time": float64, "next_excite_time": float64, "expire_time": int64,
+                  "last_update_time": int64}
+
+
+class _MemoryColumn:
+    """Descriptor for a memory attribute stored in a column of the memory array.
+
+    Memories not in a memory array store the attribute locally.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, memory, owner=None):
+        if memory is None:
+            return self
+        if memory._columns is None:
+            return memory.__dict__[self.name]
+        return memory._columns[self.name].item(memory._index)
+
+    def __set__(self, memory, value):
+        if memory._columns is None:
+            memory.__dict__[self.name] = value
+        else:
+            memory._columns[self.name][memory._index] = value
+
+
+class MemoryExpirationManager:
+    """Class to schedule the expiration of all memories in a memory array.
+
+    Expiration times are stored in the `expire_time` column of the memory array, and kept in a min-heap of
+    (time, index) pairs; entries no longer matching the column (after a reset or reschedule) are skipped lazily.
+    A single event is scheduled on the timeline for the earliest expiration time.
+
+    Attributes:
+        memory_array (MemoryArray): memory array with memories to expire.
+        heap (List[Tuple[int, int]]): min-heap of expiration times and memory indices.
+        event (Event): scheduled event for the earliest expiration time (None if no event is scheduled).
+    """
+
+    def __init__(self, memory_array: "MemoryArray"):
+        self.memory_array = memory_array
+        self.heap = []
+        self.event = None
+
+    def schedule(self, index: int, time: int) -> None:
+        """Method to set the expiration time of a memory, replacing any previous expiration.
+
+        Args:
+            index (int): index of the memory.
+            time (int): simulation time of expiration.
+        """
+
+        time = int(time)
+        self.memory_array.columns["expire_time"][index] = time
+        heappush(self.heap, (time, index))
+        if self.event is None or time < self.event.time:
+            self._update_event()
+        elif len(self.heap) > 2 * len(self.memory_array.memories) + 16:
+            self._compact()
+
+    def expire(self) -> None:
+        """Method to expire all memories with expiration time up to the current time.
+
+        Is scheduled automatically on the timeline.
+        """
+
+        self.event = None
+        now = self.memory_array.timeline.now()
+        expire_times = self.memory_array.columns["expire_time"]
+        memories = self.memory_array.memories
+        while self.heap and self.heap[0][0] <= now:
+            time, index = heappop(self.heap)
+            if expire_times[index] == time:
+                memories[index].expire()
+        self._update_event()
+
+    def _update_event(self) -> None:
+        expire_times = self.memory_array.columns["expire_time"]
+        while self.heap and expire_times[self.heap[0][1]] != self.heap[0][0]:
+            heappop(self.heap)
+
+        if not self.heap:
+            return
+        time = self.heap[0][0]
+        if self.event is not None:
+            if self.event.time <= time:
+                return
+            self.memory_array.timeline.remove_event(self.event)
+
+        process = Process(self, "expire", [])
+        self.event = Event(time, process)
+        self.memory_array.timeline.schedule(self.event)
+
+    def _compact(self) -> None:
+        expire_times = self.memory_array.columns["expire_time"]
+        self.heap = [(time, index) for time, index in self.heap if expire_times[index] == time]
+        heapify(self.heap)
+
+
 class MemoryArray(Entity):
     """Aggregator for Memory objects.
 
     Equivalent to an array of single atom memories.
     The MemoryArray can be accessed as a list to get individual memories.
+    Numerical memory attributes (see `MEMORY_COLUMNS`) are stored by the array as NumPy columns,
+    with memories acting as views, so parameters can be updated and queried for all memories at once.
+    Memory expiration is scheduled by the array (see `MemoryExpirationManager`), not by individual memories.
 
     Attributes:
         name (str): label for memory array instance.
         timeline (Timeline): timeline for simulation.
         memories (List[Memory]): list of all memories.
+        columns (Dict[str, ndarray]): attribute values of all memories, indexed by memory index.
+        expiration_manager (MemoryExpirationManager): scheduler of memory expiration.
     """
 
     def __init__(self, name: str, timeline: "Timeline", num_memories=10,
                  fidelity=0.85, frequency=80e6, efficiency=1, coherence_time=-1, wavelength=500,
-                 decoherence_errors: List[float] = None, cutoff_ratio = 1):
+                 decoherence_errors: List[float] = None, cutoff_ratio = 1, lazy_decoherence: bool = False):
         """Constructor for the Memory Array class.
 
         Args:
@@ -57,25 +169,32 @@ class MemoryArray(Entity):
             wavelength (int): wavelength (in nm) of photons emitted by memories (default 500).
             decoherence_errors (List[int]): pauli decoherence errors. Passed to memory object.
             cutoff_ratio (float): the ratio between cutoff time and memory coherence time (default 1, should be between 0 and 1).
+            lazy_decoherence (bool): if memories apply decoherence when their state is next used
+                (density matrix or trajectory quantum managers only, see `Memory.decohere`) (default False).
         """
 
         Entity.__init__(self, name, timeline)
         self.memories = []
         self.memory_name_to_index = {}
+        self.columns = {column: empty(num_memories, dtype=dtype) for column, dtype in MEMORY_COLUMNS.items()}
+        self.expiration_manager = MemoryExpirationManager(self)
 
         for i in range(num_memories):
             memory_name = self.name + f"[{i}]"
             self.memory_name_to_index[memory_name] = i
-            memory = Memory(memory_name, timeline, fidelity, frequency, efficiency, coherence_time, wavelength, decoherence_errors, cutoff_ratio)
+            memory = Memory(memory_name, timeline, fidelity, frequency, efficiency, coherence_time, wavelength, decoherence_errors, cutoff_ratio,
+                            lazy_decoherence)
             memory.attach(self)
             self.memories.append(memory)
-            memory.set_memory_array(self)
+            memory.set_memory_array(self, i)
 
     def __getitem__(self, key: int) -> "Memory":
         return self.memories[key]
 
     def __setitem__(self, key: int, value: "Memory"):
         self.memories[key] = value
+        if isinstance(value, Memory):
+            value.set_memory_array(self, key)
 
     def __len__(self) -> int:
         return len(self.memories)
@@ -99,8 +218,61 @@ class MemoryArray(Entity):
         self.owner.memory_expire(memory)
 
     def update_memory_params(self, arg_name: str, value: Any) -> None:
-        for memory in self.memories:
-            memory.__setattr__(arg_name, value)
+        """Method to set an attribute of all memories.
+
+        Attributes stored as columns are updated in one step, and may be given one value per memory.
+
+        Args:
+            arg_name (str): name of the attribute.
+            value (Any): new value of the attribute (or array of values, for column attributes).
+        """
+
+        if arg_name in self.columns:
+            self.columns[arg_name][:] = value
+        else:
+            for memory in self.memories:
+                memory.__setattr__(arg_name, value)
+
+    def get_memory_params(self, arg_name: str) -> "array":
+        """Method to get an attribute of all memories stored as a column (see `MEMORY_COLUMNS`).
+
+        Args:
+            arg_name (str): name of the attribute.
+
+        Returns:
+            array: copy of the attribute values, indexed by memory index.
+        """
+
+        return self.columns[arg_name].copy()
+
+    def bds_decohere(self, indices: List[int] = None) -> None:
+        """Method to decohere the BDS stored in many memories at once (see `Memory.bds_decohere`).
+
+        Transformations of all memories are built at once from the `last_update_time` column,
+        and applied by the quantum manager in one vectorized step when a state is next read.
+
+        Args:
+            indices (List[int]): indices of memories to decohere (default None -> all memories).
+        """
+
+        indices = arange(len(self.memories)) if indices is None else array(indices, dtype=int64)
+        now = self.timeline.now()
+        last_update_times = self.columns["last_update_time"]
+        # time has progressed, and the memory has not been reset
+        indices = indices[(now > last_update_times[indices]) & (last_update_times[indices] > 0)]
+        indices = [i for i in indices.tolist() if self.memories[i].decoherence_errors is not None]
+        if not indices:
+            return
+
+        memories = [self.memories[i] for i in indices]
+        rates = array([[memory.decoherence_rate * error for error in memory.decoherence_errors]
+                       for memory in memories])
+        times = (now - last_update_times[indices]) * 1e-12  # durations of memory idling (in s)
+        transforms = _bds_transform_matrices(rates[:, 0], rates[:, 1], rates[:, 2], times)
+        log.logger.debug(f'{self.name}: decohere {len(indices)} memories')
+
+        self.timeline.quantum_manager.decohere_many([memory.qstate_key for memory in memories], transforms)
+        last_update_times[indices] = now
 
     def add_receiver(self, receiver: "Entity") -> None:
         """Add receiver to each memory in the memory array to receive photons.
@@ -145,6 +317,35 @@ def _p_zerr(x_rate, y_rate, z_rate, t):
     return val
 
 
+# position of (p_I, p_X, p_Y, p_Z) in the BDS transform matrix (BDS elements in I, Z, X, Y order)
+_BDS_TRANSFORM_INDEX = array([[0, 3, 1, 2],
+                              [3, 0, 2, 1],
+                              [1, 2, 0, 3],
+                              [2, 1, 3, 0]])
+
+
+@lru_cache(maxsize=1000)
+def _bds_transform_matrix(x_rate, y_rate, z_rate, t):
+    """Transform matrix of BDS diagonal elements under single-qubit Pauli decoherence, cached by (rates, time).
+
+    The returned array is shared between callers and must not be modified.
+    """
+
+    transform_mtx = _bds_transform_matrices(x_rate, y_rate, z_rate, t)
+    transform_mtx.flags.writeable = False
+    return transform_mtx
+
+
+def _bds_transform_matrices(x_rate, y_rate, z_rate, t):
+    """Transform matrices of BDS diagonal elements, for rates and times given as scalars or arrays of equal length."""
+
+    probs = stack([_p_id(x_rate, y_rate, z_rate, t),
+                   _p_xerr(x_rate, y_rate, z_rate, t),
+                   _p_yerr(x_rate, y_rate, z_rate, t),
+                   _p_zerr(x_rate, y_rate, z_rate, t)], axis=-1)
+    return probs[..., _BDS_TRANSFORM_INDEX]
+
+
 class Memory(Entity):
     """Individual single-atom memory.
 
@@ -163,6 +364,8 @@ class Memory(Entity):
         qstate_key (int): key for associated quantum state in timeline's quantum manager.
         memory_array (MemoryArray): memory array aggregating current memory.
         entangled_memory (Dict[str, Any]): tracks entanglement state of memory.
+        next_excite_time (float): earliest time at which the memory can be excited again.
+        expire_time (int): time of the scheduled expiration of the memory (-1 if none).
         docoherence_errors (List[float]): assumeing the memory (qubit) decoherence channel being Pauli channel,
             Probability distribution of X, Y, Z Pauli errors;
             (default value is -1, meaning not using BDS or further density matrix representation)
@@ -173,10 +376,23 @@ class Memory(Entity):
         last_update_time (float): last time when the EPR pair is updated (usually when decoherence channel applied),
             used to determine decoherence channel (default -1 before generation or not used)
         is_in_application (bool): whether the quantum memory is involved in application after successful distribution of EPR pair
+        lazy_decoherence (bool): whether decoherence is applied when the memory state is next used (see `decohere`).
+
+    Attributes in `MEMORY_COLUMNS` are stored by the memory array, if the memory belongs to one (see `set_memory_array`).
     """
 
+    fidelity = _MemoryColumn()
+    raw_fidelity = _MemoryColumn()
+    frequency = _MemoryColumn()
+    efficiency = _MemoryColumn()
+    coherence_time = _MemoryColumn()
+    next_excite_time = _MemoryColumn()
+    expire_time = _MemoryColumn()
+    last_update_time = _MemoryColumn()
+
     def __init__(self, name: str, timeline: "Timeline", fidelity: float, frequency: float,
-                 efficiency: float, coherence_time: float, wavelength: int, decoherence_errors: List[float] = None, cutoff_ratio: float = 1):
+                 efficiency: float, coherence_time: float, wavelength: int, decoherence_errors: List[float] = None, cutoff_ratio: float = 1,
+                 lazy_decoherence: bool = False):
         """Constructor for the Memory class.
 
         Args:
@@ -192,12 +408,17 @@ class Memory(Entity):
                 probability distribution of X, Y, Z Pauli errors
                 (default value is None, meaning not using BDS or further density matrix representation)
             cutoff_ratio (float): the ratio between cutoff time and memory coherence time (default 1, should be between 0 and 1).
+            lazy_decoherence (bool): if decoherence is applied when the memory state is next used
+                (density matrix or trajectory quantum managers only, see `decohere`) (default False).
         """
 
         super().__init__(name, timeline)
         assert 0 <= fidelity <= 1
         assert 0 <= efficiency <= 1
 
+        self._columns = None  # columns of the memory array storing attributes, if any
+        self._index = -1
+
         self.fidelity = 0
         self.raw_fidelity = fidelity
         self.frequency = frequency
@@ -206,6 +427,7 @@ class Memory(Entity):
         self.decoherence_rate = 1 / self.coherence_time if self.coherence_time > 0 else 0 # rate of decoherence to implement time dependent decoherence
         self.wavelength = wavelength
         self.qstate_key = timeline.quantum_manager.new()
+        timeline.quantum_manager.set_owner(self.qstate_key, self)
         self.memory_array = None
 
         self.decoherence_errors = decoherence_errors
@@ -218,6 +440,12 @@ class Memory(Entity):
         self.last_update_time = -1
         self.is_in_application = False
 
+        # density matrix and trajectory managers: decoherence is applied lazily, when the manager next uses the memory
+        self.lazy_decoherence = lazy_decoherence
+        if lazy_decoherence and self.decoherence_errors is not None and self.decoherence_rate > 0 \
+                and isinstance(timeline.quantum_manager, (QuantumManagerDensity, QuantumManagerTrajectory)):
+            timeline.quantum_manager.set_noise_source(self.qstate_key, self)
+
         # for photons
         self.encoding = copy(single_atom)
         self.encoding["raw_fidelity"] = self.raw_fidelity
@@ -238,11 +466,35 @@ class Memory(Entity):
 
         self.next_excite_time = 0
 
+    @property
+    def expiration_event(self) -> Event:
+        return self._expiration_event
+
+    @expiration_event.setter
+    def expiration_event(self, event: Event):
+        self._expiration_event = event
+        self.expire_time = -1 if event is None else int(event.time)
+
     def init(self):
         pass
 
-    def set_memory_array(self, memory_array: MemoryArray):
+    def set_memory_array(self, memory_array: MemoryArray, index: int = None):
+        """Method to add the memory to a memory array.
+
+        Args:
+            memory_array (MemoryArray): memory array aggregating the memory.
+            index (int): index of the memory in the array (default None).
+                If given, attributes in `MEMORY_COLUMNS` are moved to the columns of the memory array.
+        """
+
         self.memory_array = memory_array
+        if index is not None:
+            columns = memory_array.columns
+            for column in MEMORY_COLUMNS:
+                columns[column][index] = getattr(self, column)
+                self.__dict__.pop(column, None)
+            self._columns = columns
+            self._index = index
 
     def excite(self, dst="", protocol="bk") -> None:
         """Method to excite memory and potentially emit a photon.
@@ -323,14 +575,16 @@ class Memory(Entity):
         """
 
         self.fidelity = 0
+        self.timeline.quantum_manager.set([self.qstate_key], [complex(1), complex(0)])
+        # set after the state, as the quantum manager may update last_update_time when setting the state
         self.generation_time = -1
         self.last_update_time = -1
 
-        self.timeline.quantum_manager.set([self.qstate_key], [complex(1), complex(0)])
         self.entangled_memory = {'node_id': None, 'memo_id': None}
         if self.expiration_event is not None:
             self.timeline.remove_event(self.expiration_event)
             self.expiration_event = None
+        self.expire_time = -1  # expiration scheduled by the memory array (if any) is skipped
 
     def update_state(self, state: List[complex]) -> None:
         """Method to set the memory state to an arbitrary pure state.
@@ -346,6 +600,8 @@ class Memory(Entity):
         self.timeline.quantum_manager.set([self.qstate_key], state)
         self.previous_bsm = -1
         self.entangled_memory = {'node_id': None, 'memo_id': None}
+        if self.lazy_decoherence:
+            self.last_update_time = self.timeline.now()  # start decoherence of the new state
 
         # schedule expiration
         if self.coherence_time > 0:
@@ -358,7 +614,7 @@ class Memory(Entity):
         BDS decoherence can be treated analytically (see entanglement purification paper for explicit formulae).
 
         Side Effects:
-            Will modify BDS diagonal elements and last_update_time.
+            Will queue a transformation of the BDS diagonal elements and modify last_update_time.
         """
 
         if self.decoherence_errors is None:
@@ -372,36 +628,78 @@ class Memory(Entity):
                 x_rate, y_rate, z_rate = self.decoherence_rate * self.decoherence_errors[0], \
                                         self.decoherence_rate * self.decoherence_errors[1], \
                                         self.decoherence_rate * self.decoherence_errors[2]
-                p_I, p_X, p_Y, p_Z = _p_id(x_rate, y_rate, z_rate, time), \
-                                    _p_xerr(x_rate, y_rate, z_rate, time), \
-                                    _p_yerr(x_rate, y_rate, z_rate, time), \
-                                    _p_zerr(x_rate, y_rate, z_rate, time)
-
-                state_now = self.timeline.quantum_manager.states[self.qstate_key].state  # current diagonal elements
-                transform_mtx = array([[p_I, p_Z, p_X, p_Y],
-                                       [p_Z, p_I, p_Y, p_X],
-                                       [p_X, p_Y, p_I, p_Z],
-                                       [p_Y, p_X, p_Z, p_I]])  # transform matrix for diagonal elements
-                state_new = transform_mtx @ state_now  # new diagonal elements after decoherence transformation
-            
-                log.logger.debug(f'{self.name}: before f={state_now[0]:.6f}, after f={state_new[0]:.6f}')
-                
-                # update the quantum state stored in quantum manager for self and entangled memory
-                keys = self.timeline.quantum_manager.states[self.qstate_key].keys
-                self.timeline.quantum_manager.set(keys, state_new)
+                transform_mtx = _bds_transform_matrix(x_rate, y_rate, z_rate, time)  # transform matrix for diagonal elements
+
+                log.logger.debug(f'{self.name}: decohere for {time:.6e} s, p_I={transform_mtx[0, 0]:.6f}')
+
+                # queue the transformation on the state shared by self and entangled memory
+                # (applied lazily and vectorized by the quantum manager)
+                self.timeline.quantum_manager.decohere(self.qstate_key, transform_mtx)
 
                 # update the last_update_time of self
                 # note that the attr of entangled memory should not be updated right now,
                 # because decoherence has not been applied there
                 self.last_update_time = self.timeline.now()
 
+    def decohere(self) -> None:
+        """Method to apply the decoherence accumulated since the memory state was last used.
+
+        Called by the quantum manager before the memory state is next used (see `QuantumManager.set_noise_source`),
+        so idling memories are not updated at every step.
+        The single-qubit Pauli channel over the idling time is given by `decoherence_rate` and `decoherence_errors`,
+        as for `bds_decohere`.
+        Density matrix managers apply the channel as a superoperator;
+        trajectory managers sample one Pauli error with the memory's random generator.
+
+        Memories that have been reset (with `last_update_time` of -1) do not decohere until a new state is written.
+
+        Side Effects:
+            Will modify the quantum state of the memory and last_update_time.
+        """
+
+        if self.last_update_time < 0:
+            return
+
+        now = self.timeline.now()
+        time = (now - self.last_update_time) * 1e-12  # duration of memory idling (in s)
+        # update first, as the quantum manager will call this method again when applying the channel
+        self.last_update_time = now
+
+        if time > 0:
+            x_rate, y_rate, z_rate = self.decoherence_rate * self.decoherence_errors[0], \
+                                     self.decoherence_rate * self.decoherence_errors[1], \
+                                     self.decoherence_rate * self.decoherence_errors[2]
+            p_x = _p_xerr(x_rate, y_rate, z_rate, time)
+            p_y = _p_yerr(x_rate, y_rate, z_rate, time)
+            p_z = _p_zerr(x_rate, y_rate, z_rate, time)
+            log.logger.debug(f'{self.name}: decohere for {time:.6e} s')
+            qm = self.timeline.quantum_manager
+            if isinstance(qm, QuantumManagerTrajectory):
+                qm.apply_channel([self.qstate_key], build_pauli_kraus_operators(p_x, p_y, p_z),
+                                 self.get_generator().random())
+            else:
+                qm.apply_superoperator([self.qstate_key], build_channel_superoperator("pauli", p_x, p_y, p_z))
+
     def _schedule_expiration(self) -> None:
+        decay_time = self.timeline.now() + int(self.cutoff_ratio * self.coherence_time * 1e12)
+        self._set_expiration(decay_time)
+
+    def _set_expiration(self, time: int) -> None:
+        """Method to schedule expiration of the memory at given time, replacing any previous expiration.
+
+        Memories in a memory array are expired by the array's expiration manager;
+        other memories schedule their own expiration event.
+        """
+
+        if self._columns is not None:
+            self.memory_array.expiration_manager.schedule(self._index, time)
+            return
+
         if self.expiration_event is not None:
             self.timeline.remove_event(self.expiration_event)
 
-        decay_time = self.timeline.now() + int(self.cutoff_ratio * self.coherence_time * 1e12)
         process = Process(self, "expire", [])
-        event = Event(decay_time, process)
+        event = Event(time, process)
         self.timeline.schedule(event)
 
         self.expiration_event = event
@@ -416,16 +714,23 @@ class Memory(Entity):
         """
 
         time = max(time, self.timeline.now())
-        if self.expiration_event is None:
+        if self._columns is not None:
+            if time == inf:
+                self.expire_time = -1
+            else:
+                self.memory_array.expiration_manager.schedule(self._index, time)
+        elif self.expiration_event is None:
             if time >= self.timeline.now():
                 process = Process(self, "expire", [])
                 event = Event(time, process)
                 self.timeline.schedule(event)
         else:
             self.timeline.update_event_time(self.expiration_event, time)
+            self.expire_time = int(time)
 
     def get_expire_time(self) -> int:
-        return self.expiration_event.time if self.expiration_event else inf
+        expire_time = self.expire_time
+        return inf if expire_time < 0 else expire_time
 
     def notify(self, msg: Dict[str, Any]):
         for observer in self._observers:
@@ -625,6 +930,7 @@ class AbsorptiveMemory(Entity):
         absorb_time = now - self.absorb_start_time
         index = int(absorb_time / self.mode_bin)
         if index < 0 or index >= self.mode_number:
+            photon.release()
             return
 
         # require resonant absorption of photons
@@ -656,6 +962,11 @@ class AbsorptiveMemory(Entity):
             else:
                 self.stored_photons[index]["number"] += 1
                 self.stored_photons[index]["overlap"] = True
+                photon.release()
+
+        # photon not absorbed
+        else:
+            photon.release()
 
         # determine absorb_start_time
         if self.photon_counter == 1:
@@ -738,6 +1049,9 @@ class AbsorptiveMemory(Entity):
                     event = Event(self.timeline.now() + emit_time, process)
                     self.timeline.schedule(event)
 
+                else:
+                    stored_photons["photon"].release()
+
         # clear entanglement and storage information after re-emission
         # retrieval will re-emit all stored photons and information should no longer be stored
         # clearance unified as storage_reset method
@@ -759,6 +1073,7 @@ class AbsorptiveMemory(Entity):
         if self.excited_photons:
             for i in range(len(self.excited_photons)):
                 self.excited_photons[i].is_null = True
+                self.excited_photons[i].release()
 
         self.reset()
         # pop expiration message
@@ -904,16 +1219,9 @@ class MemoryWithRandomCoherenceTime(Memory):
             self.coherence_time_stdev)
 
     def _schedule_expiration(self) -> None:
-        if self.expiration_event is not None:
-            self.timeline.remove_event(self.expiration_event)
-            
         coherence_period = (self.coherence_time_distribution()
                             if self.random_coherence_time else 
                             self.coherence_time)
 
         decay_time = self.timeline.now() + int(coherence_period * 1e12)
-        process = Process(self, "expire", [])
-        event = Event(decay_time, process)
-        self.timeline.schedule(event)
-
-        self.expiration_event = event
+        self._set_expiration(decay_time)
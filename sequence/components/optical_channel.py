@@ -14,6 +14,7 @@ if TYPE_CHECKING:
     from ..kernel.timeline import Timeline
     from ..topology.node import Node
     from ..components.photon import Photon
+    from ..components.light_source import LightSource
     from ..message import Message
 
 from ..kernel.entity import Entity
@@ -82,6 +83,8 @@ class QuantumChannel(OpticalChannel):
         loss (float): loss rate for transmitted photons (determined by attenuation).
         delay (int): delay (in ps) of photon transmission (determined by light speed, distance).
         frequency (float): maximum frequency of qubit transmission (in Hz).
+        skip_lost_photons (bool): whether loss is sampled at the light source instead of on transmission
+            (see `set_loss_skipping`).
     """
 
     def __init__(self, name: str, timeline: "Timeline", attenuation: float, distance: float,
@@ -102,7 +105,9 @@ class QuantumChannel(OpticalChannel):
         self.delay = -1
         self.loss = 1
         self.frequency = frequency  # maximum frequency for sending qubits (measured in Hz)
-        self.send_bins = []
+        self.send_bins = []  # heap of reserved time bins
+        self._bin_next = {}  # reserved time bins, mapped to the next bin that may be free
+        self.skip_lost_photons = False
 
     def init(self) -> None:
         """Implementation of Entity interface (see base class)."""
@@ -125,6 +130,20 @@ class QuantumChannel(OpticalChannel):
         self.receiver = receiver
         sender.assign_qchannel(self, receiver)
 
+    def set_loss_skipping(self, light_source: "LightSource") -> None:
+        """Method to sample the loss of this channel at a light source sending photons through it.
+
+        The light source only creates the photons that survive the channel, and the channel transmits all photons
+        without sampling loss (except for Fock encoded photons, which have the loss channel applied to their state).
+        This should only be used if all photons sent on the channel come from `light_source`.
+
+        Args:
+            light_source (LightSource): light source emitting photons sent on this channel.
+        """
+
+        self.skip_lost_photons = True
+        light_source.loss_channel = self
+
     def transmit(self, qubit: "Photon", source: "Node") -> None:
         """Method to transmit photon-encoded qubits.
 
@@ -147,6 +166,7 @@ class QuantumChannel(OpticalChannel):
             time = -1
             while time < self.timeline.now():
                 time_bin = hq.heappop(self.send_bins)
+                del self._bin_next[time_bin]
                 time = int(time_bin * (1e12 / self.frequency))
             assert time == self.timeline.now(), "qc {} transmit method called at invalid time".format(self.name)
 
@@ -163,7 +183,7 @@ class QuantumChannel(OpticalChannel):
             self.timeline.schedule(event)
 
         # if not using Fock representation, check if photon kept
-        elif (self.sender.get_generator().random() > self.loss) or qubit.is_null:
+        elif self.skip_lost_photons or (self.sender.get_generator().random() > self.loss) or qubit.is_null:
             if self._receiver_on_other_tl():
                 self.timeline.quantum_manager.move_manage_to_server(qubit.quantum_state)
 
@@ -182,14 +202,16 @@ class QuantumChannel(OpticalChannel):
 
         # if not using Fock representation, if photon lost, exit
         else:
-            pass
+            qubit.release()
 
     def schedule_transmit(self, min_time: int) -> int:
         """Method to schedule a time for photon transmission.
 
         Quantum Channels are limited by a frequency of transmission.
         This method returns the next available time for transmitting a photon.
-        
+        Reserved bins older than the current time are discarded;
+        the next free bin is found by following (path-compressed) links between reserved bins.
+
         Args:
             min_time (int): minimum simulation time for transmission.
 
@@ -206,9 +228,19 @@ class QuantumChannel(OpticalChannel):
         else:
             time_bin = int(time_bin)
 
+        # discard bins that can no longer be transmitted
+        now = self.timeline.now()
+        while len(self.send_bins) > 0 and int(self.send_bins[0] * (1e12 / self.frequency)) < now:
+            del self._bin_next[hq.heappop(self.send_bins)]
+
         # find earliest available time bin
-        while time_bin in self.send_bins:
-            time_bin += 1
+        path = []
+        while time_bin in self._bin_next:
+            path.append(time_bin)
+            time_bin = self._bin_next[time_bin]
+        for reserved in path:
+            self._bin_next[reserved] = time_bin + 1
+        self._bin_next[time_bin] = time_bin + 1
         hq.heappush(self.send_bins, time_bin)
 
         # calculate time
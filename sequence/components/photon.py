@@ -34,12 +34,19 @@ class Photon:
         loss (float): similarly defined for memory encoding, used to track loss and improve performance.
             Does not need to be utilized for all encoding schemes.
         use_qm (bool): determines if photon stores state locally (False) or uses timeline quantum manager (True).
+        owns_state (bool): determines if the photon created its quantum manager key, and must release it (see `release`).
 
     Note: the `loss` attribute is currently specifically used for the `"single_atom"` encoding scheme.
     This encoding scheme also removes the local timeline reference and sets the quantum state to the local key.
     This is to both facilitate parallel execution and improve the performance of overall simulation.
+
+    Photons have no finalizer: keys created by a photon are released explicitly (with `release`)
+    when the photon is detected, absorbed or lost.
     """
 
+    __slots__ = ("name", "timeline", "wavelength", "location", "encoding_type", "is_null", "loss", "use_qm",
+                 "owns_state", "quantum_state", "__weakref__")
+
     _entangle_circuit = Circuit(2)
     _measure_circuit = Circuit(1)
     _measure_circuit.measure(0)
@@ -71,11 +78,14 @@ class Photon:
         self.is_null: bool = False
         self.loss: float = 0
         self.use_qm = use_qm
+        self.owns_state: bool = False
 
         self.quantum_state: Union[State, int] = -1
         if self.use_qm:
             if quantum_state is None:
                 self.quantum_state = timeline.quantum_manager.new()
+                self.owns_state = True
+                timeline.quantum_manager.set_owner(self.quantum_state, self)
             else:
                 assert type(quantum_state) is int
                 self.quantum_state = quantum_state
@@ -91,9 +101,16 @@ class Photon:
             self.quantum_state = FreeQuantumState()
             self.quantum_state.state = quantum_state
 
-    def __del__(self):
-        if self.use_qm and self.timeline is not None:
-            self.timeline.quantum_manager.remove(self.quantum_state)
+    def release(self):
+        """Method to release the quantum manager key created by the photon.
+
+        Should be called once the photon is detected, absorbed or lost, and its key is no longer used.
+        Keys passed to the constructor (e.g. memory keys) are not released, and repeated calls have no effect.
+        """
+
+        if self.owns_state:
+            self.owns_state = False
+            self.timeline.quantum_manager.release(self.quantum_state)
 
     def combine_state(self, photon):
         """Method to combine quantum states of photons (see `QuantumState` module).
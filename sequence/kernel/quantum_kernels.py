@@ -0,0 +1,155 @@
+"""Numerical kernels for measurement and partial trace of quantum states.
+
+This module defines the low-level kernels used by the cached functions in `quantum_utils`.
+Kernels are compiled with Numba if it is installed; otherwise, equivalent NumPy implementations are used.
+The backend is selected at import, and is given by `BACKEND` ("numba" or "numpy").
+"""
+
+from typing import List
+
+from numpy import array, ascontiguousarray, einsum, empty, zeros, complex128, float64, int64
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _ket_block_probabilities_numpy(state: array, num_blocks: int) -> array:
+    amplitudes = state.reshape((num_blocks, -1))
+    return (amplitudes.real ** 2 + amplitudes.imag ** 2).sum(axis=1)
+
+
+def _density_block_probabilities_numpy(state: array, num_blocks: int) -> array:
+    block_size = state.shape[0] // num_blocks
+    return einsum('ijij->i', state.reshape((num_blocks, block_size, num_blocks, block_size))).real
+
+
+def _partial_trace_numpy(state: array, traced: array, dim: int) -> array:
+    num_systems = len(traced)
+    keep = [i for i in range(num_systems) if not traced[i]]
+    row_axes = list(range(num_systems))
+    col_axes = [i if traced[i] else num_systems + i for i in range(num_systems)]
+    out_axes = keep + [num_systems + i for i in keep]
+    keep_dim = dim ** len(keep)
+    tensor = state.reshape((dim,) * (2 * num_systems))
+    return einsum(tensor, row_axes + col_axes, out_axes).reshape((keep_dim, keep_dim))
+
+
+if njit is not None:
+    BACKEND = "numba"
+
+    @njit(cache=True)
+    def _ket_block_probabilities_numba(state, num_blocks):
+        block_size = state.shape[0] // num_blocks
+        probabilities = zeros(num_blocks, dtype=float64)
+        for i in range(num_blocks):
+            total = 0.0
+            for j in range(i * block_size, (i + 1) * block_size):
+                total += state[j].real ** 2 + state[j].imag ** 2
+            probabilities[i] = total
+        return probabilities
+
+    @njit(cache=True)
+    def _density_block_probabilities_numba(state, num_blocks):
+        block_size = state.shape[0] // num_blocks
+        probabilities = zeros(num_blocks, dtype=float64)
+        for i in range(num_blocks):
+            total = 0.0
+            for j in range(i * block_size, (i + 1) * block_size):
+                total += state[j, j].real
+            probabilities[i] = total
+        return probabilities
+
+    @njit(cache=True)
+    def _partial_trace_numba(state, traced, dim):
+        num_systems = traced.shape[0]
+        num_traced = 0
+        for i in range(num_systems):
+            num_traced += traced[i]
+        keep_dim = dim ** (num_systems - num_traced)
+        trace_dim = dim ** num_traced
+
+        # index in the full space of each pair of (kept, traced) sub-indices
+        full_index = empty((keep_dim, trace_dim), dtype=int64)
+        for k in range(keep_dim):
+            for t in range(trace_dim):
+                k_rem = k
+                t_rem = t
+                index = 0
+                place = 1
+                for s in range(num_systems - 1, -1, -1):
+                    if traced[s]:
+                        digit = t_rem % dim
+                        t_rem //= dim
+                    else:
+                        digit = k_rem % dim
+                        k_rem //= dim
+                    index += digit * place
+                    place *= dim
+                full_index[k, t] = index
+
+        output = zeros((keep_dim, keep_dim), dtype=complex128)
+        for i in range(keep_dim):
+            for j in range(keep_dim):
+                total = 0j
+                for t in range(trace_dim):
+                    total += state[full_index[i, t], full_index[j, t]]
+                output[i, j] = total
+        return output
+
+    _ket_block_probabilities = _ket_block_probabilities_numba
+    _density_block_probabilities = _density_block_probabilities_numba
+    _partial_trace = _partial_trace_numba
+
+else:
+    BACKEND = "numpy"
+    _ket_block_probabilities = _ket_block_probabilities_numpy
+    _density_block_probabilities = _density_block_probabilities_numpy
+    _partial_trace = _partial_trace_numpy
+
+
+def ket_block_probabilities(state: array, num_blocks: int) -> array:
+    """Computes probabilities of measuring the leading subsystems of a ket vector in the computational basis.
+
+    Args:
+        state (array): ket vector.
+        num_blocks (int): number of outcomes of the measured leading subsystems (e.g. 2 ** k for k qubits).
+
+    Returns:
+        array: probability of each outcome.
+    """
+
+    return _ket_block_probabilities(ascontiguousarray(state, dtype=complex128), num_blocks)
+
+
+def density_block_probabilities(state: array, num_blocks: int) -> array:
+    """Computes probabilities of measuring the leading subsystems of a density matrix in the computational basis.
+
+    Args:
+        state (array): density matrix.
+        num_blocks (int): number of outcomes of the measured leading subsystems (e.g. 2 ** k for k qubits).
+
+    Returns:
+        array: probability of each outcome.
+    """
+
+    return _density_block_probabilities(ascontiguousarray(state, dtype=complex128), num_blocks)
+
+
+def partial_trace(state: array, indices: List[int], num_systems: int, dim: int = 2) -> array:
+    """Traces out the subsystems at given indices of a density matrix.
+
+    Args:
+        state (array): density matrix of `num_systems` subsystems.
+        indices (List[int]): indices of subsystems to trace out.
+        num_systems (int): number of total subsystems in the state.
+        dim (int): dimension of elementary subsystems (default 2).
+
+    Returns:
+        array: reduced density matrix of the remaining subsystems (in their original order).
+    """
+
+    traced = zeros(num_systems, dtype=int64)
+    traced[list(indices)] = 1
+    return _partial_trace(ascontiguousarray(state, dtype=complex128), traced, dim)
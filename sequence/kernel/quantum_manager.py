@@ -4,31 +4,130 @@ The states may currently be defined in two possible ways:
     - KetState (with the QuantumManagerKet class)
     - DensityMatrix (with the QuantumManagerDensity class)
 
+The QuantumManagerTrajectory class also stores KetState objects, and samples a single branch of noise channels
+(quantum trajectories); averaged over runs, results reproduce those of the density matrix formalism.
+The QuantumManagerMPS class stores MPSState objects (matrix product states) for chain-like entanglement.
+The QuantumManagerHybrid class stores each compound state as a KetState while pure, and as a DensityState once mixed.
+
 The manager defines an API for interacting with quantum states.
 """
 
 from __future__ import annotations
 from abc import abstractmethod
-from typing import List, Dict, TYPE_CHECKING
-
-if TYPE_CHECKING:
-    from ..components.circuit import Circuit
-    from .quantum_state import State
+from functools import lru_cache
+from weakref import ref
+from typing import List, Dict, Tuple, Callable
 
 from qutip_qip.circuit import QubitCircuit
 from qutip_qip.operations import gate_sequence_product, Gate
-from numpy import log, array, cumsum, base_repr, zeros
-from scipy.sparse import csr_matrix
-from scipy.special import binom
+from numpy import log, array, empty, ndarray, copyto, cumsum, base_repr, zeros, einsum, unique, concatenate, \
+    count_nonzero, vdot, stack, ones
+from scipy.sparse import csr_matrix, issparse
 
-from .quantum_state import KetState, DensityState, BellDiagonalState
+from .quantum_state import State, KetState, DensityState, SparseDensityState, BellDiagonalState, \
+    BellDiagonalStateView, MPSState
 from .quantum_utils import *
+from ..components.circuit import Circuit
 
 KET_STATE_FORMALISM = "ket_vector"
 DENSITY_MATRIX_FORMALISM = "density_matrix"
 FOCK_DENSITY_MATRIX_FORMALISM = "fock_density"
+KET_TRAJECTORY_FORMALISM = "ket_trajectory"
+MPS_FORMALISM = "mps"
+HYBRID_FORMALISM = "hybrid"
 BELL_DIAGONAL_STATE_FORMALISM = "bell_diagonal"
 
+CHECKPOINT_LEN_BYTES = 8  # length prefix of each binary state message in checkpoint files
+
+
+class StateLimitError(MemoryError):
+    """Error raised when an operation would exceed the state size limits of a quantum manager.
+
+    See `QuantumManager.set_state_limits`.
+    """
+
+    pass
+
+
+class StateDict(dict):
+    """Dictionary mapping state keys to states, keeping a running total of the memory used by unique states.
+
+    Quantum managers store their states in a `StateDict` while a memory limit is set (see `set_state_limits`),
+    and in a plain dictionary otherwise.
+    A state stored at several keys is counted once.
+    The memory of a state is recorded when it is first stored, so the total is updated in O(1) per stored key.
+
+    Attributes:
+        total_bytes (int): memory used by the values of all unique stored states.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.total_bytes: int = 0
+        self._entries: Dict[int, List[int]] = {}  # id(state) -> [number of keys, recorded bytes]
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, key: int, state: "State") -> None:
+        if key in self:
+            self._discard(dict.__getitem__(self, key))
+        super().__setitem__(key, state)
+        self._add(state)
+
+    def __delitem__(self, key: int) -> None:
+        self._discard(dict.__getitem__(self, key))
+        super().__delitem__(key)
+
+    def pop(self, key: int, *default) -> "State":
+        if key in self:
+            self._discard(dict.__getitem__(self, key))
+        return super().pop(key, *default)
+
+    def popitem(self) -> Tuple[int, "State"]:
+        key, state = super().popitem()
+        self._discard(state)
+        return key, state
+
+    def setdefault(self, key: int, default: "State" = None) -> "State":
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def update(self, *args, **kwargs) -> None:
+        for key, state in dict(*args, **kwargs).items():
+            self[key] = state
+
+    def clear(self) -> None:
+        super().clear()
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def get_nbytes(self, state: "State") -> int:
+        """Method to get the memory recorded for a stored state (0 for None)."""
+
+        if state is None:
+            return 0
+        return self._entries[id(state)][1]
+
+    def _add(self, state: "State") -> None:
+        if state is None:
+            return
+        entry = self._entries.get(id(state))
+        if entry is None:
+            nbytes = getattr(state, "nbytes", 0)
+            self._entries[id(state)] = [1, nbytes]
+            self.total_bytes += nbytes
+        else:
+            entry[0] += 1
+
+    def _discard(self, state: "State") -> None:
+        if state is None:
+            return
+        entry = self._entries[id(state)]
+        entry[0] -= 1
+        if entry[0] == 0:
+            del self._entries[id(state)]
+            self.total_bytes -= entry[1]
+
 
 class QuantumManager:
     """Class to track and manage quantum states (abstract).
@@ -36,18 +135,38 @@ class QuantumManager:
     All states stored are of a single formalism (by default as a ket vector).
 
     Attributes:
-        states (Dict[int, State]): mapping of state keys to quantum state objects.
+        states (Dict[int, State]): mapping of state keys to quantum state objects
+            (a `StateDict` while `max_total_bytes` is set).
         truncation (int): maximally allowed number of excited states for elementary subsystems.
                 Default is 1 for qubit.
         dim (int): subsystem Hilbert space dimension. dim = truncation + 1
+        auto_factorize (bool): whether to split separable subsystems out of compound states after measurement.
+        split_counter (int): number of subsystems split out of compound states so far.
+        recycle_keys (bool): whether keys freed by `release` are reused by `new` (default True).
+        max_state_size (int): maximum number of subsystems in one compound state (default None for no limit).
+        max_total_bytes (int): maximum memory used by the values of all stored states (default None for no limit).
     """
 
+    # number of indices of the stored state arrays (1 for ket vectors, 2 for density matrices)
+    _state_rank = 1
+
     def __init__(self, formalism: str, truncation: int = 1):
         self.states: Dict[int, State] = {}
         self._least_available: int = 0
         self.formalism: str = formalism
         self.truncation = truncation
         self.dim = self.truncation + 1
+        self.auto_factorize: bool = False
+        self.split_counter: int = 0
+        self.recycle_keys: bool = True
+        self._free_keys: List[int] = []
+        self._released: set = set()
+        self._owners: Dict[int, ref] = {}
+        self._collect_threshold: int = 64
+        self._buffers: Dict[Tuple[Tuple[int], int], array] = {}
+        self.max_state_size: int = None
+        self.max_total_bytes: int = None
+        self._noise_sources: Dict[int, any] = {}
 
     @abstractmethod
     def new(self, state: any) -> int:
@@ -61,6 +180,92 @@ class QuantumManager:
         """
         pass
 
+    def _next_key(self) -> int:
+        """Method to allocate a key for a new state.
+
+        Keys freed by `release` are reused first; otherwise, a fresh key is generated.
+        Released keys still sharing a state are swept periodically, with the sweep threshold doubling
+        with the number of pending keys so that allocation stays amortized O(1).
+
+        Returns:
+            int: unused key.
+        """
+
+        if self.recycle_keys:
+            if not self._free_keys and len(self._released) >= self._collect_threshold:
+                self.collect()
+                self._collect_threshold = max(64, 2 * len(self._released))
+            if self._free_keys:
+                return self._free_keys.pop()
+
+        key = self._least_available
+        self._least_available += 1
+        return key
+
+    def set_owner(self, key: int, owner: any) -> None:
+        """Method to record the object owning a key, for use in `get_leak_report`.
+
+        Only a weak reference to the owner is stored.
+
+        Args:
+            key (int): key of the owned state.
+            owner (any): owner object (e.g. a photon or memory).
+        """
+
+        self._owners[key] = ref(owner)
+
+    def release(self, key: int) -> None:
+        """Method to explicitly release a key that is no longer used by its owner.
+
+        Compound states are reference-counted by the keys still pointing to them:
+        the state is only deleted (and all of its keys freed for reuse) once every such key has been released.
+
+        Args:
+            key (int): key to release.
+        """
+
+        self._owners.pop(key, None)
+        if key not in self.states or key in self._released:
+            return
+        self._released.add(key)
+        self._collect_key(key)
+
+    def _collect_key(self, key: int) -> None:
+        state = self.states[key]
+        if state is None:
+            sharing_keys = [key]
+        else:
+            sharing_keys = [k for k in state.keys if self.states.get(k) is state]
+            if key not in sharing_keys:
+                # stale state object: the key is no longer tracked with its former partners
+                sharing_keys.append(key)
+        if not all(k in self._released for k in sharing_keys):
+            return
+
+        for k in sharing_keys:
+            self.remove(k)
+            self._released.discard(k)
+            if self.recycle_keys:
+                self._free_keys.append(k)
+
+    def collect(self) -> None:
+        """Method to free released keys whose states are no longer shared with any live key."""
+
+        for key in list(self._released):
+            if key in self._released:
+                self._collect_key(key)
+
+    def get_leak_report(self) -> List[int]:
+        """Method to list keys whose owner objects have been garbage collected without releasing them.
+
+        Only keys registered with `set_owner` are tracked.
+
+        Returns:
+            List[int]: sorted list of leaked keys.
+        """
+
+        return sorted(key for key, owner in self._owners.items() if owner() is None and key in self.states)
+
     def get(self, key: int) -> "State":
         """Method to get quantum state stored at an index.
 
@@ -99,11 +304,13 @@ class QuantumManager:
             if qstate.keys[0] not in all_keys:
                 old_states.append(qstate.state)
                 all_keys += qstate.keys
+        if len(old_states) > 1:
+            self._check_state_limits(all_keys, "run_circuit")
 
         # construct compound state; order qubits
-        new_state = [1]
-        for state in old_states:
-            new_state = kron(new_state, state)
+        new_state = old_states[0]
+        for state in old_states[1:]:
+            new_state = state_kron(new_state, state)
 
         # get circuit matrix; expand if necessary
         circ_mat = circuit.get_unitary_matrix()
@@ -119,6 +326,88 @@ class QuantumManager:
 
         return new_state, all_keys, circ_mat
 
+    def _get_compound_state(self, keys: List[int], operation: str) -> Tuple[array, List[int]]:
+        """Method to combine the states of all given keys into one compound state.
+
+        Unlike `_prepare_circuit`, subsystems are not reordered.
+
+        Args:
+            keys (List[int]): keys of states to combine.
+            operation (str): name of the calling operation, reported if the state limits are exceeded.
+
+        Returns:
+            Tuple[array, List[int]]: compound state and list of keys corresponding to its subsystems.
+        """
+
+        old_states = []
+        all_keys = []
+        for key in keys:
+            qstate = self.states[key]
+            if qstate.keys[0] not in all_keys:
+                old_states.append(qstate.state)
+                all_keys += qstate.keys
+        if len(old_states) > 1:
+            self._check_state_limits(all_keys, operation)
+
+        compound_state = old_states[0]
+        for state in old_states[1:]:
+            compound_state = state_kron(compound_state, state)
+
+        return compound_state, all_keys
+
+    def _get_shared_state(self, keys: List[int]) -> "State":
+        """Method to get the state shared by all given keys, if its array can be updated in place.
+
+        Args:
+            keys (List[int]): keys to check.
+
+        Returns:
+            State: state object stored at every key in `keys` (or None if keys span multiple states,
+                or if the state array is not a writeable, contiguous complex array).
+        """
+
+        qstate = self.states[keys[0]]
+        for key in keys[1:]:
+            if self.states[key] is not qstate:
+                return None
+        state = qstate.state
+        if not isinstance(state, ndarray) or state.dtype != complex \
+                or not (state.flags.writeable and state.flags.c_contiguous):
+            return None
+        return qstate
+
+    @staticmethod
+    def _circuit_order(state_keys: List[int], keys: List[int]) -> Tuple[List[int], List[int]]:
+        """Method to get the order of subsystems after running a circuit on a state spanning all given keys.
+
+        As in `_prepare_circuit`, the circuit keys are swapped to the front of the state, in circuit order.
+
+        Args:
+            state_keys (List[int]): keys of the state, in current order.
+            keys (List[int]): keys the circuit acts on.
+
+        Returns:
+            Tuple[List[int], List[int]]: new key order, and index in `state_keys` of each key in the new order.
+        """
+
+        new_keys = list(state_keys)
+        for i, key in enumerate(keys):
+            j = new_keys.index(key)
+            new_keys[i], new_keys[j] = new_keys[j], new_keys[i]
+        return new_keys, [state_keys.index(key) for key in new_keys]
+
+    def _get_buffer(self, shape: Tuple[int], index: int = 0) -> array:
+        """Method to get a preallocated complex scratch array of given shape, reused between calls.
+
+        Buffers with different `index` are distinct arrays, for operations needing more than one.
+        """
+
+        buffer = self._buffers.get((shape, index))
+        if buffer is None:
+            buffer = empty(shape, dtype=complex)
+            self._buffers[(shape, index)] = buffer
+        return buffer
+
     def _swap_qubits(self, all_keys, keys):
         swap_circuit = QubitCircuit(N=len(all_keys))
         for i, key in enumerate(keys):
@@ -154,39 +443,253 @@ class QuantumManager:
         #         len(amplitudes), num_subsystems, len(keys)
         #     )
 
-        pass
+        if self.max_state_size is not None or self.max_total_bytes is not None:
+            self._check_state_limits(keys, "set")
+
+    def _factorize(self, state, keys: List[int], split_func: Callable) -> List[Tuple[any, List[int]]]:
+        """Method to split a compound state into independent factors.
+
+        Each subsystem is tested once against the rest of the state (a cheap single-subsystem bipartition),
+        so only product structure of the form (subsystem) x (rest) is detected.
+
+        Args:
+            state (any): compound state to factorize.
+            keys (List[int]): keys corresponding to subsystems of `state`.
+            split_func (Callable): function `(state, index, num_systems, dim)` returning the subsystem and
+                remaining states, or None if the subsystem is not separable.
+
+        Returns:
+            List[Tuple[any, List[int]]]: list of (state, keys) factors covering all input keys.
+        """
+
+        factors = []
+        keys = list(keys)
+        i = 0
+        while len(keys) > 1 and i < len(keys):
+            split = split_func(state, i, len(keys), self.dim)
+            if split is None:
+                i += 1
+                continue
+            sub_state, state = split
+            factors.append((sub_state, [keys.pop(i)]))
+            self.split_counter += 1
+
+        factors.append((state, keys))
+        return factors
+
+    def get_average_state_size(self) -> float:
+        """Method to get the average number of subsystems per unique stored state.
+
+        Returns:
+            float: average number of keys per state (0 if no states are stored).
+        """
+
+        unique_states = {id(state): state for state in self.states.values() if state is not None}
+        if len(unique_states) == 0:
+            return 0
+        return sum(len(state.keys) for state in unique_states.values()) / len(unique_states)
+
+    def get_state_statistics(self) -> Dict[str, any]:
+        """Method to get the size of the stored states, for monitoring memory use.
+
+        Returns:
+            Dict[str, any]: dictionary with the following entries:
+                "num_states" (int): number of unique stored states.
+                "size_histogram" (Dict[int, int]): number of unique states for each number of subsystems.
+                "total_bytes" (int): memory used by the values of all unique states.
+        """
+
+        unique_states = {id(state): state for state in self.states.values() if state is not None}
+        histogram = {}
+        total_bytes = 0
+        for state in unique_states.values():
+            histogram[len(state.keys)] = histogram.get(len(state.keys), 0) + 1
+            total_bytes += state.nbytes
+        return {"num_states": len(unique_states),
+                "size_histogram": dict(sorted(histogram.items())),
+                "total_bytes": total_bytes}
+
+    def set_state_limits(self, max_state_size: int = None, max_total_bytes: int = None) -> None:
+        """Method to limit the growth of stored states.
+
+        Operations combining states (e.g. `run_circuit` on keys of separate states) or setting states
+        raise a `StateLimitError` if the resulting compound state would have more than `max_state_size` subsystems,
+        or if the memory of all stored states would then exceed `max_total_bytes`.
+        The memory of the new state is estimated before it is constructed.
+
+        Args:
+            max_state_size (int): maximum number of subsystems in one state (default None for no limit).
+            max_total_bytes (int): maximum memory used by the values of all states (default None for no limit).
+        """
+
+        self.max_state_size = max_state_size
+        self.max_total_bytes = max_total_bytes
+        # a running memory total is only kept while a memory limit is set
+        if max_total_bytes is not None and not isinstance(self.states, StateDict):
+            self.set_states(StateDict(self.states))
+        elif max_total_bytes is None and isinstance(self.states, StateDict):
+            self.set_states(dict(self.states))
+
+    def _estimate_nbytes(self, num_systems: int) -> int:
+        return 16 * self.dim ** (self._state_rank * num_systems)
+
+    def _check_state_limits(self, keys: List[int], operation: str, num_bytes: int = None) -> None:
+        """Method to check that a new state on given keys is within the limits set by `set_state_limits`.
+
+        States at the given keys are assumed to be replaced by the new state.
+        The memory limit is checked against the running total kept by `states`,
+        so the check does not iterate over all stored states.
+
+        Args:
+            keys (List[int]): keys of the new state.
+            operation (str): name of the operation creating the state (for the error message).
+            num_bytes (int): memory of the new state (default None to estimate from the number of subsystems).
+        """
+
+        if self.max_state_size is not None and len(keys) > self.max_state_size:
+            raise StateLimitError("{} on keys {} would create a state of {} subsystems "
+                                  "(max_state_size = {})".format(operation, list(keys), len(keys),
+                                                                 self.max_state_size))
+
+        if self.max_total_bytes is not None:
+            if not isinstance(self.states, StateDict):
+                self.set_states(StateDict(self.states))
+            if num_bytes is None:
+                num_bytes = self._estimate_nbytes(len(keys))
+            key_set = set(keys)
+            replaced_states = {id(state): state for state in (self.states.get(key) for key in keys)
+                               if state is not None and key_set.issuperset(state.keys)}
+            total_bytes = self.states.total_bytes + num_bytes - sum(self.states.get_nbytes(state)
+                                                                    for state in replaced_states.values())
+            if total_bytes > self.max_total_bytes:
+                raise StateLimitError("{} on keys {} would create a state of {} subsystems ({} bytes), "
+                                      "raising total state memory to {} bytes (max_total_bytes = {})".format(
+                                          operation, list(keys), len(keys), num_bytes, total_bytes,
+                                          self.max_total_bytes))
 
     def remove(self, key: int) -> None:
-        """Method to remove state stored at key."""
+        """Method to remove state stored at key.
+
+        Unlike `release`, the key is deleted immediately regardless of other keys sharing the state,
+        and is not recycled.
+        """
         del self.states[key]
+        self._owners.pop(key, None)
+        self._released.discard(key)
+        self._noise_sources.pop(key, None)
+
+    def set_noise_source(self, key: int, source: any) -> None:
+        """Method to register an object applying time-dependent noise to the subsystem at given key.
+
+        Only managers that apply noise lazily (`QuantumManagerDensity` and `QuantumManagerTrajectory`) use sources:
+        before the subsystem is next used (e.g. by `get`, `run_circuit`, `set` or `apply_channel`),
+        the manager calls `source.decohere()`, which should apply the noise accumulated since its previous call.
+
+        Args:
+            key (int): key of the subsystem.
+            source (any): object with a `decohere` method (e.g. a memory), or None to unregister.
+        """
+
+        if source is None:
+            self._noise_sources.pop(key, None)
+        else:
+            self._noise_sources[key] = source
+
+    def _apply_noise(self, keys: List[int]) -> None:
+        if self._noise_sources:
+            for key in keys:
+                source = self._noise_sources.get(key)
+                if source is not None:
+                    source.decohere()
 
     def set_states(self, states: Dict):
+        if self.max_total_bytes is not None and not isinstance(states, StateDict):
+            states = StateDict(states)
         self.states = states
 
+    def save_checkpoint(self, path: str) -> None:
+        """Method to save all stored states to a binary checkpoint file.
+
+        Each unique state is written as a length-prefixed binary message (see `State.serialize_binary`),
+        so only ket vector, density matrix and Bell diagonal states are supported.
+
+        Args:
+            path (str): path of the checkpoint file.
+        """
+
+        unique_states = {id(state): state for state in self.states.values() if state is not None}
+        with open(path, "wb") as file:
+            for state in unique_states.values():
+                buffers = state.serialize_binary()
+                file.write(sum(len(buffer) for buffer in buffers).to_bytes(CHECKPOINT_LEN_BYTES, "little"))
+                for buffer in buffers:
+                    file.write(buffer)
+
+    def load_checkpoint(self, path: str) -> None:
+        """Method to restore states saved with `save_checkpoint`.
+
+        Each saved state is stored with `set` on its keys (replacing the states currently stored there),
+        and the saved keys are no longer handed out by `new`.
+
+        Args:
+            path (str): path of the checkpoint file.
+        """
+
+        with open(path, "rb") as file:
+            data = memoryview(file.read())
+
+        loaded_keys = set()
+        offset = 0
+        while offset < len(data):
+            length = int.from_bytes(data[offset:offset + CHECKPOINT_LEN_BYTES], "little")
+            offset += CHECKPOINT_LEN_BYTES
+            state = State.deserialize_binary(data[offset:offset + length])
+            offset += length
+            self.set(state.keys, state.state)
+            loaded_keys.update(state.keys)
+
+        if loaded_keys:
+            self._least_available = max(self._least_available, max(loaded_keys) + 1)
+            self._free_keys = [key for key in self._free_keys if key not in loaded_keys]
+            self._released.difference_update(loaded_keys)
+
 
 class QuantumManagerKet(QuantumManager):
     """Class to track and manage quantum states with the ket vector formalism."""
 
     def __init__(self):
         super().__init__(KET_STATE_FORMALISM)
+        self.auto_factorize = True
 
     def new(self, state=(complex(1), complex(0))) -> int:
-        key = self._least_available
-        self._least_available += 1
+        key = self._next_key()
         self.states[key] = KetState(state, [key])
         return key
 
     def run_circuit(self, circuit: Circuit, keys: List[int], meas_samp=None) -> Dict[int, int]:
         super().run_circuit(circuit, keys, meas_samp)
+
+        if len(circuit.measured_qubits) == 0:
+            qstate = self._get_shared_state(keys)
+            if qstate is not None:
+                # key set is unchanged; update state array in place
+                num_systems = len(qstate.keys)
+                indices = [qstate.keys.index(key) for key in keys]
+                new_keys, order = self._circuit_order(qstate.keys, keys)
+                buffer = self._get_buffer(qstate.state.shape)
+                ket_apply_operator(qstate.state, circuit.get_unitary_matrix(), indices, num_systems, out=buffer)
+                tensor_shape = (2,) * num_systems
+                copyto(qstate.state.reshape(tensor_shape), buffer.reshape(tensor_shape).transpose(order))
+                qstate.keys = new_keys
+                return {}
+
         new_state, all_keys, circ_mat = self._prepare_circuit(circuit, keys)
 
         new_state = circ_mat @ new_state
 
         if len(circuit.measured_qubits) == 0:
             # set state, return no measurement result
-            new_ket = KetState(new_state, all_keys)
-            for key in all_keys:
-                self.states[key] = new_ket
+            self._set_trusted(all_keys, new_state)
             return {}
         else:
             # measure state (state reassignment done in _measure method)
@@ -199,11 +702,18 @@ class QuantumManagerKet(QuantumManager):
         for key in keys:
             self.states[key] = new_state
 
+    def _set_trusted(self, keys: List[int], amplitudes: List[complex]) -> None:
+        """Method to set quantum state at given keys without validation, for states computed by the manager."""
+
+        new_state = KetState.trusted(amplitudes, keys)
+        for key in keys:
+            self.states[key] = new_state
+
     def set_to_zero(self, key: int):
-        self.set([key], [complex(1), complex(0)])
+        self._set_trusted([key], [complex(1), complex(0)])
 
     def set_to_one(self, key: int):
-        self.set([key], [complex(0), complex(1)])
+        self._set_trusted([key], [complex(0), complex(1)])
 
     def _measure(self, state: List[complex], keys: List[int],
                  all_keys: List[int], meas_samp: float) -> Dict[int, int]:
@@ -273,41 +783,132 @@ class QuantumManagerKet(QuantumManager):
 
         for res, key in zip(result_digits, keys):
             # set to state measured
-            new_state_obj = KetState(result_states[res], [key])
-            self.states[key] = new_state_obj
-        
+            self._set_trusted([key], result_states[res])
+
         if len(all_keys) > 0:
-            new_state_obj = KetState(new_state, all_keys)
-            for key in all_keys:
-                self.states[key] = new_state_obj
-        
+            if self.auto_factorize and len(all_keys) > 1:
+                factors = self._factorize(new_state, all_keys, ket_split_subsystem)
+            else:
+                factors = [(new_state, all_keys)]
+
+            for factor_state, factor_keys in factors:
+                self._set_trusted(factor_keys, factor_state)
+
         return dict(zip(keys, result_digits))
 
 
+class QuantumManagerTrajectory(QuantumManagerKet):
+    """Class to track and manage quantum states with stochastic ket vector trajectories.
+
+    Noise channels are applied with `apply_channel`, which samples a single Kraus branch and keeps the state pure
+    (Monte Carlo wavefunction method).
+    Averaged over runs, results reproduce those of the density matrix formalism at the memory cost of ket vectors.
+    The `formalism` attribute is the ket vector formalism, so components treat this manager as a ket manager.
+    As with `QuantumManagerDensity`, time-dependent noise may be applied lazily by sources registered with
+    `set_noise_source` (e.g. memories sampling a Pauli channel with `apply_channel`).
+    """
+
+    def get(self, key: int) -> "State":
+        if self._noise_sources:
+            self._apply_noise(self.states[key].keys)
+        return self.states[key]
+
+    def run_circuit(self, circuit: Circuit, keys: List[int], meas_samp=None) -> Dict[int, int]:
+        self._apply_noise(keys)
+        return super().run_circuit(circuit, keys, meas_samp)
+
+    def set(self, keys: List[int], amplitudes: List[complex]) -> None:
+        self._apply_noise(keys)
+        super().set(keys, amplitudes)
+
+    def apply_channel(self, keys: List[int], kraus_ops: array, meas_samp: float) -> int:
+        """Method to apply a noise channel to the subsystems at given keys by sampling one Kraus branch.
+
+        Branch `i` is chosen with probability ||K_i psi||^2, and the state is set to K_i psi (renormalized).
+
+        Args:
+            keys (List[int]): keys of subsystems the channel acts on.
+            kraus_ops (array): (m, 2 ** k, 2 ** k) array stacking the Kraus operators, with k = len(keys).
+            meas_samp (float): random sample in [0, 1) used to choose the branch.
+
+        Returns:
+            int: index of the sampled Kraus operator.
+        """
+
+        self._apply_noise(keys)
+        state, all_keys = self._get_compound_state(keys, "apply_channel")
+        indices = [all_keys.index(key) for key in keys]
+
+        # branches are computed lazily; the last branch with non-zero probability absorbs rounding error
+        cum_prob = 0
+        result, new_state, prob = None, None, 0
+        for i, kraus_op in enumerate(kraus_ops):
+            branch = ket_apply_operator(state, kraus_op, indices, len(all_keys))
+            branch_prob = vdot(branch, branch).real
+            if branch_prob <= 0:
+                continue
+            result, new_state, prob = i, branch, branch_prob
+            cum_prob += branch_prob
+            if meas_samp < cum_prob:
+                break
+
+        self._set_trusted(all_keys, new_state / sqrt(prob))
+        return result
+
+
 class QuantumManagerDensity(QuantumManager):
-    """Class to track and manage states with the density matrix formalism."""
+    """Class to track and manage states with the density matrix formalism.
+
+    Time-dependent noise may be applied lazily: objects registered with `set_noise_source` are asked to apply
+    their accumulated noise (e.g. with `apply_superoperator`) only when their subsystem is next used.
+    """
+
+    _state_rank = 2
 
     def __init__(self):
         super().__init__(DENSITY_MATRIX_FORMALISM)
+        self.auto_factorize = True
 
     def new(self,
             state=([complex(1), complex(0)], [complex(0), complex(0)])) -> int:
-        key = self._least_available
-        self._least_available += 1
+        key = self._next_key()
         self.states[key] = DensityState(state, [key])
         return key
 
+    def get(self, key: int) -> "State":
+        if self._noise_sources:
+            self._apply_noise(self.states[key].keys)
+        return self.states[key]
+
     def run_circuit(self, circuit: Circuit, keys: List[int], meas_samp=None) -> Dict[int, int]:
         super().run_circuit(circuit, keys, meas_samp)
+        self._apply_noise(keys)
+
+        if len(circuit.measured_qubits) == 0:
+            qstate = self._get_shared_state(keys)
+            if qstate is not None:
+                # key set is unchanged; update state array in place
+                num_systems = len(qstate.keys)
+                indices = [qstate.keys.index(key) for key in keys]
+                new_keys, order = self._circuit_order(qstate.keys, keys)
+                shape = qstate.state.shape
+                buffer = self._get_buffer(shape)
+                out = self._get_buffer(shape, 1)
+                density_apply_unitary(qstate.state, circuit.get_unitary_matrix(), indices, num_systems,
+                                      out=out, buffer=buffer)
+                tensor_shape = (2,) * (2 * num_systems)
+                order = order + [num_systems + i for i in order]
+                copyto(qstate.state.reshape(tensor_shape), out.reshape(tensor_shape).transpose(order))
+                qstate.keys = new_keys
+                return {}
+
         new_state, all_keys, circ_mat = super()._prepare_circuit(circuit, keys)
 
         new_state = circ_mat @ new_state @ circ_mat.conj().T
 
         if len(circuit.measured_qubits) == 0:
             # set state, return no measurement result
-            new_state_obj = DensityState(new_state, all_keys)
-            for key in all_keys:
-                self.states[key] = new_state_obj
+            self._set_trusted(all_keys, new_state)
             return {}
         else:
             # measure state (state reassignment done in _measure method)
@@ -327,15 +928,60 @@ class QuantumManagerDensity(QuantumManager):
         """
 
         super().set(keys, state)
+        self._apply_noise(keys)
         new_state = DensityState(state, keys)
         for key in keys:
             self.states[key] = new_state
 
+    def _set_trusted(self, keys: List[int], state: List[List[complex]]) -> None:
+        """Method to set quantum state at given keys without validation, for states computed by the manager."""
+
+        new_state = DensityState.trusted(state, keys)
+        for key in keys:
+            self.states[key] = new_state
+
     def set_to_zero(self, key: int):
-        self.set([key], [[complex(1), complex(0)], [complex(0), complex(0)]])
+        self._set_trusted([key], [[complex(1), complex(0)], [complex(0), complex(0)]])
 
     def set_to_one(self, key: int):
-        self.set([key], [[complex(0), complex(0)], [complex(0), complex(1)]])
+        self._set_trusted([key], [[complex(0), complex(0)], [complex(0), complex(1)]])
+
+    def apply_channel(self, keys: List[int], kraus_ops: array, meas_samp: float = None) -> None:
+        """Method to apply a noise channel to the subsystems at given keys, i.e. rho -> sum_i K_i rho K_i^dagger.
+
+        Args:
+            keys (List[int]): keys of subsystems the channel acts on.
+            kraus_ops (array): (m, 2 ** k, 2 ** k) array stacking the Kraus operators, with k = len(keys).
+            meas_samp (float): unused; accepted for compatibility with `QuantumManagerTrajectory.apply_channel`.
+        """
+
+        self._apply_noise(keys)
+        state, all_keys = self._get_compound_state(keys, "apply_channel")
+        indices = [all_keys.index(key) for key in keys]
+        self._set_trusted(all_keys, density_apply_channel(state, kraus_ops, indices, len(all_keys)))
+
+    def apply_superoperator(self, keys: List[int], superop: array) -> None:
+        """Method to apply a noise channel given by its superoperator to the subsystems at given keys.
+
+        Superoperators for the channel library are built (and cached) by `build_channel_superoperator`.
+        If the keys already share one state, the state is updated in place.
+
+        Args:
+            keys (List[int]): keys of subsystems the channel acts on.
+            superop (array): (4 ** k, 4 ** k) superoperator, with k = len(keys).
+        """
+
+        self._apply_noise(keys)
+        qstate = self._get_shared_state(keys)
+        if qstate is not None:
+            indices = [qstate.keys.index(key) for key in keys]
+            out = self._get_buffer(qstate.state.shape)
+            density_apply_superoperator(qstate.state, superop, indices, len(qstate.keys), out=out)
+            copyto(qstate.state, out)
+        else:
+            state, all_keys = self._get_compound_state(keys, "apply_superoperator")
+            indices = [all_keys.index(key) for key in keys]
+            self._set_trusted(all_keys, density_apply_superoperator(state, superop, indices, len(all_keys)))
 
     def _measure(self, state: List[List[complex]], keys: List[int],
                  all_keys: List[int], meas_samp: float) -> Dict[int, int]:
@@ -401,19 +1047,53 @@ class QuantumManagerDensity(QuantumManager):
         while len(result_digits) < len(keys):
             result_digits.insert(0, 0)
 
-        new_state_obj = DensityState(new_state, all_keys)
-        for key in all_keys:
-            self.states[key] = new_state_obj
+        if self.auto_factorize and len(all_keys) > 1:
+            # measured keys are left in basis states and split off directly;
+            # only the remaining keys are checked for separability
+            result_states = [[[1, 0], [0, 0]], [[0, 0], [0, 1]]]
+            factors = [(result_states[res], [key]) for key, res in zip(keys, result_digits)]
+            rest_keys = [key for key in all_keys if key not in keys]
+            self.split_counter += len(factors) if len(rest_keys) > 0 else len(factors) - 1
+            if len(rest_keys) > 0:
+                num_systems = len(all_keys)
+                index = [slice(None)] * (2 * num_systems)
+                for key, res in zip(keys, result_digits):
+                    i = all_keys.index(key)
+                    index[i] = index[num_systems + i] = res
+                rest_dim = 2 ** len(rest_keys)
+                rest_state = array(new_state, dtype=complex).reshape((2,) * (2 * num_systems))[tuple(index)]
+                rest_state = rest_state.reshape((rest_dim, rest_dim))
+                if len(rest_keys) > 1:
+                    factors += self._factorize(rest_state, rest_keys, density_split_subsystem)
+                else:
+                    factors.append((rest_state, rest_keys))
+        else:
+            factors = [(new_state, all_keys)]
+
+        for factor_state, factor_keys in factors:
+            self._set_trusted(factor_keys, factor_state)
 
         return dict(zip(keys, result_digits))
 
 
 class QuantumManagerDensityFock(QuantumManager):
-    """Class to track and manage Fock states with the density matrix formalism."""
+    """Class to track and manage Fock states with the density matrix formalism.
 
-    def __init__(self, truncation: int = 1):
+    In sparse mode, states with a low fraction of non-zero elements are stored as `SparseDensityState` objects
+    and operated on with sparse matrices; states filled above `sparse_fill_threshold` are stored densely.
+
+    Attributes:
+        sparse (bool): whether sparse storage is enabled (default False).
+        sparse_fill_threshold (float): maximum fraction of non-zero elements for a state to be stored sparsely.
+    """
+
+    _state_rank = 2
+
+    def __init__(self, truncation: int = 1, sparse: bool = False, sparse_fill_threshold: float = 0.1):
         # default truncation is 1 for 2-d Fock space.
         super().__init__(DENSITY_MATRIX_FORMALISM, truncation=truncation)
+        self.sparse: bool = sparse
+        self.sparse_fill_threshold: float = sparse_fill_threshold
 
     def new(self, state=None) -> int:
         """Method to create a new state with key
@@ -424,16 +1104,36 @@ class QuantumManagerDensityFock(QuantumManager):
                 Other inputs are passed to the constructor of `DensityState`.
         """
 
-        key = self._least_available
-        self._least_available += 1
+        key = self._next_key()
         if state is None:
-            gnd = [1] + [0]*self.truncation
-            self.states[key] = DensityState(gnd, [key], truncation=self.truncation)
-        else:
-            self.states[key] = DensityState(state, [key], truncation=self.truncation)
+            state = [1] + [0]*self.truncation
+        self.states[key] = self._build_state(state, [key])
 
         return key
 
+    def _build_state(self, state, keys: List[int]) -> DensityState:
+        """Helper function to construct a state object, choosing sparse or dense storage.
+
+        Args:
+            state (Union[spmatrix, List[complex], List[List[complex]]]): amplitudes of new state.
+            keys (List[int]): keys of the new state.
+
+        Returns:
+            DensityState: a `SparseDensityState` if sparse mode is on and the fill is at most
+                `sparse_fill_threshold`, otherwise a dense `DensityState`.
+        """
+
+        if not self.sparse:
+            if issparse(state):
+                state = state.toarray()
+            return DensityState(state, keys, truncation=self.truncation)
+
+        sparse_state = SparseDensityState(state, keys, truncation=self.truncation)
+        sparse_state.state.eliminate_zeros()
+        if sparse_state.state.nnz <= self.sparse_fill_threshold * sparse_state.state.shape[0] ** 2:
+            return sparse_state
+        return DensityState(sparse_state.state.toarray(), keys, truncation=self.truncation)
+
     def run_circuit(self, circuit: Circuit, keys: List[int], meas_samp=None) -> Dict[int, int]:
         """Currently the Fock states do not support quantum circuits.
         This method is only to implement abstract method of parent class and SHOULD NOT be called after instantiation.
@@ -454,17 +1154,32 @@ class QuantumManagerDensityFock(QuantumManager):
 
         size = self.dim ** num_systems
         swap_unitary = zeros((size, size))
+        swap_unitary[self._generate_swap_permutation(num_systems, i, j), range(size)] = 1
+
+        return swap_unitary
+
+    def _generate_swap_permutation(self, num_systems: int, i: int, j: int) -> List[int]:
+        """Helper function to generate the basis permutation of a subsystem swap.
+
+        Args:
+            num_systems (int): number of subsystems in state
+            i (int): index of first subsystem to swap
+            j (int): index of second subsystem to swap
 
-        for old_index in range(size):
+        Returns:
+            List[int]: new index of each basis state (the permutation is its own inverse).
+        """
+
+        permutation = []
+        for old_index in range(self.dim ** num_systems):
             old_str = base_repr(old_index, self.dim)
             old_str = old_str.zfill(num_systems)
             new_str = ''.join((old_str[:i], old_str[j], old_str[i+1:j], old_str[i], old_str[j+1:]))
-            new_index = int(new_str, base=self.dim)
-            swap_unitary[new_index, old_index] = 1
+            permutation.append(int(new_str, base=self.dim))
 
-        return swap_unitary
+        return permutation
 
-    def _prepare_state(self, keys: List[int]):
+    def _prepare_state(self, keys: List[int], operation: str = "prepare_state"):
         """Function to prepare states at given keys for operator application.
 
         Will take composite quantum state and swap subsystems to correspond with listed keys.
@@ -472,10 +1187,12 @@ class QuantumManagerDensityFock(QuantumManager):
 
         Args:
             keys (List[int]): keys for states to apply operator to.
+            operation (str): name of the calling operation, reported if the state limits are exceeded.
 
         Returns:
             Tuple(List[List[complex]], List[int]): Tuple containing:
                 1. new state to apply operator to, with keys swapped to be consecutive.
+                    This is a sparse matrix if sparse mode is on and the compound state is sparse enough.
                 2. list of keys corresponding to new state.
         """
 
@@ -490,9 +1207,30 @@ class QuantumManagerDensityFock(QuantumManager):
                 all_keys += qstate.keys
 
         # construct compound state
-        new_state = [1]
-        for state in old_states:
-            new_state = kron(new_state, state)
+        # (the fill of a kronecker product is the product of fills, so its sparsity is known in advance)
+        use_sparse = False
+        if self.sparse:
+            fill = 1
+            for state in old_states:
+                nnz = state.nnz if issparse(state) else count_nonzero(state)
+                fill *= nnz / state.shape[0] ** 2
+            use_sparse = fill <= self.sparse_fill_threshold
+
+        if len(old_states) > 1:
+            num_bytes = self._estimate_nbytes(len(all_keys))
+            if use_sparse:
+                # values and column indices of non-zero elements
+                num_bytes = int(fill * num_bytes * 1.25)
+            self._check_state_limits(all_keys, operation, num_bytes)
+
+        if use_sparse:
+            new_state = csr_matrix([[1]], dtype=complex)
+            for state in old_states:
+                new_state = sparse_kron(new_state, csr_matrix(state), format="csr")
+        else:
+            new_state = [1]
+            for state in old_states:
+                new_state = kron(new_state, state.toarray() if issparse(state) else state)
 
         # apply any necessary swaps to order keys
         if len(keys) > 1:
@@ -506,29 +1244,29 @@ class QuantumManagerDensityFock(QuantumManager):
                 i = i + start_idx
                 j = all_keys.index(key)
                 if j != i:
-                    swap_unitary = self._generate_swap_operator(len(all_keys), i, j)
-                    new_state = swap_unitary @ new_state @ swap_unitary.T
+                    if use_sparse:
+                        permutation = self._generate_swap_permutation(len(all_keys), i, j)
+                        new_state = new_state[permutation][:, permutation]
+                    else:
+                        swap_unitary = self._generate_swap_operator(len(all_keys), i, j)
+                        new_state = swap_unitary @ new_state @ swap_unitary.T
                     all_keys[i], all_keys[j] = all_keys[j], all_keys[i]
 
         return new_state, all_keys
 
-    def _prepare_operator(self, all_keys: List[int], keys: List[int], operator) -> array:
-        # pad operator with identity
-        left_dim = self.dim ** all_keys.index(keys[0])
-        right_dim = self.dim ** (len(all_keys) - all_keys.index(keys[-1]) - 1)
-        prepared_operator = operator
+    def apply_operator(self, operator: array, keys: List[int]):
+        """Method to apply an operator O to the subsystems at given keys, i.e. rho -> O rho O^dagger.
 
-        if left_dim > 0:
-            prepared_operator = kron(identity(left_dim), prepared_operator)
-        if right_dim > 0:
-            prepared_operator = kron(prepared_operator, identity(right_dim))
+        The operator is contracted with the target subsystem axes only (no identity padding).
 
-        return prepared_operator
+        Args:
+            operator (array): operator acting on the (consecutive) subsystems given by `keys`.
+            keys (List[int]): keys of subsystems to apply the operator to.
+        """
 
-    def apply_operator(self, operator: array, keys: List[int]):
-        prepared_state, all_keys = self._prepare_state(keys)
-        prepared_operator = self._prepare_operator(all_keys, keys, operator)
-        new_state = prepared_operator @ prepared_state @ prepared_operator.conj().T
+        prepared_state, all_keys = self._prepare_state(keys, "apply_operator")
+        apply_func = sparse_density_apply_operator if issparse(prepared_state) else density_apply_operator
+        new_state = apply_func(prepared_state, operator, all_keys.index(keys[0]), len(all_keys), self.dim)
         self.set(all_keys, new_state)
 
     def set(self, keys: List[int], state: List[List[complex]]) -> None:
@@ -544,7 +1282,7 @@ class QuantumManagerDensityFock(QuantumManager):
         """
 
         super().set(keys, state)
-        new_state = DensityState(state, keys, truncation=self.truncation)
+        new_state = self._build_state(state, keys)
         for key in keys:
             self.states[key] = new_state
 
@@ -578,7 +1316,7 @@ class QuantumManagerDensityFock(QuantumManager):
             int: measurement as index of matching POVM in supplied tuple.
         """
 
-        new_state, all_keys = self._prepare_state(keys)
+        new_state, all_keys = self._prepare_state(keys, "measure")
         return self._measure(new_state, keys, all_keys, povms, meas_samp)
 
     def _measure(self, state: List[List[complex]], keys: List[int],
@@ -599,29 +1337,34 @@ class QuantumManagerDensityFock(QuantumManager):
             int: measurement as index of matching POVM in supplied tuple.
         """
 
-        state_tuple = tuple(map(tuple, state))
-        povm_tuple = tuple([tuple(map(tuple, povm)) for povm in povms])
         new_state = None
         result = 0
 
         # calculate meas probabilities and projected states
-        if len(keys) == 1:
-            if len(all_keys) == 1:
-                states, probs = measure_state_with_cache_fock_density(state_tuple, povm_tuple)
+        if issparse(state):
+            indices = tuple([all_keys.index(key) for key in keys])
+            states, probs = sparse_measure_fock_density(state, indices, len(all_keys), povms, self.truncation)
+
+        else:
+            state_tuple = tuple(map(tuple, state))
+            povm_tuple = tuple([tuple(map(tuple, povm)) for povm in povms])
+            if len(keys) == 1:
+                if len(all_keys) == 1:
+                    states, probs = measure_state_with_cache_fock_density(state_tuple, povm_tuple)
+
+                else:
+                    key = keys[0]
+                    num_states = len(all_keys)
+                    state_index = all_keys.index(key)
+                    states, probs = \
+                        measure_entangled_state_with_cache_fock_density(state_tuple, state_index, num_states,
+                                                                        povm_tuple, self.truncation)
 
             else:
-                key = keys[0]
-                num_states = len(all_keys)
-                state_index = all_keys.index(key)
+                indices = tuple([all_keys.index(key) for key in keys])
                 states, probs = \
-                    measure_entangled_state_with_cache_fock_density(state_tuple, state_index, num_states, povm_tuple,
-                                                                    self.truncation)
-
-        else:
-            indices = tuple([all_keys.index(key) for key in keys])
-            states, probs = \
-                measure_multiple_with_cache_fock_density(state_tuple, indices, len(all_keys), povm_tuple,
-                                                         self.truncation)
+                    measure_multiple_with_cache_fock_density(state_tuple, indices, len(all_keys), povm_tuple,
+                                                             self.truncation)
 
         # calculate result based on measurement sample.
         prob_sum = cumsum(probs)
@@ -650,43 +1393,30 @@ class QuantumManagerDensityFock(QuantumManager):
         # assign remaining state
         if len(keys) < len(all_keys):
             indices = tuple([all_keys.index(key) for key in keys])
-            new_state_tuple = tuple(map(tuple, new_state))
-            remaining_state = density_partial_trace(new_state_tuple, indices, len(all_keys), self.truncation)
+            if issparse(new_state):
+                remaining_state = sparse_density_partial_trace(new_state, indices, len(all_keys), self.truncation)
+            else:
+                new_state_tuple = tuple(map(tuple, new_state))
+                remaining_state = density_partial_trace(new_state_tuple, indices, len(all_keys), self.truncation)
             remaining_keys = [key for key in all_keys if key not in keys]
             self.set(remaining_keys, remaining_state)
 
         return result
 
-    def _build_loss_kraus_operators(self, loss_rate: float, all_keys: List[int], key: int) -> List[array]:
+    def _build_loss_kraus_operators(self, loss_rate: float) -> array:
         """Method to build Kraus operators of a generalized amplitude damping channel.
 
         This represents the effect of photon loss.
+        Operators act on a single subsystem and are cached by (loss_rate, truncation).
 
         Args:
             loss_rate (float): loss rate for the quantum channel.
-            all_keys (List[int]): list of all keys in affected state.
-            key (int): key for subsystem experiencing loss.
 
         Returns:
-            List[array]: list of generated Kraus operators.
+            array: (dim, dim, dim) array stacking the generated Kraus operators.
         """
 
-        assert 0 <= loss_rate <= 1
-        kraus_ops = []
-
-        for k in range(self.dim):
-            total_kraus_op = zeros((self.dim ** len(all_keys), self.dim ** len(all_keys)))
-
-            for n in range(k, self.dim):
-                coeff = sqrt(binom(n, k)) * sqrt(((1-loss_rate) ** (n-k)) * (loss_rate ** k))
-                single_op = zeros((self.dim, self.dim))
-                single_op[n-k, n] = 1
-                total_op = self._prepare_operator(all_keys, [key], single_op)
-                total_kraus_op += coeff * total_op
-
-            kraus_ops.append(total_kraus_op)
-
-        return kraus_ops
+        return build_loss_kraus_operators(loss_rate, self.truncation)
 
     def add_loss(self, key, loss_rate):
         """Method to apply generalized amplitude damping channel on a *single* subspace corresponding to `key`.
@@ -696,13 +1426,10 @@ class QuantumManagerDensityFock(QuantumManager):
             loss_rate (float): loss rate for the quantum channel.
         """
 
-        prepared_state, all_keys = self._prepare_state([key])
-        kraus_ops = self._build_loss_kraus_operators(loss_rate, all_keys, key)
-        output_state = zeros(prepared_state.shape, dtype=complex)
-
-        for kraus_op in kraus_ops:
-            output_state += kraus_op @ prepared_state @ kraus_op.conj().T
-
+        prepared_state, all_keys = self._prepare_state([key], "add_loss")
+        kraus_ops = self._build_loss_kraus_operators(loss_rate)
+        apply_func = sparse_density_apply_kraus if issparse(prepared_state) else density_apply_kraus
+        output_state = apply_func(prepared_state, kraus_ops, all_keys.index(key), len(all_keys), self.dim)
         self.set(all_keys, output_state)
 
 
@@ -714,10 +1441,24 @@ class QuantumManagerBellDiagonal(QuantumManager):
 
     * BDS is only used for entanglement distribution (generation, swapping, purification), assuming underlying errors being purely Pauli.
     * All manipulation results can be tracked analytically, without explicit quantum gates / channels / measurements.
+
+    The diagonal elements of all pairs are stored contiguously in the (N, 4) `bds_array`,
+    and the state objects stored in `states` are views onto its rows.
+    Decoherence transforms are queued by `decohere` (or `decohere_many`) and applied lazily
+    (vectorized over all queued pairs) the next time any state is read or written.
+
+    Attributes:
+        bds_array (np.array): (N, 4) array of Bell diagonal elements, one row per pair id.
     """
 
+    _INITIAL_CAPACITY = 16
+
     def __init__(self):
         super().__init__(BELL_DIAGONAL_STATE_FORMALISM)
+        self.bds_array = zeros((self._INITIAL_CAPACITY, 4))
+        self._num_pair_ids: int = 0
+        self._free_pair_ids: List[int] = []
+        self._pending: List[Tuple[int, array]] = []  # queued (pair id, transform) entries
 
     def new(self, state=None) -> int:
         """Generates new quantum state key for quantum manager.
@@ -733,8 +1474,7 @@ class QuantumManagerBellDiagonal(QuantumManager):
         Returns:
             int: quantum state key corresponding to state.
         """
-        key = self._least_available
-        self._least_available += 1
+        key = self._next_key()
         return key
 
     def get(self, key: int):
@@ -745,16 +1485,411 @@ class QuantumManagerBellDiagonal(QuantumManager):
 
     def set(self, keys: List[int], diag_elems: List[float]) -> None:
         super().set(keys, diag_elems)
+        self.flush()
         # assert len(keys) == 2, "Bell diagonal states must have 2 keys."
         if len(keys) != 2:
             #raise Warning("bell diagonal quantum manager received invalid set request")  # optional
             for key in keys:
                 if key in self.states:
-                    self.states.pop(key)
+                    self._unlink(key)
+            return
+
+        BellDiagonalState(diag_elems, keys)  # validate diagonal elements
+        old_state = self.states.get(keys[0])
+        if old_state is not None and old_state is self.states.get(keys[1]) and old_state.keys == list(keys):
+            # same pair; overwrite row in place, with a new view so the old state keeps its values
+            old_state.detach()
+            self.bds_array[old_state.pair_id] = diag_elems
+            new_state = BellDiagonalStateView(self, old_state.pair_id, list(keys))
+            for key in keys:
+                self.states[key] = new_state
             return
-        new_state = BellDiagonalState(diag_elems, keys)
+
+        for key in keys:
+            if key in self.states:
+                self._unlink(key)
+        pair_id = self._allocate_pair_id()
+        self.bds_array[pair_id] = diag_elems
+        new_state = BellDiagonalStateView(self, pair_id, list(keys))
         for key in keys:
             self.states[key] = new_state
 
     def set_to_noiseless(self, keys: List[int]):
         self.set(keys, [float(1), float(0), float(0), float(0)])
+
+    def remove(self, key: int) -> None:
+        self.flush()
+        self._unlink(key)
+        self._owners.pop(key, None)
+        self._released.discard(key)
+
+    def decohere(self, key: int, transform: array) -> None:
+        """Method to queue a linear transform of the Bell diagonal elements of the pair holding `key`.
+
+        The transform is applied lazily, together with all other queued transforms (see `flush`).
+        Pauli channel transforms on Bell diagonal states commute, so application order does not matter.
+
+        Args:
+            key (int): key of one qubit of the pair.
+            transform (array): 4x4 transform matrix of the diagonal elements.
+                Should not be modified after queueing (e.g. cached matrices).
+        """
+
+        self._pending.append((self.get(key).pair_id, transform))
+
+    def decohere_many(self, keys: List[int], transforms: array) -> None:
+        """Method to queue linear transforms of the Bell diagonal elements of the pairs holding `keys`.
+
+        Args:
+            keys (List[int]): key of one qubit of each pair.
+            transforms (array): (n, 4, 4) array of transform matrices, one for each key.
+        """
+
+        self._pending.extend(zip([self.get(key).pair_id for key in keys], transforms))
+
+    def flush(self) -> None:
+        """Method to apply all queued decoherence transforms.
+
+        Transforms are stacked and applied with one vectorized operation;
+        pairs queued several times get one further operation per repetition.
+        """
+
+        if not self._pending:
+            return
+
+        pair_ids, transforms = zip(*self._pending)
+        self._pending = []
+        pair_ids = array(pair_ids)
+        transforms = stack(transforms)
+        while len(pair_ids) > 0:
+            # fancy-index assignment applies each row once; apply the first occurrence of each pair per round
+            unique_ids, first = unique(pair_ids, return_index=True)
+            self.bds_array[unique_ids] = einsum('nij,nj->ni', transforms[first], self.bds_array[unique_ids])
+            rest = ones(len(pair_ids), dtype=bool)
+            rest[first] = False
+            pair_ids, transforms = pair_ids[rest], transforms[rest]
+
+    def _allocate_pair_id(self) -> int:
+        if self._free_pair_ids:
+            return self._free_pair_ids.pop()
+        if self._num_pair_ids == len(self.bds_array):
+            self.bds_array = concatenate([self.bds_array, zeros(self.bds_array.shape)])
+        pair_id = self._num_pair_ids
+        self._num_pair_ids += 1
+        return pair_id
+
+    def _unlink(self, key: int) -> None:
+        """Remove `key` from the states mapping, freeing the row of its pair once no key refers to it."""
+
+        state = self.states.pop(key)
+        if state is None or any(self.states.get(k) is state for k in state.keys):
+            return
+        state.detach()
+        self._free_pair_ids.append(state.pair_id)
+
+
+@lru_cache(maxsize=1000)
+def _gate_unitary(name: str, num_qubits: int, arg=None) -> array:
+    """Unitary of a single circuit gate acting on qubits (0, ..., num_qubits - 1) in order, cached by gate."""
+
+    circuit = Circuit(num_qubits)
+    circuit.gates.append([name, list(range(num_qubits)), arg])
+    return circuit.get_unitary_matrix()
+
+
+class QuantumManagerMPS(QuantumManager):
+    """Class to track and manage quantum states as matrix product states (MPS).
+
+    Circuits are applied gate by gate on neighboring sites (moving sites together with swaps),
+    so the cost grows with the bond dimension rather than exponentially with the number of entangled qubits.
+    Bonds are truncated after every split according to `max_bond_dim` and `svd_cutoff`.
+    The `formalism` attribute is the ket vector formalism, and `get` returns states whose `state` is a ket vector,
+    so components and protocols treat this manager as a ket manager.
+
+    Attributes:
+        max_bond_dim (int): maximum bond dimension kept when splitting tensors (default None for no limit).
+        svd_cutoff (float): singular values below `svd_cutoff` times the largest are discarded (default 1e-10).
+        truncation_error (float): total fraction of weight discarded by bond truncation so far.
+    """
+
+    def __init__(self, max_bond_dim: int = None, svd_cutoff: float = 1e-10):
+        super().__init__(KET_STATE_FORMALISM)
+        self.auto_factorize = True
+        self.max_bond_dim = max_bond_dim
+        self.svd_cutoff = svd_cutoff
+        self.truncation_error: float = 0
+
+    def new(self, state=(complex(1), complex(0))) -> int:
+        key = self._next_key()
+        self.set([key], state)
+        return key
+
+    def run_circuit(self, circuit: Circuit, keys: List[int], meas_samp=None) -> Dict[int, int]:
+        super().run_circuit(circuit, keys, meas_samp)
+        tensors, all_keys = self._get_chain(keys)
+
+        for name, indices, arg in circuit.gates:
+            gate_keys = [keys[i] for i in indices]
+            self._apply_gate(tensors, all_keys, gate_keys, _gate_unitary(name, len(indices), arg))
+
+        results = {}
+        for i in circuit.measured_qubits:
+            # sample each qubit from its conditional distribution, reusing the remainder of meas_samp;
+            # this selects the same joint outcome as the ket vector manager for the same sample
+            key = keys[i]
+            index = all_keys.index(key)
+            prob_0 = mps_norm_squared(tensors, index, 0) / mps_norm_squared(tensors)
+            if meas_samp < prob_0:
+                result = 0
+                meas_samp = meas_samp / prob_0
+            else:
+                result = 1
+                meas_samp = (meas_samp - prob_0) / (1 - prob_0)
+            self._project_site(tensors, all_keys, index, result)
+            if result == 0:
+                self.set_to_zero(key)
+            else:
+                self.set_to_one(key)
+            results[key] = result
+
+        if len(all_keys) > 0:
+            self._store_chain(tensors, all_keys, self.auto_factorize and len(results) > 0)
+        return results
+
+    def set(self, keys: List[int], amplitudes: List[complex]) -> None:
+        super().set(keys, amplitudes)
+        KetState(amplitudes, keys)  # validate amplitudes
+        block = array(amplitudes, dtype=complex).reshape((1, -1, 1))
+        tensors = self._split_block(block, len(keys))
+        self._store_chain(tensors, list(keys), False)
+
+    def set_to_zero(self, key: int):
+        self.set([key], [complex(1), complex(0)])
+
+    def set_to_one(self, key: int):
+        self.set([key], [complex(0), complex(1)])
+
+    def _get_chain(self, keys: List[int]) -> Tuple[List[array], List[int]]:
+        """Method to join the states of given keys into one chain (tensor product of the MPS).
+
+        Returns:
+            Tuple[List[array], List[int]]: site tensors of the chain and corresponding keys.
+        """
+
+        tensors = []
+        all_keys = []
+        for key in keys:
+            qstate = self.states[key]
+            if qstate.keys[0] not in all_keys:
+                tensors += qstate.tensors
+                all_keys += qstate.keys
+        if len(all_keys) > len(self.states[keys[0]].keys):
+            self._check_state_limits(all_keys, "run_circuit", sum(tensor.nbytes for tensor in tensors))
+        return tensors, all_keys
+
+    def _store_chain(self, tensors: List[array], all_keys: List[int], factorize: bool) -> None:
+        """Method to store a chain as one state, or split into independent states at bonds of dimension 1.
+
+        Each stored state is normalized.
+        """
+
+        start = 0
+        for i, tensor in enumerate(tensors):
+            if i == len(tensors) - 1 or (factorize and tensor.shape[2] == 1):
+                part = tensors[start:i + 1]
+                part[0] = part[0] / sqrt(mps_norm_squared(part))
+                new_state = MPSState(part, all_keys[start:i + 1])
+                for key in new_state.keys:
+                    self.states[key] = new_state
+                start = i + 1
+
+    def _split_block(self, block: array, num_sites: int) -> List[array]:
+        tensors, discarded = mps_split_block(block, num_sites, self.dim, self.max_bond_dim, self.svd_cutoff)
+        self.truncation_error += discarded
+        return tensors
+
+    def _apply_block(self, tensors: List[array], start: int, num_sites: int, unitary: array = None,
+                     order: List[int] = None) -> None:
+        """Method to contract consecutive sites, apply an operator and/or permute them, and split them again."""
+
+        block = mps_contract_block(tensors[start:start + num_sites])
+        if order is not None:
+            left_dim, _, right_dim = block.shape
+            block = block.reshape((left_dim,) + (self.dim,) * num_sites + (right_dim,))
+            block = block.transpose([0] + [i + 1 for i in order] + [num_sites + 1]).reshape((left_dim, -1, right_dim))
+        if unitary is not None:
+            block = einsum('ij,ajb->aib', unitary, block)
+        tensors[start:start + num_sites] = self._split_block(block, num_sites)
+
+    def _apply_gate(self, tensors: List[array], all_keys: List[int], gate_keys: List[int], unitary: array) -> None:
+        """Method to apply a gate, first moving its sites next to each other (in gate order) with swaps."""
+
+        for j in range(1, len(gate_keys)):
+            while True:
+                target = all_keys.index(gate_keys[0]) + j
+                index = all_keys.index(gate_keys[j])
+                if index == target:
+                    break
+                i = index - 1 if index > target else index
+                self._apply_block(tensors, i, 2, order=[1, 0])
+                all_keys[i], all_keys[i + 1] = all_keys[i + 1], all_keys[i]
+
+        self._apply_block(tensors, all_keys.index(gate_keys[0]), len(gate_keys), unitary=unitary)
+
+    def _project_site(self, tensors: List[array], all_keys: List[int], index: int, result: int) -> None:
+        """Method to project a site onto a basis state and remove it from the chain.
+
+        The projected site is absorbed into a neighbor, and the bonds of that neighbor are recompressed.
+        """
+
+        matrix = tensors[index][:, result, :]
+        matrix = matrix / sqrt(mps_norm_squared(tensors, index, result))
+        del tensors[index]
+        del all_keys[index]
+        if len(tensors) == 0:
+            return
+
+        if index > 0:
+            neighbor = index - 1
+            tensors[neighbor] = einsum('aib,bc->aic', tensors[neighbor], matrix)
+        else:
+            neighbor = 0
+            tensors[neighbor] = einsum('ab,bic->aic', matrix, tensors[neighbor])
+
+        if neighbor > 0:
+            self._apply_block(tensors, neighbor - 1, 2)
+        if neighbor < len(tensors) - 1:
+            self._apply_block(tensors, neighbor, 2)
+
+
+class QuantumManagerHybrid(QuantumManager):
+    """Class to track and manage quantum states as ket vectors or density matrices, chosen per compound state.
+
+    Compound states are stored as `KetState` objects while pure.
+    A compound state is promoted to a `DensityState` when a noise channel is applied to it
+    (with `apply_channel` or `apply_superoperator`), or when a circuit combines it with a promoted state.
+    After each operation on density matrices, the resulting states that are pure again are demoted to kets.
+    Operations are performed by an internal ket or density manager sharing the `states` dictionary.
+    The `formalism` attribute is the ket vector formalism, so components treat this manager as a ket manager;
+    `set` accepts either ket vectors or density matrices.
+
+    Attributes:
+        purity_tol (float): density matrices with 1 - tr(rho^2) below this tolerance are demoted (default 1e-9).
+    """
+
+    def __init__(self, purity_tol: float = 1e-9):
+        super().__init__(KET_STATE_FORMALISM)
+        self.auto_factorize = True
+        self.purity_tol = purity_tol
+        self._ket_manager = QuantumManagerKet()
+        self._density_manager = QuantumManagerDensity()
+        self.set_states(self.states)
+
+    def set_states(self, states: Dict):
+        super().set_states(states)
+        self._ket_manager.states = self.states
+        self._density_manager.states = self.states
+
+    def new(self, state=(complex(1), complex(0))) -> int:
+        key = self._next_key()
+        self.set([key], state)
+        return key
+
+    def set_state_limits(self, max_state_size: int = None, max_total_bytes: int = None) -> None:
+        super().set_state_limits(max_state_size, max_total_bytes)
+        self._ket_manager.set_state_limits(max_state_size, max_total_bytes)
+        self._density_manager.set_state_limits(max_state_size, max_total_bytes)
+
+    def run_circuit(self, circuit: Circuit, keys: List[int], meas_samp=None) -> Dict[int, int]:
+        super().run_circuit(circuit, keys, meas_samp)
+        if all(isinstance(self.states[key], KetState) for key in keys):
+            self._ket_manager.auto_factorize = self.auto_factorize
+            return self._ket_manager.run_circuit(circuit, keys, meas_samp)
+
+        all_keys = self._promote(keys, "run_circuit")
+        self._density_manager.auto_factorize = self.auto_factorize
+        result = self._density_manager.run_circuit(circuit, keys, meas_samp)
+        self._demote(all_keys)
+        return result
+
+    def set(self, keys: List[int], amplitudes: any) -> None:
+        """Method to set the quantum state at the given keys.
+
+        Args:
+            keys (List[int]): list of quantum manager keys to modify.
+            amplitudes (any): ket vector, or density matrix (which is stored as a ket vector if pure).
+        """
+
+        super().set(keys, amplitudes)
+        if array(amplitudes).ndim == 1:
+            self._ket_manager.set(keys, amplitudes)
+        else:
+            self._density_manager.set(keys, amplitudes)
+            self._demote(keys)
+
+    def set_to_zero(self, key: int):
+        self._ket_manager.set_to_zero(key)
+
+    def set_to_one(self, key: int):
+        self._ket_manager.set_to_one(key)
+
+    def apply_channel(self, keys: List[int], kraus_ops: array, meas_samp: float = None) -> None:
+        """Method to apply a noise channel to the subsystems at given keys, i.e. rho -> sum_i K_i rho K_i^dagger.
+
+        Args:
+            keys (List[int]): keys of subsystems the channel acts on.
+            kraus_ops (array): (m, 2 ** k, 2 ** k) array stacking the Kraus operators, with k = len(keys).
+            meas_samp (float): unused; accepted for compatibility with `QuantumManagerTrajectory.apply_channel`.
+        """
+
+        all_keys = self._promote(keys, "apply_channel")
+        self._density_manager.apply_channel(keys, kraus_ops)
+        self._demote(all_keys)
+
+    def apply_superoperator(self, keys: List[int], superop: array) -> None:
+        """Method to apply a noise channel given by its superoperator to the subsystems at given keys.
+
+        Args:
+            keys (List[int]): keys of subsystems the channel acts on.
+            superop (array): (4 ** k, 4 ** k) superoperator, with k = len(keys).
+        """
+
+        all_keys = self._promote(keys, "apply_superoperator")
+        self._density_manager.apply_superoperator(keys, superop)
+        self._demote(all_keys)
+
+    def _promote(self, keys: List[int], operation: str) -> List[int]:
+        """Method to convert the ket states of given keys to density matrices.
+
+        Args:
+            keys (List[int]): keys of states to convert.
+            operation (str): name of the calling operation, reported if the state limits are exceeded.
+
+        Returns:
+            List[int]: all keys of the states of given keys.
+        """
+
+        all_keys = []
+        for key in keys:
+            if key in all_keys:
+                continue
+            state = self.states[key]
+            all_keys += state.keys
+            if isinstance(state, KetState):
+                self._density_manager._check_state_limits(state.keys, operation)
+                self._density_manager._set_trusted(state.keys, state.state)
+        return all_keys
+
+    def _demote(self, keys: List[int]) -> None:
+        """Method to convert the density matrices of given keys that are pure to ket states."""
+
+        visited = set()
+        for key in keys:
+            if key in visited:
+                continue
+            state = self.states[key]
+            visited.update(state.keys)
+            if isinstance(state, DensityState):
+                ket = density_to_ket(state.state, self.purity_tol)
+                if ket is not None:
+                    self._ket_manager._set_trusted(state.keys, ket)
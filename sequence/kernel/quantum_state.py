@@ -6,17 +6,30 @@ These include 2 classes used by a quantum manager, and one used for individual p
 1. The `KetState` class represents the ket vector formalism and is used by a quantum manager.
 2. The `DensityState` class represents the density matrix formalism and is also used by a quantum manager.
 3. The `FreeQuantumState` class uses the ket vector formalism, and is used by individual photons (not the quantum manager).
+4. The `BellDiagonalState` and `BellDiagonalStateView` classes represent Bell diagonal states used by a quantum manager.
+5. The `SparseDensityState` class stores a density matrix in sparse (CSR) format and is used by a quantum manager.
+6. The `MPSState` class represents a matrix product state and is used by a quantum manager.
 """
 
 import math
 from abc import ABC
-from typing import Tuple, Dict, List
-from numpy import pi, cos, sin, arange, log, log2
+from struct import Struct
+from typing import Tuple, Dict, List, Union
+from numpy import pi, cos, sin, arange, log, log2, frombuffer, ascontiguousarray, complex128, float64
 from numpy.random import Generator
+from scipy.sparse import csr_matrix, issparse
 
 from .quantum_utils import *
 from ..constants import EPSILON
 
+# binary serialization: header (magic, version, state type, truncation, number of keys, rows, columns),
+# followed by keys (16 bytes each, to fit uuid keys) and the raw state buffer aligned to 16 bytes
+BINARY_MAGIC = b"SQST"
+BINARY_VERSION = 1
+_BINARY_HEADER = Struct("<4sBBHIII")
+_BINARY_KEY_LEN = 16
+_BINARY_ALIGN = 16
+
 
 def swap_bits(num, pos1, pos2):
     """Swaps bits in num at positions 1 and 2.
@@ -39,6 +52,13 @@ class State(ABC):
         keys (List[int]): list of keys pointing to the state, for use with a quantum manager.
     """
 
+    # type code and element dtype for binary serialization (None if not supported)
+    _binary_type = None
+    _binary_dtype = complex128
+
+    # debug mode: if True, states built by quantum managers with `trusted` are validated as well
+    validate_all = False
+
     def __init__(self, **kwargs):
         # potential key word arguments for derived classes, e.g. truncation = d-1 for qudit
 
@@ -71,6 +91,72 @@ class State(ABC):
         res["state"] = state
         return res
 
+    def serialize_binary(self) -> List[Union[bytes, memoryview]]:
+        """Method to serialize the state into a binary message.
+
+        The message is a header (with keys) followed by the raw state buffer.
+        The state buffer is not copied if the state is already a contiguous array of the serialized dtype.
+
+        Returns:
+            List[Union[bytes, memoryview]]: header and state buffer, to be sent (or joined) in order.
+        """
+
+        if self._binary_type is None:
+            raise NotImplementedError("Binary serialization not supported for {}".format(type(self).__name__))
+
+        payload = ascontiguousarray(self._binary_payload(), dtype=self._binary_dtype)
+        rows = payload.shape[0]
+        cols = payload.shape[1] if payload.ndim == 2 else 0
+        header = _BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, self._binary_type,
+                                     getattr(self, "truncation", 1), len(self.keys), rows, cols)
+        header += b"".join(int(key).to_bytes(_BINARY_KEY_LEN, "little") for key in self.keys)
+        header += bytes(-len(header) % _BINARY_ALIGN)
+        return [header, memoryview(payload).cast("B")]
+
+    @staticmethod
+    def deserialize_binary(data: Union[bytes, bytearray, memoryview]) -> "State":
+        """Function to reconstruct a state from a binary message produced by `serialize_binary`.
+
+        The state array of the returned object is a view into `data` (no copy is made),
+        and is writable only if `data` is (e.g. a `bytearray`).
+
+        Args:
+            data (Union[bytes, bytearray, memoryview]): binary message.
+
+        Returns:
+            State: reconstructed `KetState`, `DensityState` or `BellDiagonalState`.
+        """
+
+        magic, version, state_type, truncation, num_keys, rows, cols = _BINARY_HEADER.unpack_from(data)
+        assert magic == BINARY_MAGIC, "Invalid binary state message"
+        assert version == BINARY_VERSION, "Unsupported binary state version {}".format(version)
+
+        offset = _BINARY_HEADER.size
+        keys = [int.from_bytes(data[offset + i * _BINARY_KEY_LEN:offset + (i + 1) * _BINARY_KEY_LEN], "little")
+                for i in range(num_keys)]
+        offset += num_keys * _BINARY_KEY_LEN
+        offset += -offset % _BINARY_ALIGN
+
+        state_class = _BINARY_STATE_CLASSES[state_type]
+        shape = (rows, cols) if cols > 0 else (rows,)
+        values = frombuffer(data, dtype=state_class._binary_dtype, count=rows * max(cols, 1), offset=offset)
+
+        state = state_class.__new__(state_class)
+        State.__init__(state)
+        state.keys = keys
+        state.state = values.reshape(shape)
+        if state_type != BellDiagonalState._binary_type:
+            state.truncation = truncation
+        return state
+
+    def _binary_payload(self):
+        return self.state
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes used by the state values."""
+        return getattr(self.state, "nbytes", 0)
+
     def __str__(self):
         return "\n".join(["Keys:", str(self.keys), "State:", str(self.state)])
 
@@ -86,6 +172,8 @@ class KetState(State):
                 Default is 1 for qubit. dim = truncation + 1
     """
 
+    _binary_type = 0
+
     def __init__(self, amplitudes: List[complex], keys: List[int], truncation: int = 1):
         """Constructor for ket state class.
 
@@ -116,6 +204,22 @@ class KetState(State):
         self.state = array(amplitudes, dtype=complex)
         self.keys = keys
 
+    @classmethod
+    def trusted(cls, amplitudes: List[complex], keys: List[int], truncation: int = 1) -> "KetState":
+        """Alternate constructor that skips validation of the amplitudes.
+
+        For internal use by quantum managers, on states they computed themselves.
+        Validation is still performed if `State.validate_all` is set.
+        """
+
+        if State.validate_all:
+            return cls(amplitudes, keys, truncation)
+        state = cls.__new__(cls)
+        state.truncation = truncation
+        state.state = array(amplitudes, dtype=complex)
+        state.keys = keys
+        return state
+
 
 class DensityState(State):
     """Class to represent an individual quantum state as a density matrix.
@@ -128,6 +232,8 @@ class DensityState(State):
             Default is 1 for qubit. dim = truncation + 1
     """
 
+    _binary_type = 1
+
     def __init__(self, state: List[List[complex]], keys: List[int], truncation: int = 1):
         """Constructor for density state class.
 
@@ -170,6 +276,138 @@ class DensityState(State):
         self.state = state
         self.keys = keys
 
+    @classmethod
+    def trusted(cls, state: List[List[complex]], keys: List[int], truncation: int = 1) -> "DensityState":
+        """Alternate constructor that skips validation of the density matrix.
+
+        For internal use by quantum managers, on states they computed themselves.
+        Validation is still performed if `State.validate_all` is set.
+        """
+
+        if State.validate_all:
+            return cls(state, keys, truncation)
+        new_state = cls.__new__(cls)
+        new_state.truncation = truncation
+        state = array(state, dtype=complex)
+        if state.ndim == 1:
+            state = outer(state, state.conj())
+        new_state.state = state
+        new_state.keys = keys
+        return new_state
+
+
+class SparseDensityState(DensityState):
+    """Class to represent an individual quantum state as a sparse density matrix.
+
+    Used by the Fock density matrix quantum manager in sparse mode, where states (e.g. two-mode squeezed vacuum)
+    have few non-zero elements compared to the full (d ** n) x (d ** n) matrix.
+
+    Attributes:
+        state (csr_matrix): density matrix values in compressed sparse row format.
+            NxN matrix with N = d ** len(keys), where d is dimension of elementary Hilbert space.
+        keys (List[int]): list of keys (subsystems) associated with this state.
+        truncation (int): maximally allowed number of excited states for elementary subsystems.
+            Default is 1 for qubit. dim = truncation + 1
+    """
+
+    def _binary_payload(self):
+        return self.state.toarray()
+
+    @property
+    def nbytes(self) -> int:
+        return self.state.data.nbytes + self.state.indices.nbytes + self.state.indptr.nbytes
+
+    def __init__(self, state, keys: List[int], truncation: int = 1):
+        """Constructor for sparse density state class.
+
+        Args:
+            state (Union[spmatrix, List[List[complex]]]): density matrix elements given as a sparse or dense matrix.
+                If the input is a one-dimensional list, will be converted to matrix with outer product operation.
+            keys (List[int]): list of keys to this state in quantum manager.
+            truncation (int): maximally allowed number of excited states for elementary subsystems.
+                Default is 1 for qubit. dim = truncation + 1
+        """
+
+        State.__init__(self)
+        self.truncation = truncation
+        dim = self.truncation + 1  # dimension of element Hilbert space
+
+        if issparse(state):
+            state = csr_matrix(state, dtype=complex)
+        else:
+            state = array(state, dtype=complex)
+            if state.ndim == 1:
+                vec = csr_matrix(state.reshape((-1, 1)))
+                state = vec @ vec.conj().T
+            state = csr_matrix(state)
+
+        # check formatting
+        assert abs(state.diagonal().sum() - 1) < 0.01, "density matrix trace must be 1"
+        assert state.shape[0] == state.shape[1], "density matrix must be square"
+
+        num_subsystems = log(state.shape[0]) / log(dim)
+        assert dim ** int(round(num_subsystems)) == state.shape[0], \
+            "Length of amplitudes should be d ** n, " \
+            "where d is subsystem Hilbert space dimension and n is the number of subsystems. " \
+            "Actual amplitude length: {}, dim: {}, num subsystems: {}".format(
+                state.shape[0], dim, num_subsystems
+            )
+        num_subsystems = int(round(num_subsystems))
+        assert num_subsystems == len(keys), \
+            "Length of amplitudes should be d ** n, " \
+            "where d is subsystem Hilbert space dimension and n is the number of subsystems. " \
+            "Amplitude length: {}, expected subsystems: {}, num keys: {}".format(
+                state.shape[0], num_subsystems, len(keys)
+            )
+
+        self.state = state
+        self.keys = keys
+
+
+class MPSState(State):
+    """Class to represent an individual quantum state as a matrix product state (MPS).
+
+    Each key corresponds to one site tensor; neighboring tensors are contracted over a shared bond.
+    The ket vector is only computed when `state` is first read.
+
+    Attributes:
+        tensors (List[np.array]): site tensors of shape (left bond, 2, right bond), in the order of `keys`.
+        keys (List[int]): list of keys (subsystems) associated with this state.
+        state (np.array): ket vector contracted from `tensors` (read-only).
+    """
+
+    _binary_type = KetState._binary_type
+
+    def __init__(self, tensors: List[array], keys: List[int]):
+        """Constructor for matrix product state class.
+
+        Does not validate the tensors; these are produced by the quantum manager.
+
+        Args:
+            tensors (List[np.array]): site tensors of shape (left bond, 2, right bond).
+            keys (List[int]): list of keys to this state in quantum manager.
+        """
+
+        assert len(tensors) == len(keys)
+        self.tensors = tensors
+        self.keys = keys
+        self._ket = None
+
+    @property
+    def state(self):
+        if self._ket is None:
+            self._ket = mps_to_ket(self.tensors)
+        return self._ket
+
+    @property
+    def nbytes(self) -> int:
+        return sum(tensor.nbytes for tensor in self.tensors)
+
+    @property
+    def bond_dims(self) -> List[int]:
+        """List of internal bond dimensions."""
+        return [tensor.shape[2] for tensor in self.tensors[:-1]]
+
 
 class FreeQuantumState(State):
     """Class used by photons to track internal quantum states.
@@ -390,6 +628,9 @@ class BellDiagonalState(State):
         keys (List[int]): list of keys (subsystems) associated with this state. Should be length 2.
     """
 
+    _binary_type = 2
+    _binary_dtype = float64
+
     def __init__(self, diag_elems: List[float], keys: List[int]):
         """Constructor for Bell diagonal state class.
 
@@ -410,3 +651,68 @@ class BellDiagonalState(State):
         # note: density matrix diagonal elements are guaranteed to be real from Hermiticity
         self.state = array(diag_elems, dtype=float)
         self.keys = keys
+
+
+class BellDiagonalStateView(BellDiagonalState):
+    """Class to represent a 2-qubit EPR pair as a row of a Bell diagonal state array owned by a quantum manager.
+
+    The diagonal elements are not stored on the object, but in row `pair_id` of the manager's `bds_array`.
+    Reading `state` first applies any decoherence still pending for the manager, and returns a copy of the row.
+    A view follows its pair through decoherence, but once the manager writes new values with `set`
+    or frees the row, the view is detached and keeps a private copy of its last values
+    (so states previously returned by `get` are not changed by later updates).
+
+    Attributes:
+        state (np.array): diagonal elements of 2-qubit density matrix in Bell bases (length 4).
+        keys (List[int]): list of keys (subsystems) associated with this state. Should be length 2.
+        pair_id (int): row of the manager's `bds_array` holding the state.
+    """
+
+    def __init__(self, manager, pair_id: int, keys: List[int]):
+        """Constructor for Bell diagonal state view class.
+
+        Does not validate the diagonal elements; these are written by the manager.
+
+        Args:
+            manager (QuantumManagerBellDiagonal): quantum manager owning the state array.
+            pair_id (int): row of the manager's `bds_array` holding the state.
+            keys (List[int]): list of keys to this state in quantum manager. Should be length 2.
+        """
+
+        self._manager = manager
+        self._values = None
+        self.pair_id = pair_id
+        self.keys = keys
+
+    @property
+    def state(self):
+        if self._manager is None:
+            return self._values
+        self._manager.flush()
+        return self._manager.bds_array[self.pair_id].copy()
+
+    @state.setter
+    def state(self, value):
+        if self._manager is None:
+            self._values = array(value, dtype=float)
+        else:
+            self._manager.flush()
+            self._manager.bds_array[self.pair_id] = value
+
+    @property
+    def nbytes(self) -> int:
+        # size of one row; does not apply pending decoherence
+        if self._manager is None:
+            return self._values.nbytes
+        return self._manager.bds_array[self.pair_id].nbytes
+
+    def detach(self) -> None:
+        """Method to copy the current values out of the manager array (called when the row is rewritten or freed)."""
+
+        self._values = self.state
+        self._manager = None
+
+
+_BINARY_STATE_CLASSES = {KetState._binary_type: KetState,
+                         DensityState._binary_type: DensityState,
+                         BellDiagonalState._binary_type: BellDiagonalState}
@@ -8,8 +8,14 @@ from functools import lru_cache
 from typing import List, Tuple
 from math import sqrt
 
-from numpy import array, kron, identity, zeros, trace, outer, eye
+from numpy import array, asarray, empty, kron, identity, zeros, trace, outer, eye, moveaxis, einsum, arange, int64, \
+    argmax, vdot
+from numpy.linalg import svd
 from scipy.linalg import sqrtm
+from scipy.sparse import csr_matrix, coo_matrix, identity as sparse_identity, kron as sparse_kron
+from scipy.special import binom
+
+from .quantum_kernels import ket_block_probabilities, density_block_probabilities, partial_trace
 
 
 a = array([[0, 1], [0, 0]])
@@ -145,29 +151,19 @@ def measure_entangled_state_with_cache_ket(state: Tuple[complex], state_index: i
 def measure_multiple_with_cache_ket(state: Tuple[complex], num_states: int, length_diff: int) \
         -> Tuple[List[array], List[float]]:
 
-    state = array(state)
+    state = array(state, dtype=complex)
     basis_count = 2 ** num_states
+    block_size = 2 ** length_diff
 
-    # construct measurement operators, projectors, and probabilities of measurement
-    projectors = [None] * basis_count
-    probabilities = [0] * basis_count
-    for i in range(basis_count):
-        M = zeros((1, basis_count), dtype=complex)  # measurement operator
-        M[0, i] = 1
-        projectors[i] = kron(M, identity(2 ** length_diff))  # projector
-        probabilities[i] = (state.conj().T @ projectors[i].T @ projectors[i] @ state).real
-        if probabilities[i] < 0:
-            probabilities[i] = 0
-        if probabilities[i] > 1:
-            probabilities[i] = 1
+    # probabilities of measurement: outcome i keeps the i-th block of amplitudes (state of unmeasured subsystems)
+    probabilities = ket_block_probabilities(state, basis_count).clip(0, 1).tolist()
 
-    return_states = [None] * len(projectors)
-    for i, proj in enumerate(projectors):
+    return_states = [None] * basis_count
+    for i in range(basis_count):
         # project to new state
         if probabilities[i] > 0:
-            new_state = (proj @ state) / sqrt(probabilities[i])
-            new_state = tuple(new_state)
-            return_states[i] = new_state
+            new_state = state[i * block_size:(i + 1) * block_size] / sqrt(probabilities[i])
+            return_states[i] = tuple(new_state)
 
     return return_states, probabilities
 
@@ -220,29 +216,22 @@ def measure_entangled_state_with_cache_density(state: Tuple[Tuple[complex]], sta
 def measure_multiple_with_cache_density(state: Tuple[Tuple[complex]], num_states: int, length_diff: int) \
         -> Tuple[List[array], List[float]]:
 
-    state = array(state)
+    state = array(state, dtype=complex)
     basis_count = 2 ** num_states
+    block_size = 2 ** length_diff
 
-    # construct measurement operators, projectors, and probabilities of measurement
-    projectors = [None] * basis_count
-    probabilities = [0] * basis_count
-    for i in range(basis_count):
-        M = zeros((basis_count, basis_count), dtype=complex)  # measurement operator
-        M[i, i] = 1
-        projectors[i] = kron(M, identity(2 ** length_diff))  # projector
-        probabilities[i] = trace(state @ projectors[i]).real
-        if probabilities[i] < 0:
-            probabilities[i] = 0
-        if probabilities[i] > 1:
-            probabilities[i] = 1
+    # probabilities of measurement: the projector for outcome i keeps the i-th diagonal block
+    probabilities = density_block_probabilities(state, basis_count).clip(0, 1).tolist()
 
-    return_states = [None] * len(projectors)
-    for i, proj in enumerate(projectors):
+    return_states = [None] * basis_count
+    for i in range(basis_count):
         # project to new state
         if probabilities[i] > 0:
-            new_state = (proj @ state @ proj) / probabilities[i]
-            new_state = tuple(new_state)
-            return_states[i] = new_state
+            block = slice(i * block_size, (i + 1) * block_size)
+            new_state = zeros(state.shape, dtype=complex)
+            new_state[block, block] = state[block, block]
+            new_state /= probabilities[i]
+            return_states[i] = tuple(new_state)
 
     return return_states, probabilities
 
@@ -293,31 +282,10 @@ def measure_entangled_state_with_cache_fock_density(state: Tuple[Tuple[complex]]
             The second lists the probability for each measurement.
     """
 
-    state = array(state)
+    state = array(state, dtype=complex)
     povms = [array(povm) for povm in povms]
 
-    # generate POVM operators on total Hilbert space
-    povm_list = []
-    left_dim = (truncation + 1) ** system_index
-    right_dim = (truncation + 1) ** (num_systems - system_index - 1)
-    for povm in povms:
-        povm_tot = kron(kron(identity(left_dim), povm), identity(right_dim))
-        povm_list.append(povm_tot)
-
-    # list of probabilities of getting different outcomes from POVM
-    prob_list = [trace(state @ povm).real for povm in povm_list]
-    state_list = []
-
-    for i in range(len(prob_list)):
-        if prob_list[i] <= 0:
-            state_post_meas = None
-        else:
-            measure_op = sqrtm(povm_list[i])
-            state_post_meas = (measure_op @ state @ measure_op) / prob_list[i]
-
-        state_list.append(state_post_meas)
-
-    return state_list, prob_list
+    return _measure_fock_density(state, [system_index], num_systems, povms, truncation)
 
 
 @lru_cache(maxsize=1000)
@@ -363,27 +331,36 @@ def measure_multiple_with_cache_fock_density(state: Tuple[Tuple[complex]], indic
     if (fin_meas_sys_idx - init_meas_sys_idx + 1 != num) or (list(indices) != sorted(indices)):
         raise ValueError("Indices should be consecutive; got {}".format(indices))
 
-    povm_list = []
-    left_dim = (truncation + 1) ** init_meas_sys_idx
-    right_dim = (truncation + 1) ** (num_systems - fin_meas_sys_idx - 1)
-    for povm in povms:
-        povm_tot = kron(kron(identity(left_dim), povm), identity(right_dim))
-        povm_list.append(povm_tot)
+    # return post-measurement states and measurement outcome probabilities in the order of fed-in POVM operators
+    return _measure_fock_density(state, list(indices), num_systems, povms, truncation)
+
+
+def _measure_fock_density(state: array, indices: List[int], num_systems: int, povms: List[array], truncation: int) \
+        -> Tuple[List[array], List[float]]:
+
+    """Measures the subsystems at given indices with POVM operators acting on those subsystems only.
+
+    Instead of padding the POVM operators to the total Hilbert space, probabilities are computed from the
+    reduced density matrix of the measured subsystems, and post-measurement states by tensor contraction.
+    """
+
+    dim = truncation + 1
+    traced = [i for i in range(num_systems) if i not in indices]
+    reduced_state = partial_trace(state, traced, num_systems, dim)
 
     # list of probabilities of getting different outcomes from POVM
-    prob_list = [trace(state @ povm).real for povm in povm_list]
+    prob_list = [einsum('ij,ji->', reduced_state, povm).real for povm in povms]
     state_list = []
 
     for i in range(len(prob_list)):
         if prob_list[i] <= 0:
             state_post_meas = None
         else:
-            measure_op = sqrtm(povm_list[i])
-            state_post_meas = (measure_op @ state @ measure_op) / prob_list[i]
+            measure_op = sqrtm(povms[i])
+            state_post_meas = density_apply_unitary(state, measure_op, indices, num_systems, dim) / prob_list[i]
 
         state_list.append(state_post_meas)
 
-    # return post-measurement states and measurement outcome probabilities in the order of fed-in POVM operators
     return state_list, prob_list
 
 
@@ -404,13 +381,728 @@ def density_partial_trace(state: Tuple[Tuple[complex]], indices: Tuple[int], num
         array: output state with reduced number of subsystems `num_systems - len(indices)`.
     """
 
-    temp = array(state)
+    return partial_trace(array(state), indices, num_systems, truncation + 1)
+
+
+def ket_split_subsystem(state: array, index: int, num_systems: int, dim: int = 2, tol: float = 1e-8) \
+        -> Tuple[array, array]:
+
+    """Attempt to factor one subsystem out of a ket vector.
+
+    The subsystem is separable from the rest iff the Schmidt rank of the (subsystem | rest) bipartition is 1.
+
+    Args:
+        state (array): ket vector of `num_systems` subsystems.
+        index (int): index of subsystem to factor out.
+        num_systems (int): number of total subsystems in the state.
+        dim (int): dimension of elementary subsystems (default 2).
+        tol (float): tolerance on the second Schmidt coefficient (default 1e-8).
+
+    Returns:
+        Tuple[array, array]: ket of the subsystem and ket of the remaining subsystems,
+            or None if the subsystem is entangled with the rest.
+    """
+
+    tensor = array(state, dtype=complex).reshape((dim,) * num_systems)
+    matrix = moveaxis(tensor, index, 0).reshape((dim, -1))
+    u, s, vh = svd(matrix, full_matrices=False)
+    if s[1:].sum() > tol:
+        return None
+
+    sub_state = u[:, 0]
+    rest_state = vh[0]
+    # move the global phase onto the remaining state so that e.g. |0> stays [1, 0]
+    pivot = abs(sub_state).argmax()
+    phase = sub_state[pivot] / abs(sub_state[pivot])
+    return sub_state / phase, rest_state * phase
+
+
+def density_split_subsystem(state: array, index: int, num_systems: int, dim: int = 2, tol: float = 1e-8) \
+        -> Tuple[array, array]:
+
+    """Attempt to factor one subsystem out of a density matrix.
+
+    The subsystem is separable from the rest iff the state equals the tensor product of its two reduced states.
+
+    Args:
+        state (array): density matrix of `num_systems` subsystems.
+        index (int): index of subsystem to factor out.
+        num_systems (int): number of total subsystems in the state.
+        dim (int): dimension of elementary subsystems (default 2).
+        tol (float): maximum allowed element-wise deviation from a product state (default 1e-8).
+
+    Returns:
+        Tuple[array, array]: density matrix of the subsystem and density matrix of the remaining subsystems,
+            or None if the subsystem is correlated with the rest.
+    """
+
+    rest_dim = dim ** (num_systems - 1)
+    tensor = array(state, dtype=complex).reshape((dim,) * num_systems * 2)
+    tensor = moveaxis(tensor, (index, num_systems + index), (0, 1))
+    tensor = tensor.reshape((dim, dim, rest_dim, rest_dim))
+    sub_state = einsum('ijkk->ij', tensor)
+    rest_state = einsum('kkij->ij', tensor)
+    product = einsum('ij,kl->ijkl', sub_state, rest_state)
+    if abs(tensor - product).max() > tol:
+        return None
+
+    return sub_state, rest_state
+
+
+def state_kron(state1: array, state2: array) -> array:
+
+    """Kronecker product of two ket vectors or two density matrices.
+
+    Equivalent to `numpy.kron` for arrays of equal dimension, with much less overhead for the small states
+    combined before running circuits.
+
+    Args:
+        state1 (array): first ket vector or density matrix.
+        state2 (array): second ket vector or density matrix.
+
+    Returns:
+        array: state of the combined system.
+    """
+
+    state1 = asarray(state1)
+    state2 = asarray(state2)
+    if state1.ndim == 1:
+        return outer(state1, state2).ravel()
+    rows1, cols1 = state1.shape
+    rows2, cols2 = state2.shape
+    return (state1[:, None, :, None] * state2[None, :, None, :]).reshape((rows1 * rows2, cols1 * cols2))
+
+
+def density_to_ket(state: array, tol: float = 1e-9) -> array:
+
+    """Attempt to convert a density matrix into a ket vector.
+
+    The global phase is chosen such that the amplitude of the most likely basis state is real and positive.
+
+    Args:
+        state (array): density matrix (with unit trace).
+        tol (float): tolerance on the purity 1 - tr(rho^2) (default 1e-9).
+
+    Returns:
+        array: ket vector of the state, or None if the state is mixed.
+    """
+
+    state = asarray(state)
+    # for Hermitian rho, tr(rho^2) is the squared Frobenius norm
+    purity = vdot(state, state).real
+    if 1 - purity > tol:
+        return None
+
+    # for pure rho = |psi><psi|, each column is proportional to |psi>
+    index = argmax(state.diagonal().real)
+    return state[:, index] / sqrt(state[index, index].real)
+
+
+@lru_cache(maxsize=1000)
+def build_loss_kraus_operators(loss_rate: float, truncation: int) -> array:
+
+    """Builds single-subsystem Kraus operators of a generalized amplitude damping channel (photon loss).
+
+    Results are cached by (loss_rate, truncation); the returned array is read-only.
+
+    Args:
+        loss_rate (float): loss rate for the quantum channel.
+        truncation (int): fock space truncation, 1 for qubit system.
+
+    Returns:
+        array: (dim, dim, dim) array stacking the `dim` Kraus operators, with dim = truncation + 1.
+    """
+
+    assert 0 <= loss_rate <= 1
+    dim = truncation + 1
+    kraus_ops = zeros((dim, dim, dim))
+
+    for k in range(dim):
+        for n in range(k, dim):
+            coeff = sqrt(binom(n, k)) * sqrt(((1-loss_rate) ** (n-k)) * (loss_rate ** k))
+            kraus_ops[k, n-k, n] = coeff
+
+    kraus_ops.flags.writeable = False
+    return kraus_ops
+
+
+def density_apply_operator(state: array, operator: array, index: int, num_systems: int, dim: int = 2) -> array:
+
+    """Applies an operator O to consecutive subsystems of a density matrix, i.e. computes O rho O^dagger.
+
+    The operator is contracted with the target subsystem axes only, instead of being padded with identities.
+
+    Args:
+        state (array): density matrix of `num_systems` subsystems.
+        operator (array): operator on `k` consecutive subsystems (shape (dim ** k, dim ** k)).
+        index (int): index of the first subsystem the operator acts on.
+        num_systems (int): number of total subsystems in the state.
+        dim (int): dimension of elementary subsystems (default 2).
+
+    Returns:
+        array: output density matrix.
+    """
+
+    size = dim ** num_systems
+    op_dim = operator.shape[0]
+    left_dim = dim ** index
+    right_dim = size // (left_dim * op_dim)
+
+    # O acts on the row index (l, k, r) through k; conj(O) acts on the column index the same way
+    tensor = operator @ array(state).reshape((left_dim, op_dim, right_dim * size))
+    tensor = operator.conj() @ tensor.reshape((size * left_dim, op_dim, right_dim))
+    return tensor.reshape((size, size))
+
+
+def density_apply_kraus(state: array, kraus_ops: array, index: int, num_systems: int, dim: int = 2) -> array:
+
+    """Applies a channel given by Kraus operators on one subsystem, i.e. computes sum_k K_k rho K_k^dagger.
+
+    Args:
+        state (array): density matrix of `num_systems` subsystems.
+        kraus_ops (array): (m, dim, dim) array stacking the single-subsystem Kraus operators.
+        index (int): index of the subsystem the channel acts on.
+        num_systems (int): number of total subsystems in the state.
+        dim (int): dimension of elementary subsystems (default 2).
+
+    Returns:
+        array: output density matrix.
+    """
+
+    size = dim ** num_systems
+    left_dim = dim ** index
+    right_dim = dim ** (num_systems - index - 1)
+
+    tensor = array(state).reshape((left_dim, dim, right_dim, left_dim, dim, right_dim))
+    tensor = einsum('kij,ajblmn,kpm->aiblpn', kraus_ops, tensor, kraus_ops.conj(), optimize=True)
+    return tensor.reshape((size, size))
+
+
+def sparse_pad_operator(operator: array, left_dim: int, right_dim: int, tol: float = 1e-12) -> csr_matrix:
+
+    """Pads an operator with identities on both sides as a sparse matrix, i.e. kron(I_left, O, I_right).
+
+    Elements of `operator` with magnitude below `tol` (e.g. numerical noise from `sqrtm`) are dropped.
+
+    Args:
+        operator (array): operator to pad.
+        left_dim (int): dimension of identity on the left.
+        right_dim (int): dimension of identity on the right.
+        tol (float): magnitude below which elements are treated as zero (default 1e-12).
+
+    Returns:
+        csr_matrix: padded operator.
+    """
+
+    operator = array(operator, dtype=complex)
+    operator[abs(operator) < tol] = 0
+    padded = sparse_kron(sparse_identity(left_dim, format="csr"), csr_matrix(operator), format="csr")
+    padded = sparse_kron(padded, sparse_identity(right_dim, format="csr"), format="csr")
+    padded.eliminate_zeros()
+    return padded
+
+
+def sparse_measure_fock_density(state: csr_matrix, indices: Tuple[int], num_systems: int, povms: List[array],
+                                truncation: int = 1) -> Tuple[List[csr_matrix], List[float]]:
+
+    """Measure consecutive subsystems of a sparse density matrix with POVM operators.
+
+    Sparse counterpart of `measure_entangled_state_with_cache_fock_density` and
+    `measure_multiple_with_cache_fock_density` (results are not cached).
+    As with the dense functions, elements in `indices` MUST BE consecutive.
+
+    Args:
+        state (csr_matrix): state to measure.
+        indices (Tuple[int]): indices within combined state to measure.
+        num_systems (int): number of total systems in the state.
+        povms (List[array]): list of all POVM operators to use for measurement.
+        truncation (int): fock space truncation, 1 for qubit system (default 1).
+
+    Returns:
+        Tuple[List[csr_matrix], List[float]]: tuple with two sub-lists.
+            The first lists each output state, corresponding with the measurement of each POVM.
+            The second lists the probability for each measurement.
+    """
+
+    init_meas_sys_idx = min(indices)
+    fin_meas_sys_idx = max(indices)
+    if (fin_meas_sys_idx - init_meas_sys_idx + 1 != len(indices)) or (list(indices) != sorted(indices)):
+        raise ValueError("Indices should be consecutive; got {}".format(indices))
+
+    left_dim = (truncation + 1) ** init_meas_sys_idx
+    right_dim = (truncation + 1) ** (num_systems - fin_meas_sys_idx - 1)
+
+    prob_list = []
+    state_list = []
+    for povm in povms:
+        povm_tot = sparse_pad_operator(povm, left_dim, right_dim)
+        # trace(state @ povm) without forming the product
+        prob = povm_tot.multiply(state.T).sum().real
+        if prob <= 0:
+            state_post_meas = None
+        else:
+            measure_op = sparse_pad_operator(sqrtm(povm), left_dim, right_dim)
+            state_post_meas = (measure_op @ state @ measure_op) / prob
+
+        prob_list.append(prob)
+        state_list.append(state_post_meas)
+
+    return state_list, prob_list
+
+
+def sparse_density_partial_trace(state: csr_matrix, indices: Tuple[int], num_systems: int, truncation: int = 1) \
+        -> csr_matrix:
+
+    """Traces out subsystems of a sparse density matrix at given indices.
+
+    Only the stored (non-zero) elements are visited.
+
+    Args:
+        state (csr_matrix): input state.
+        indices (Tuple[int]): indices of subsystems to trace out of state.
+        num_systems (int): number of total subsystems in the state.
+        truncation (int): fock space truncation, 1 for qubit system (default 1).
+
+    Returns:
+        csr_matrix: output state with reduced number of subsystems `num_systems - len(indices)`.
+    """
+
+    dim = truncation + 1
+    state = state.tocoo()
+    kept = [i for i in range(num_systems) if i not in indices]
+    traced = list(indices)
+
+    # subsystem digits of each row and column index (first subsystem is most significant)
+    powers = dim ** arange(num_systems - 1, -1, -1, dtype=int64)
+    row_digits = (state.row.astype(int64)[:, None] // powers) % dim
+    col_digits = (state.col.astype(int64)[:, None] // powers) % dim
+
+    # only elements diagonal in the traced subsystems contribute
+    mask = (row_digits[:, traced] == col_digits[:, traced]).all(axis=1)
+    kept_powers = dim ** arange(len(kept) - 1, -1, -1, dtype=int64)
+    rows = row_digits[mask][:, kept] @ kept_powers
+    cols = col_digits[mask][:, kept] @ kept_powers
+
+    output_dim = dim ** len(kept)
+    # duplicate entries are summed on conversion
+    return coo_matrix((state.data[mask], (rows, cols)), shape=(output_dim, output_dim)).tocsr()
+
+
+def sparse_density_apply_operator(state: csr_matrix, operator: array, index: int, num_systems: int, dim: int = 2) \
+        -> csr_matrix:
+
+    """Applies an operator O to consecutive subsystems of a sparse density matrix, i.e. computes O rho O^dagger.
+
+    Args:
+        state (csr_matrix): density matrix of `num_systems` subsystems.
+        operator (array): operator on `k` consecutive subsystems (shape (dim ** k, dim ** k)).
+        index (int): index of the first subsystem the operator acts on.
+        num_systems (int): number of total subsystems in the state.
+        dim (int): dimension of elementary subsystems (default 2).
+
+    Returns:
+        csr_matrix: output density matrix.
+    """
+
+    op_dim = operator.shape[0]
+    left_dim = dim ** index
+    right_dim = (dim ** num_systems) // (left_dim * op_dim)
+    padded = sparse_pad_operator(operator, left_dim, right_dim)
+    return (padded @ state @ padded.conj().T).tocsr()
+
+
+def sparse_density_apply_kraus(state: csr_matrix, kraus_ops: array, index: int, num_systems: int, dim: int = 2) \
+        -> csr_matrix:
+
+    """Applies a channel given by Kraus operators on one subsystem of a sparse density matrix.
+
+    Args:
+        state (csr_matrix): density matrix of `num_systems` subsystems.
+        kraus_ops (array): (m, dim, dim) array stacking the single-subsystem Kraus operators.
+        index (int): index of the subsystem the channel acts on.
+        num_systems (int): number of total subsystems in the state.
+        dim (int): dimension of elementary subsystems (default 2).
+
+    Returns:
+        csr_matrix: output density matrix.
+    """
+
+    output_state = None
+    for kraus_op in kraus_ops:
+        term = sparse_density_apply_operator(state, kraus_op, index, num_systems, dim)
+        output_state = term if output_state is None else output_state + term
+    return output_state.tocsr()
+
+
+@lru_cache(maxsize=1000)
+def build_pauli_kraus_operators(p_x: float, p_y: float, p_z: float) -> array:
+
+    """Builds Kraus operators of a single-qubit Pauli channel.
+
+    The channel applies X, Y and Z with the given probabilities (and identity otherwise).
+    Results are cached by the probabilities; the returned array is read-only.
+
+    Args:
+        p_x (float): probability of X error.
+        p_y (float): probability of Y error.
+        p_z (float): probability of Z error.
+
+    Returns:
+        array: (4, 2, 2) array stacking the Kraus operators (identity, X, Y, Z).
+    """
+
+    p_id = 1 - p_x - p_y - p_z
+    assert min(p_id, p_x, p_y, p_z) >= 0
+    kraus_ops = array([sqrt(p_id) * eye(2),
+                       sqrt(p_x) * array([[0, 1], [1, 0]]),
+                       sqrt(p_y) * array([[0, -1j], [1j, 0]]),
+                       sqrt(p_z) * array([[1, 0], [0, -1]])], dtype=complex)
+
+    kraus_ops.flags.writeable = False
+    return kraus_ops
+
+
+@lru_cache(maxsize=1000)
+def build_depolarizing_kraus_operators(p: float) -> array:
+
+    """Builds Kraus operators of a single-qubit depolarizing channel, rho -> (1 - p) rho + p I / 2.
+
+    Results are cached by the parameter; the returned array is read-only.
+
+    Args:
+        p (float): probability of replacing the state with the maximally mixed state.
+
+    Returns:
+        array: (4, 2, 2) array stacking the Kraus operators (identity, X, Y, Z).
+    """
+
+    return build_pauli_kraus_operators(p / 4, p / 4, p / 4)
+
+
+@lru_cache(maxsize=1000)
+def build_dephasing_kraus_operators(p: float) -> array:
+
+    """Builds Kraus operators of a single-qubit dephasing channel, rho -> (1 - p) rho + p Z rho Z.
+
+    Results are cached by the parameter; the returned array is read-only.
+
+    Args:
+        p (float): probability of Z error.
+
+    Returns:
+        array: (4, 2, 2) array stacking the Kraus operators (identity, X, Y, Z).
+    """
+
+    return build_pauli_kraus_operators(0, 0, p)
+
+
+@lru_cache(maxsize=1000)
+def build_amplitude_damping_kraus_operators(gamma: float) -> array:
+
+    """Builds Kraus operators of a single-qubit amplitude damping channel.
+
+    Results are cached by the parameter; the returned array is read-only.
+
+    Args:
+        gamma (float): probability of decay from |1> to |0>.
+
+    Returns:
+        array: (2, 2, 2) array stacking the Kraus operators.
+    """
+
+    assert 0 <= gamma <= 1
+    kraus_ops = array([[[1, 0], [0, sqrt(1 - gamma)]],
+                       [[0, sqrt(gamma)], [0, 0]]], dtype=complex)
+
+    kraus_ops.flags.writeable = False
+    return kraus_ops
+
+
+CHANNEL_KRAUS_BUILDERS = {"depolarizing": build_depolarizing_kraus_operators,
+                          "dephasing": build_dephasing_kraus_operators,
+                          "amplitude_damping": build_amplitude_damping_kraus_operators,
+                          "pauli": build_pauli_kraus_operators}
+
+
+def kraus_to_superoperator(kraus_ops: array) -> array:
+
+    """Converts Kraus operators to the superoperator of their channel.
+
+    The superoperator acts on the row-major vectorization of density matrices, i.e. S = sum_i K_i (x) K_i^*.
+
+    Args:
+        kraus_ops (array): (m, d, d) array stacking the Kraus operators.
+
+    Returns:
+        array: (d ** 2, d ** 2) superoperator.
+    """
+
+    kraus_ops = asarray(kraus_ops)
+    dim = kraus_ops.shape[1]
+    return einsum('mik,mjl->ijkl', kraus_ops, kraus_ops.conj()).reshape((dim ** 2, dim ** 2))
+
+
+@lru_cache(maxsize=1000)
+def build_channel_superoperator(channel: str, *params: float) -> array:
 
-    for i, idx in enumerate(indices):
-        offset = num_systems - i
-        temp = temp.reshape((truncation+1,) * offset * 2)
-        temp = trace(temp, axis1=(idx-i), axis2=(offset+idx-i))
+    """Builds the superoperator of a noise channel from the library in `CHANNEL_KRAUS_BUILDERS`.
+
+    Results are cached by the channel name and parameters; the returned array is read-only.
+
+    Args:
+        channel (str): name of channel ("depolarizing", "dephasing", "amplitude_damping" or "pauli").
+        *params (float): parameters of the channel, as accepted by its Kraus operator builder.
+
+    Returns:
+        array: (4, 4) superoperator of the single-qubit channel.
+    """
+
+    superop = kraus_to_superoperator(CHANNEL_KRAUS_BUILDERS[channel](*params))
+
+    superop.flags.writeable = False
+    return superop
+
+
+def ket_apply_operator(state: array, operator: array, indices: List[int], num_systems: int, dim: int = 2,
+                       out: array = None) -> array:
+
+    """Applies an operator to the subsystems at given indices of a ket vector.
+
+    The indices need not be consecutive; the operator acts on them in the order listed.
+    The operator is contracted with the state tensor directly, without padding or reordering subsystems.
+
+    Args:
+        state (array): ket vector of `num_systems` subsystems.
+        operator (array): operator on `len(indices)` subsystems.
+        indices (List[int]): indices of the subsystems the operator acts on.
+        num_systems (int): number of total subsystems in the state.
+        dim (int): dimension of elementary subsystems (default 2).
+        out (array): complex array of the same size as `state` to write the result to, must not overlap `state`
+            (default None, a new array is allocated).
+
+    Returns:
+        array: output (unnormalized) ket vector.
+    """
+
+    num = len(indices)
+    tensor = asarray(state).reshape((dim,) * num_systems)
+    op_tensor = asarray(operator).reshape((dim,) * (2 * num))
+    new_axes = [num_systems + i for i in range(num)]
+    out_axes = list(range(num_systems))
+    for i, index in enumerate(indices):
+        out_axes[index] = new_axes[i]
+
+    if out is None:
+        out = empty(dim ** num_systems, dtype=complex)
+    einsum(op_tensor, new_axes + list(indices), tensor, list(range(num_systems)), out_axes,
+           out=out.reshape((dim,) * num_systems))
+    return out
+
+
+def density_apply_unitary(state: array, operator: array, indices: List[int], num_systems: int, dim: int = 2,
+                          out: array = None, buffer: array = None) -> array:
+
+    """Applies an operator U to the subsystems at given indices of a density matrix, i.e. rho -> U rho U^dagger.
+
+    The indices need not be consecutive; the operator acts on them in the order listed.
+
+    Args:
+        state (array): density matrix of `num_systems` subsystems.
+        operator (array): operator on `len(indices)` subsystems.
+        indices (List[int]): indices of the subsystems the operator acts on.
+        num_systems (int): number of total subsystems in the state.
+        dim (int): dimension of elementary subsystems (default 2).
+        out (array): complex array of the same shape as `state` to write the result to, must not overlap `state`
+            (default None, a new array is allocated).
+        buffer (array): complex array of the same shape as `state` for intermediate results, must not overlap
+            `state` or `out` (default None, a new array is allocated).
+
+    Returns:
+        array: output density matrix.
+    """
+
+    num = len(indices)
+    size = dim ** num_systems
+    shape = (dim,) * (2 * num_systems)
+    op_tensor = asarray(operator).reshape((dim,) * (2 * num))
+    new_axes = [2 * num_systems + i for i in range(num)]
+    all_axes = list(range(2 * num_systems))
+    row_axes = list(all_axes)
+    for i, index in enumerate(indices):
+        row_axes[index] = new_axes[i]
+    col_indices = [num_systems + index for index in indices]
+    col_axes = list(all_axes)
+    for i, index in enumerate(col_indices):
+        col_axes[index] = new_axes[i]
+
+    if out is None:
+        out = empty((size, size), dtype=complex)
+    if buffer is None:
+        buffer = empty((size, size), dtype=complex)
+    # apply U to row subsystems, then U^* to column subsystems
+    einsum(op_tensor, new_axes + list(indices), asarray(state).reshape(shape), all_axes, row_axes,
+           out=buffer.reshape(shape))
+    einsum(op_tensor.conj(), new_axes + col_indices, buffer.reshape(shape), all_axes, col_axes,
+           out=out.reshape(shape))
+    return out
+
+
+def density_apply_superoperator(state: array, superop: array, indices: List[int], num_systems: int, dim: int = 2,
+                                out: array = None) -> array:
+
+    """Applies a channel given by its superoperator to the subsystems at given indices of a density matrix.
+
+    The indices need not be consecutive; the channel acts on them in the order listed.
+    The superoperator is contracted with the density matrix tensor directly, without padding.
+
+    Args:
+        state (array): density matrix of `num_systems` subsystems.
+        superop (array): (dim ** (2k), dim ** (2k)) superoperator (see `kraus_to_superoperator`), with k = len(indices).
+        indices (List[int]): indices of the subsystems the channel acts on.
+        num_systems (int): number of total subsystems in the state.
+        dim (int): dimension of elementary subsystems (default 2).
+        out (array): complex array of the same shape as `state` to write the result to, must not overlap `state`
+            (default None, a new array is allocated).
+
+    Returns:
+        array: output density matrix.
+    """
+
+    num = len(indices)
+    size = dim ** num_systems
+    shape = (dim,) * (2 * num_systems)
+    superop_tensor = asarray(superop).reshape((dim,) * (4 * num))
+    in_axes = list(indices) + [num_systems + index for index in indices]
+    new_axes = [2 * num_systems + i for i in range(2 * num)]
+    out_axes = list(range(2 * num_systems))
+    for i, index in enumerate(in_axes):
+        out_axes[index] = new_axes[i]
+
+    if out is None:
+        out = empty((size, size), dtype=complex)
+    einsum(superop_tensor, new_axes + in_axes, asarray(state).reshape(shape), list(range(2 * num_systems)), out_axes,
+           out=out.reshape(shape))
+    return out
+
+
+def density_apply_channel(state: array, kraus_ops: array, indices: List[int], num_systems: int, dim: int = 2) \
+        -> array:
+
+    """Applies a channel given by Kraus operators to the subsystems at given indices of a density matrix.
+
+    The indices need not be consecutive; the operators act on them in the order listed.
+
+    Args:
+        state (array): density matrix of `num_systems` subsystems.
+        kraus_ops (array): (m, dim ** k, dim ** k) array stacking the Kraus operators, with k = len(indices).
+        indices (List[int]): indices of the subsystems the channel acts on.
+        num_systems (int): number of total subsystems in the state.
+        dim (int): dimension of elementary subsystems (default 2).
+
+    Returns:
+        array: output density matrix.
+    """
+
+    num = len(indices)
+    axes = list(indices) + [num_systems + i for i in indices]
+    tensor = moveaxis(array(state).reshape((dim,) * (2 * num_systems)), axes, range(2 * num))
+    rest_shape = tensor.shape[2 * num:]
+    tensor = tensor.reshape((dim ** num, dim ** num, -1))
+    tensor = einsum('kij,jlx,kml->imx', kraus_ops, tensor, array(kraus_ops).conj(), optimize=True)
+    tensor = moveaxis(tensor.reshape((dim,) * (2 * num) + rest_shape), range(2 * num), axes)
+    size = dim ** num_systems
+    return tensor.reshape((size, size))
+
+
+def mps_to_ket(tensors: List[array]) -> array:
+
+    """Contracts a matrix product state into a ket vector.
+
+    Args:
+        tensors (List[array]): site tensors of shape (left bond, d, right bond); outer bonds must have dimension 1.
+
+    Returns:
+        array: ket vector (first site is the most significant).
+    """
+
+    return mps_contract_block(tensors).reshape(-1)
+
+
+def mps_contract_block(tensors: List[array]) -> array:
+
+    """Contracts consecutive sites of a matrix product state into a single block tensor.
+
+    Args:
+        tensors (List[array]): site tensors of shape (left bond, d, right bond).
+
+    Returns:
+        array: block tensor of shape (left bond, d ** len(tensors), right bond).
+    """
+
+    left_dim = tensors[0].shape[0]
+    block = tensors[0].reshape((-1, tensors[0].shape[2]))
+    for tensor in tensors[1:]:
+        block = (block @ tensor.reshape((tensor.shape[0], -1))).reshape((-1, tensor.shape[2]))
+    return block.reshape((left_dim, -1, tensors[-1].shape[2]))
+
+
+def mps_split_block(block: array, num_sites: int, dim: int = 2, max_bond_dim: int = None, cutoff: float = 1e-10) \
+        -> Tuple[List[array], float]:
+
+    """Splits a block tensor into consecutive matrix product state sites with successive SVDs.
+
+    Singular values below `cutoff` times the largest are discarded, and at most `max_bond_dim` are kept per bond.
+    The output block is rescaled to keep the norm of the input.
+
+    Args:
+        block (array): block tensor of shape (left bond, d ** num_sites, right bond).
+        num_sites (int): number of sites to split the block into.
+        dim (int): dimension of elementary subsystems (default 2).
+        max_bond_dim (int): maximum bond dimension to keep (default None for no limit).
+        cutoff (float): relative magnitude below which singular values are discarded (default 1e-10).
+
+    Returns:
+        Tuple[List[array], float]: list of site tensors, and the fraction of weight discarded by truncation.
+    """
+
+    left_dim, _, right_dim = block.shape
+    tensors = []
+    discarded = 0
+    rest = block
+    for _ in range(num_sites - 1):
+        u, s, vh = svd(rest.reshape((left_dim * dim, -1)), full_matrices=False)
+        weight = (s ** 2).sum()
+        keep = max(1, int((s > cutoff * s[0]).sum()))
+        if max_bond_dim is not None:
+            keep = min(keep, max_bond_dim)
+        if keep < len(s):
+            kept_weight = (s[:keep] ** 2).sum()
+            discarded += 1 - kept_weight / weight
+            s = s[:keep] * sqrt(weight / kept_weight)
+        tensors.append(u[:, :keep].reshape((left_dim, dim, keep)))
+        rest = s[:keep, None] * vh[:keep]
+        left_dim = keep
+
+    tensors.append(rest.reshape((left_dim, dim, right_dim)))
+    return tensors, discarded
+
+
+def mps_norm_squared(tensors: List[array], index: int = None, outcome: int = None) -> float:
+
+    """Computes the squared norm of a matrix product state, optionally projected at one site.
+
+    Args:
+        tensors (List[array]): site tensors of shape (left bond, d, right bond).
+        index (int): index of the site to project (default None for no projection).
+        outcome (int): basis state to project the site at `index` onto.
+
+    Returns:
+        float: squared norm <psi|P|psi>.
+    """
 
-    output_dim = (truncation + 1) ** (num_systems - len(indices))
-    output_state = temp.reshape((output_dim, output_dim))
-    return output_state
+    env = array([[1]])
+    for i, tensor in enumerate(tensors):
+        if i == index:
+            tensor = tensor[:, outcome:outcome + 1, :]
+        env = einsum('ab,aic,bid->cd', env, tensor.conj(), tensor, optimize=True)
+    return env.sum().real
@@ -23,10 +23,16 @@ from .quantum_manager import (QuantumManagerKet,
                               QuantumManagerDensity,
                               QuantumManagerDensityFock,
                               QuantumManagerBellDiagonal,
+                              QuantumManagerTrajectory,
+                              QuantumManagerMPS,
+                              QuantumManagerHybrid,
                               KET_STATE_FORMALISM,
                               DENSITY_MATRIX_FORMALISM,
                               FOCK_DENSITY_MATRIX_FORMALISM,
-                              BELL_DIAGONAL_STATE_FORMALISM)
+                              BELL_DIAGONAL_STATE_FORMALISM,
+                              KET_TRAJECTORY_FORMALISM,
+                              MPS_FORMALISM,
+                              HYBRID_FORMALISM)
 from ..constants import *
 
 
@@ -89,6 +95,12 @@ class Timeline:
             self.quantum_manager = QuantumManagerDensityFock(truncation=truncation)
         elif formalism == BELL_DIAGONAL_STATE_FORMALISM:
             self.quantum_manager = QuantumManagerBellDiagonal()
+        elif formalism == KET_TRAJECTORY_FORMALISM:
+            self.quantum_manager = QuantumManagerTrajectory()
+        elif formalism == MPS_FORMALISM:
+            self.quantum_manager = QuantumManagerMPS()
+        elif formalism == HYBRID_FORMALISM:
+            self.quantum_manager = QuantumManagerHybrid()
         else:
             raise ValueError(f"Invalid formalism {formalism}")
 
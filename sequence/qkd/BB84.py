@@ -355,13 +355,13 @@ class BB84(StackProtocol):
                 basis_list_alice = msg.bases
 
                 # compare own basis with basis message and create list of matching indices
-                indices = []
-                basis_list = self.basis_lists.pop(0)
-                bits = self.bit_lists.pop(0)
-                for i, b in enumerate(basis_list_alice):
-                    if bits[i] != -1 and basis_list[i] == b:
-                        indices.append(i)
-                        self.key_bits.append(bits[i])
+                basis_list_alice = numpy.asarray(basis_list_alice)
+                num_pulses = len(basis_list_alice)
+                basis_list = numpy.asarray(self.basis_lists.pop(0))[:num_pulses]
+                bits = numpy.asarray(self.bit_lists.pop(0))[:num_pulses]
+                matching = numpy.flatnonzero((bits != -1) & (basis_list == basis_list_alice))
+                indices = matching.tolist()
+                self.key_bits.extend(bits[matching].tolist())
 
                 # send to Alice list of matching indices
                 message = BB84Message(BB84MsgType.MATCHING_INDICES, self.another.name, indices=indices)
@@ -375,8 +375,7 @@ class BB84(StackProtocol):
                 bits = self.bit_lists.pop(0)
 
                 # set key equal to bits at received indices
-                for i in indices:
-                    self.key_bits.append(bits[i])
+                self.key_bits.extend(numpy.asarray(bits)[indices].tolist())
 
                 # check if key long enough. If it is, truncate if necessary and call cascade
                 if len(self.key_bits) >= self.key_lengths[0]:
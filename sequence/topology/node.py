@@ -568,11 +568,13 @@ class QKDNode(Node):
                 component.update_detector_params(detector_id, arg_name, value)
                 return
 
-    def get_bits(self, light_time: int, start_time: int, frequency: float, detector_name: str):
+    def get_bits(self, light_time: int, start_time: int, frequency: float, detector_name: str) -> np.ndarray:
         """Method for QKD protocols to get received qubits from the node.
 
         Uses the detection times from attached detectors to calculate which bits were received.
         Returns 0/1 for successfully transmitted bits and -1 for lost/ambiguous bits.
+        A bit is ambiguous if detections in its period come from more than one outcome
+        (e.g. both polarization detectors, or detectors for different time bin bases).
 
         Args:
             light_time (int): time duration for which qubits were transmitted.
@@ -581,74 +583,66 @@ class QKDNode(Node):
             detector_name (str): name of the QSDetector measuring qubits.
 
         Returns:
-            List[int]: list of calculated bits.
+            np.ndarray: int8 array of calculated bits.
         """
 
         qsdetector = self.components[detector_name]
 
         # compute received bits based on encoding scheme
         encoding = self.encoding["name"]
-        bits = [-1] * int(round(light_time * frequency))  # -1 used for invalid bits
+        num_bits = int(round(light_time * frequency))
 
         if encoding == "polarization":
-            detection_times = qsdetector.get_photon_times()
-
-            # determine indices from detection times and record bits
-            for time in detection_times[0]:  # detection times for |0> detector
-                index = round((time - start_time) * frequency * 1e-12)
-                if 0 <= index < len(bits):
-                    bits[index] = 0
-
-            for time in detection_times[1]:  # detection times for |1> detector
-                index = round((time - start_time) * frequency * 1e-12)
-                if 0 <= index < len(bits):
-                    if bits[index] == 0:
-                        bits[index] = -1
-                    else:
-                        bits[index] = 1
+            detection_times = qsdetector.get_photon_time_arrays()
+            # outcomes: detections of |0> detector and |1> detector
+            outcome_indices = [self._bit_indices(times, start_time, frequency, num_bits)[0]
+                               for times in detection_times[:2]]
+            outcome_bits = [0, 1]
 
         elif encoding == "time_bin":
-            detection_times = qsdetector.get_photon_times()
+            detection_times = qsdetector.get_photon_time_arrays()
             bin_separation = self.encoding["bin_separation"]
-        
+
             # single detector (for early, late basis) times
-            for time in detection_times[0]:
-                index = int(round((time - start_time) * frequency * 1e-12))
-                if 0 <= index < len(bits):
-                    if abs(((index * 1e12 / frequency) + start_time) - time) < bin_separation / 2:
-                        bits[index] = 0
-                    elif abs(((index * 1e12 / frequency) + start_time) - (time - bin_separation)) < bin_separation / 2:
-                        bits[index] = 1
-        
-            # interferometer detector 0 times
-            for time in detection_times[1]:
-                time -= bin_separation
-                index = int(round((time - start_time) * frequency * 1e-12))
-                # check if index is in range and is in correct time bin
-                if 0 <= index < len(bits) and \
-                        abs(((index * 1e12 / frequency) + start_time) - time) < bin_separation / 2:
-                    if bits[index] == -1:
-                        bits[index] = 0
-                    else:
-                        bits[index] = -1
-
-            # interferometer detector 1 times
-            for time in detection_times[2]:
-                time -= bin_separation
-                index = int(round((time - start_time) * frequency * 1e-12))
-                # check if index is in range and is in correct time bin
-                if 0 <= index < len(bits) and \
-                        abs(((index * 1e12 / frequency) + start_time) - time) < bin_separation / 2:
-                    if bits[index] == -1:
-                        bits[index] = 1
-                    else:
-                        bits[index] = -1
+            indices, offsets = self._bit_indices(detection_times[0], start_time, frequency, num_bits)
+            early = abs(offsets) < bin_separation / 2
+            late = ~early & (abs(offsets + bin_separation) < bin_separation / 2)
+            outcome_indices = [indices[early], indices[late]]
+
+            # interferometer detector 0 and 1 times
+            for times in detection_times[1:3]:
+                indices, offsets = self._bit_indices(times - bin_separation, start_time, frequency, num_bits)
+                outcome_indices.append(indices[abs(offsets) < bin_separation / 2])
+            outcome_bits = [0, 1, 0, 1]
 
         else:
             raise Exception("QKD node {} has illegal encoding type {}".format(self.name, encoding))
 
+        # keep bits with detections from a single outcome
+        num_outcomes = np.zeros(num_bits, dtype=np.int8)
+        bits = np.zeros(num_bits, dtype=np.int8)
+        for indices, bit in zip(outcome_indices, outcome_bits):
+            detected = np.bincount(indices, minlength=num_bits) > 0
+            num_outcomes += detected
+            bits[detected] = bit
+        bits[num_outcomes != 1] = -1
         return bits
 
+    @staticmethod
+    def _bit_indices(times: np.ndarray, start_time: int, frequency: float, num_bits: int):
+        """Method to get the index of the nearest qubit period of detection times.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: indices of detections within the `num_bits` periods,
+                and offset of these periods' start times from the detection times (in ps).
+        """
+
+        indices = np.rint((times - start_time) * frequency * 1e-12).astype(np.int64)
+        in_range = (indices >= 0) & (indices < num_bits)
+        indices = indices[in_range]
+        offsets = indices * 1e12 / frequency + start_time - times[in_range]
+        return indices, offsets
+
     def set_bases(self, basis_list: List[int], start_time: int, frequency: float, component_name: str):
         """Method to set basis list for measurement component.
 
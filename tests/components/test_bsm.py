@@ -252,6 +252,44 @@ def test_single_atom_get():
     assert tl.quantum_manager.get(mem_1.qstate_key) is tl.quantum_manager.get(mem_2.qstate_key)
 
 
+def test_single_atom_measure_pair():
+    from sequence.kernel.quantum_manager import QuantumManagerKet, QuantumManagerDensity
+    from sequence.components.bsm import _measure_pair
+
+    meas_circ = Circuit(1)
+    meas_circ.measure(0)
+    rng = np.random.default_rng(0)
+
+    for qm_cls in [QuantumManagerKet, QuantumManagerDensity]:
+        for entangled in [False, True]:
+            for _ in range(20):
+                qm = qm_cls()
+                keys = [qm.new(), qm.new()]
+                if entangled:
+                    ket = rng.normal(size=4) + 1j * rng.normal(size=4)
+                    ket /= np.linalg.norm(ket)
+                    # store keys in reverse order to check index handling
+                    state = ket if qm_cls is QuantumManagerKet else np.outer(ket, ket.conj())
+                    qm.set(keys[::-1], state)
+                else:
+                    for key in keys:
+                        ket = rng.normal(size=2) + 1j * rng.normal(size=2)
+                        ket /= np.linalg.norm(ket)
+                        state = ket if qm_cls is QuantumManagerKet else np.outer(ket, ket.conj())
+                        qm.set([key], state)
+
+                samples = rng.random(2)
+                result = _measure_pair(keys, [qm.get(key) for key in keys], samples)
+                expected = tuple(qm.run_circuit(meas_circ, [key], sample)[key] for key, sample in zip(keys, samples))
+                assert result == expected
+
+    # keys entangled with other qubits are not handled
+    qm = QuantumManagerKet()
+    keys = [qm.new() for _ in range(3)]
+    qm.set(keys, np.ones(8) / np.sqrt(8))
+    assert _measure_pair(keys[:2], [qm.get(key) for key in keys[:2]], [0.5, 0.5]) is None
+
+
 def test_absorptive_get():
     from sequence.components.detector import Detector
 
@@ -342,3 +342,84 @@ def test_FockDetector():
 
     ratio = fock_detector.photon_counter / fock_detector.photon_counter2
     assert efficiency - 0.05 < ratio < efficiency + 0.05
+
+
+def test_Detector_lazy_dark_count():
+    time = 1e14
+    dark_count = 100
+    detector, parent, tl = create_detector(dark_count=dark_count)
+    detector.lazy_dark_counts = True
+
+    tl.init()
+    assert len(tl.events) == 0
+    tl.stop_time = time
+    tl.run()
+    assert len(parent.log) == 0
+
+    # dark counts are recorded when the detector is next used
+    tl.time = time
+    detector.flush_dark_counts()
+    ratio = len(parent.log) / (dark_count * time * 1e-12)
+    assert abs(ratio - 1) < 0.1
+    dark_times = [log[1] for log in parent.log]
+    assert dark_times == sorted(dark_times) and dark_times[-1] <= time
+
+    # photon detections are recorded after earlier dark counts
+    num_dark = len(parent.log)
+    detector.efficiency = 1
+    tl.time = 2 * time
+    detector.get()
+    assert len(parent.log) > num_dark + 1
+    assert abs(parent.log[-1][1] - 2 * time) <= detector.time_resolution
+    assert all(log[1] <= parent.log[-1][1] for log in parent.log[:-1])
+
+    # QSDetector records pending dark counts before returning detection times
+    tl = Timeline()
+    qsdetector = QSDetectorPolarization("qsd", tl)
+    for i in range(2):
+        qsdetector.update_detector_params(i, "dark_count", dark_count)
+        qsdetector.update_detector_params(i, "lazy_dark_counts", True)
+    tl.init()
+    tl.time = time
+    times = qsdetector.get_photon_times()
+    for detector_times in times:
+        assert abs(len(detector_times) / (dark_count * time * 1e-12) - 1) < 0.1
+    assert qsdetector.get_photon_times() == [[], []]
+
+    # dark counts of other detectors of the QSDetector are recorded before a photon detection
+    tl = Timeline()
+    qsdetector = QSDetectorPolarization("qsd", tl)
+    qsdetector.update_detector_params(0, "dark_count", dark_count)
+    qsdetector.update_detector_params(0, "lazy_dark_counts", True)
+    tl.init()
+    _, parent, _ = create_detector()
+    parent.timeline = tl
+    for detector in qsdetector.detectors:
+        detector.attach(parent)
+    tl.time = time
+    qsdetector.detectors[1].record_detection()
+    observed = [(log[1], qsdetector.detectors.index(log[2])) for log in parent.log]
+    assert observed[-1][1] == 1 and abs(observed[-1][0] - time) <= qsdetector.detectors[1].time_resolution
+    assert len(observed) > 1 and all(index == 0 for _, index in observed[:-1])
+    assert [t for t, _ in observed] == sorted(t for t, _ in observed)
+
+
+def test_QSDetector_photon_time_arrays():
+    buffer = TimeBuffer()
+    times = list(range(0, 1000, 7))
+    for t in times:
+        buffer.append(t)
+    assert len(buffer) == len(times) and buffer[-1] == times[-1] and list(buffer) == times
+    taken = buffer.take()
+    assert taken.dtype == np.int64 and taken.tolist() == times
+    assert len(buffer) == 0
+    buffer.append(1)
+    assert taken.tolist() == times  # taken array is not reused
+
+    tl = Timeline()
+    qsdetector = QSDetectorPolarization("qsd", tl)
+    for i, t in [(0, 10), (1, 20), (1, 40)]:
+        qsdetector.trigger(qsdetector.detectors[i], {'time': t})
+    arrays = qsdetector.get_photon_time_arrays()
+    assert [a.tolist() for a in arrays] == [[10], [20, 40]]
+    assert [len(a) for a in qsdetector.get_photon_time_arrays()] == [0, 0]
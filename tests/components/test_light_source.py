@@ -39,3 +39,61 @@ def test_light_source():
         index = int(qubit.name)
         assert state_list[index] == qubit.quantum_state.state
         assert time == index * (1e12 / FREQ)
+
+
+def test_light_source_phase_error():
+    tl = Timeline()
+    FREQ, MEAN = 1e8, 0.5
+    ls = LightSource("ls", tl, frequency=FREQ, mean_photon_num=MEAN, phase_error=1)
+    receiver = Receiver(tl)
+    ls.add_receiver(receiver)
+
+    state_list = [polarization["bases"][1][0]] * 100
+
+    tl.init()
+    ls.emit(state_list)
+    tl.run()
+
+    assert len(receiver.log) == ls.photon_counter
+    times = [time for time, _ in receiver.log]
+    assert times == sorted(times)
+    plus = polarization["bases"][1][0]
+    for time, qubit in receiver.log:
+        assert qubit.quantum_state.state == (plus[0], -plus[1])
+
+
+def test_light_source_loss_skipping():
+    from numpy import mean
+    from numpy.random import default_rng
+    from sequence.components.light_source import sample_survivors
+    from sequence.components.optical_channel import QuantumChannel
+
+    rng = default_rng(0)
+    for transmissivity in [0.9, 0.01]:
+        counts = [len(sample_survivors(10000, transmissivity, rng)) for _ in range(100)]
+        assert abs(mean(counts) / 10000 - transmissivity) < 0.1 * transmissivity
+    indices = sample_survivors(10000, 0.5, rng)
+    assert all(indices[1:] > indices[:-1]) and 0 <= indices[0] and indices[-1] < 10000
+    assert len(sample_survivors(100, 1, rng)) == 100
+    assert len(sample_survivors(100, 0, rng)) == 0
+
+    tl = Timeline()
+    FREQ, MEAN = 1e8, 0.5
+    ls = LightSource("ls", tl, frequency=FREQ, mean_photon_num=MEAN)
+    qc = QuantumChannel("qc", tl, attenuation=0.0002, distance=5e4)
+    qc.set_loss_skipping(ls)
+    assert qc.skip_lost_photons and ls.loss_channel is qc
+    receiver = Receiver(tl)
+    ls.add_receiver(receiver)
+
+    STATE_LEN = 100000
+    state_list = [polarization["bases"][0][0]] * STATE_LEN
+    tl.init()
+    ls.emit(state_list)
+    tl.run()
+
+    transmissivity = 1 - qc.loss
+    assert abs(ls.photon_counter / STATE_LEN - MEAN) < 0.05
+    assert abs(len(receiver.log) / ls.photon_counter - transmissivity) < 0.1 * transmissivity
+    for time, qubit in receiver.log:
+        assert time == int(qubit.name) * (1e12 / FREQ)
@@ -87,7 +87,210 @@ def test_MemoryArray_expire():
     assert node.is_expired is True and node.expired_memory == expired_memo
 
 
-def test_Memory_update_state():
+def test_MemoryArray_columns():
+    tl = Timeline()
+    ma = MemoryArray("ma", tl, num_memories=4, fidelity=0.9, frequency=1e6)
+
+    # memories are views of the columns
+    assert np.array_equal(ma.get_memory_params("raw_fidelity"), [0.9] * 4)
+    ma[1].fidelity = 0.5
+    assert ma.columns["fidelity"][1] == 0.5
+
+    ma.update_memory_params("efficiency", [0.1, 0.2, 0.3, 0.4])
+    assert [m.efficiency for m in ma.memories] == [0.1, 0.2, 0.3, 0.4]
+    ma.update_memory_params("frequency", 2e6)
+    assert all(m.frequency == 2e6 for m in ma.memories)
+    ma.update_memory_params("cutoff_ratio", 0.5)
+    assert all(m.cutoff_ratio == 0.5 for m in ma.memories)
+
+    # expiration times are tracked
+    ma.update_memory_params("coherence_time", 1)
+    assert np.all(ma.get_memory_params("expire_time") == -1)
+    ma[2].update_state([complex(1), complex(0)])
+    assert ma[2].get_expire_time() == 0.5e12
+    assert ma.columns["expire_time"][2] == 0.5e12
+    ma[2].reset()
+    assert ma[2].get_expire_time() == np.inf
+
+    # memories added to the array store attributes in the columns
+    memory = Memory("mem", tl, fidelity=0.8, frequency=0, efficiency=1, coherence_time=-1, wavelength=500)
+    ma[3] = memory
+    assert ma.columns["raw_fidelity"][3] == 0.8
+    assert ma[3].qstate_key == memory.qstate_key
+
+
+def test_MemoryArray_expiration_manager():
+    class FakeOwner:
+        def __init__(self):
+            self.expired = []
+
+        def memory_expire(self, memory):
+            self.expired.append((memory.timeline.now(), memory.name))
+
+    tl = Timeline()
+    ma = MemoryArray("ma", tl, num_memories=5, coherence_time=1)
+    ma.owner = FakeOwner()
+
+    for i, memory in enumerate(ma.memories):
+        tl.time = (5 - i) * 1e9
+        memory.update_state([complex(1), complex(0)])
+        memory.update_state([complex(1), complex(0)])  # reschedule
+    # a single event is scheduled for the earliest expiration
+    valid_events = [event for event in tl.events if not event.is_invalid()]
+    assert len(valid_events) == 1
+    assert valid_events[0].time == 1e12 + 1e9
+
+    ma[4].reset()
+    ma[3].update_expire_time(2e12)
+    ma[1].update_expire_time(1.5e12)
+    assert ma.get_memory_params("expire_time").tolist() == [1.005e12, 1.5e12, 1.003e12, 2e12, -1]
+
+    tl.time = 5e9
+    tl.run()
+    assert ma.owner.expired == [(1.003e12, "ma[2]"), (1.005e12, "ma[0]"), (1.5e12, "ma[1]"), (2e12, "ma[3]")]
+    assert len(ma.expiration_manager.heap) == 0
+    assert all(memory.get_expire_time() == np.inf for memory in ma.memories)
+
+    # expiration times beyond the exact range of floats
+    late_time = 2 ** 60 + 1
+    ma[0].update_expire_time(late_time)
+    assert ma[0].get_expire_time() == late_time
+    tl.stop_time = 2 ** 62
+    tl.run()
+    assert ma.owner.expired[-1] == (late_time, "ma[0]")
+
+
+def test_Memory_bds_decohere():
+    from sequence.kernel.quantum_manager import BELL_DIAGONAL_STATE_FORMALISM
+    from sequence.components.memory import _p_id, _p_xerr, _p_yerr, _p_zerr
+
+    tl = Timeline(formalism=BELL_DIAGONAL_STATE_FORMALISM)
+    ma = MemoryArray("ma", tl, num_memories=4, coherence_time=1, decoherence_errors=[1/3, 1/3, 1/3])
+    for i in [0, 2]:
+        tl.quantum_manager.set_to_noiseless([ma[i].qstate_key, ma[i + 1].qstate_key])
+    for memory in ma.memories:
+        memory.last_update_time = 1
+
+    tl.time = 1 + 1e12  # one second of idling
+    ma.bds_decohere([0, 2])
+    x_rate = y_rate = z_rate = 1 / 3
+    expected = [_p_id(x_rate, y_rate, z_rate, 1), _p_zerr(x_rate, y_rate, z_rate, 1),
+                _p_xerr(x_rate, y_rate, z_rate, 1), _p_yerr(x_rate, y_rate, z_rate, 1)]
+    for i in range(4):
+        assert np.allclose(tl.quantum_manager.get(ma[i].qstate_key).state, expected)
+    assert ma[0].last_update_time == tl.now()
+    assert ma[1].last_update_time == 1
+
+    # transforms built for all memories at once match those of individual memories
+    ma2 = MemoryArray("ma2", tl, num_memories=4, coherence_time=1, decoherence_errors=[0.5, 0.2, 0.3])
+    for i in [0, 2]:
+        tl.quantum_manager.set_to_noiseless([ma2[i].qstate_key, ma2[i + 1].qstate_key])
+    for i, memory in enumerate(ma2.memories):
+        memory.last_update_time = 1 + i * 1e11
+    tl.time = 1 + 1e12
+    ma2.bds_decohere([0, 1, 3])
+    array_states = [tl.quantum_manager.get(memory.qstate_key).state.copy() for memory in ma2.memories]
+    for i in [0, 2]:
+        tl.quantum_manager.set_to_noiseless([ma2[i].qstate_key, ma2[i + 1].qstate_key])
+    for i, memory in enumerate(ma2.memories):
+        memory.last_update_time = 1 + i * 1e11
+    for i in [0, 1, 3]:
+        ma2[i].bds_decohere()
+    for memory, state in zip(ma2.memories, array_states):
+        assert np.allclose(tl.quantum_manager.get(memory.qstate_key).state, state)
+    assert [memory.last_update_time for memory in ma2.memories] == [tl.now(), tl.now(), 1 + 2e11, tl.now()]
+
+
+def test_Memory_decohere_density():
+    from sequence.kernel.quantum_manager import DENSITY_MATRIX_FORMALISM
+    from sequence.components.memory import _p_zerr
+    from sequence.components.circuit import Circuit
+
+    tl = Timeline(formalism=DENSITY_MATRIX_FORMALISM)
+    mem = Memory("mem", tl, fidelity=1, frequency=0, efficiency=1, coherence_time=1, wavelength=500,
+                 decoherence_errors=[0, 0, 1], lazy_decoherence=True)
+    idle_mem = Memory("idle_mem", tl, fidelity=1, frequency=0, efficiency=1, coherence_time=1, wavelength=500,
+                      decoherence_errors=[0, 0, 1], lazy_decoherence=True)
+    mem.update_state([math.sqrt(1/2), math.sqrt(1/2)])
+    idle_mem.update_state([math.sqrt(1/2), math.sqrt(1/2)])
+    assert mem.last_update_time == 0
+
+    # channel is only applied when the state is next used
+    tl.time = 1e12  # one second of idling
+    assert np.allclose(tl.quantum_manager.states[mem.qstate_key].state, 0.5)
+    p_z = _p_zerr(0, 0, 1, 1)
+    expected = np.array([[0.5, 0.5 * (1 - 2 * p_z)], [0.5 * (1 - 2 * p_z), 0.5]])
+    assert np.allclose(tl.quantum_manager.get(mem.qstate_key).state, expected)
+    assert mem.last_update_time == tl.now()
+    assert np.allclose(tl.quantum_manager.get(mem.qstate_key).state, expected)
+    assert np.allclose(tl.quantum_manager.states[idle_mem.qstate_key].state, 0.5)
+
+    # accumulated channel over two intervals equals channel over total time
+    tl.time = 3e12
+    tl.quantum_manager.run_circuit(Circuit(1), [idle_mem.qstate_key])
+    p_z = _p_zerr(0, 0, 1, 3)
+    tl.time = 2e12
+    tl.quantum_manager.run_circuit(Circuit(1), [mem.qstate_key])
+    tl.time = 3e12
+    assert np.allclose(tl.quantum_manager.get(mem.qstate_key).state, tl.quantum_manager.get(idle_mem.qstate_key).state)
+    assert np.isclose(tl.quantum_manager.get(mem.qstate_key).state[0, 1], 0.5 * (1 - 2 * p_z))
+
+
+def test_Memory_decohere_density_reset():
+    from sequence.kernel.quantum_manager import DENSITY_MATRIX_FORMALISM
+
+    tl = Timeline(formalism=DENSITY_MATRIX_FORMALISM)
+    mem = Memory("mem", tl, fidelity=1, frequency=0, efficiency=1, coherence_time=1, wavelength=500,
+                 decoherence_errors=[1, 0, 0], lazy_decoherence=True)
+    mem.update_state([complex(1), complex(0)])
+
+    # reset memory keeps the reset marker and does not decohere
+    tl.time = 1e12
+    mem.reset()
+    assert mem.last_update_time == -1
+    tl.time = 3e12
+    assert np.allclose(tl.quantum_manager.get(mem.qstate_key).state, [[1, 0], [0, 0]])
+    assert mem.last_update_time == -1
+
+    # decoherence is opt-in
+    mem = Memory("mem2", tl, fidelity=1, frequency=0, efficiency=1, coherence_time=1, wavelength=500,
+                 decoherence_errors=[1, 0, 0])
+    mem.update_state([complex(1), complex(0)])
+    tl.time = 5e12
+    assert np.allclose(tl.quantum_manager.get(mem.qstate_key).state, [[1, 0], [0, 0]])
+
+
+def test_Memory_decohere_trajectory():
+    from sequence.kernel.quantum_manager import KET_TRAJECTORY_FORMALISM
+    from sequence.components.memory import _p_zerr
+    from sequence.components.circuit import Circuit
+
+    NUM_TESTS = 2000
+    tl = Timeline(formalism=KET_TRAJECTORY_FORMALISM)
+    own = Owner()
+    memories = []
+    for i in range(NUM_TESTS):
+        mem = Memory("mem%d" % i, tl, fidelity=1, frequency=0, efficiency=1, coherence_time=1, wavelength=500,
+                     decoherence_errors=[0, 0, 1], lazy_decoherence=True)
+        mem.owner = own
+        mem.update_state([math.sqrt(1/2), math.sqrt(1/2)])
+        memories.append(mem)
+
+    # channel is sampled when the state is next used; states stay pure
+    tl.time = 1e12
+    mem = memories[0]
+    assert np.allclose(tl.quantum_manager.states[mem.qstate_key].state, math.sqrt(1/2))
+    state = tl.quantum_manager.get(mem.qstate_key).state
+    assert mem.last_update_time == tl.now()
+    assert np.isclose(abs(state[0]), math.sqrt(1/2)) and np.isclose(abs(state[1]), math.sqrt(1/2))
+
+    # flip rate averaged over trajectories matches the density matrix formalism
+    h_circuit = Circuit(1)
+    h_circuit.h(0)
+    h_circuit.measure(0)
+    flips = sum(tl.quantum_manager.run_circuit(h_circuit, [mem.qstate_key], own.get_generator().random())
+                [mem.qstate_key] for mem in memories)
+    assert abs(flips / NUM_TESTS - _p_zerr(0, 0, 1, 1)) < 0.03
     new_state = [complex(0), complex(1)]
     
     tl = Timeline()
@@ -132,3 +132,53 @@ def test_QuantumChannel_schedule_transmit():
     tl.time = 2
     time = qc.schedule_transmit(0)
     assert time == 3
+
+
+def test_QuantumChannel_schedule_transmit_many():
+    tl = Timeline()
+    qc = QuantumChannel("qc", tl, attenuation=0, distance=1e3, frequency=1e12)
+
+    # consecutive requests fill consecutive bins
+    times = [qc.schedule_transmit(0) for _ in range(100)]
+    assert times == list(range(100))
+    assert qc.schedule_transmit(50) == 100
+    assert qc.schedule_transmit(200) == 200
+    assert qc.schedule_transmit(150) == 150
+    assert qc.schedule_transmit(150) == 151
+
+    # bins older than the current time are discarded
+    tl.time = 150
+    assert qc.schedule_transmit(0) == 152
+    assert min(qc.send_bins) == 150
+    assert len(qc.send_bins) == len(qc._bin_next) == 4
+
+
+def test_QuantumChannel_transmit_loss_skipping():
+    from sequence.components.photon import Photon
+    from sequence.components.light_source import LightSource
+
+    class FakeNode(Node):
+        def __init__(self, name, tl):
+            Node.__init__(self, name, tl)
+            self.log = []
+
+        def receive_qubit(self, src, photon):
+            self.log.append((src, self.timeline.now(), photon.name))
+
+    tl = Timeline()
+    qc = QuantumChannel("qc", tl, attenuation=0.0002, distance=1e5)
+    sender = FakeNode("sender", tl)
+    receiver = FakeNode("receiver", tl)
+    qc.set_ends(sender, receiver.name)
+    ls = LightSource("ls", tl)
+    qc.set_loss_skipping(ls)
+    tl.init()
+
+    # loss is sampled by the light source; all photons given to the channel are received
+    for i in range(100):
+        photon = Photon(str(i), tl)
+        qc.transmit(photon, sender)
+        tl.time = tl.time + 1
+
+    tl.run()
+    assert len(receiver.log) == 100
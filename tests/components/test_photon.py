@@ -90,3 +90,32 @@ def test_add_loss():
 
     photon.add_loss(0.5)
     assert photon.loss == 0.75
+
+
+def test_release():
+    from sequence.utils.encoding import absorptive
+
+    tl = Timeline()
+    qm = tl.quantum_manager
+    photon = Photon("", tl, encoding_type=absorptive, use_qm=True)
+    assert not hasattr(photon, "__dict__")
+    key = photon.quantum_state
+    assert photon.owns_state
+
+    # dropping the photon does not release the key
+    del photon
+    assert key in qm.states
+    assert qm.get_leak_report() == [key]
+
+    photon = Photon("", tl, encoding_type=absorptive, use_qm=True)
+    key = photon.quantum_state
+    photon.release()
+    assert key not in qm.states
+    photon.release()  # repeated calls have no effect
+    assert not photon.owns_state
+
+    # keys passed to the constructor are owned by the caller
+    key = qm.new()
+    photon = Photon("", tl, encoding_type=absorptive, quantum_state=key, use_qm=True)
+    photon.release()
+    assert key in qm.states
@@ -146,7 +146,7 @@ def test_generation_expire():
     tl.init()
     tl.run()
 
-    assert e0.memory_array[0].expiration_event.time > 1e12
+    assert e0.memory_array[0].get_expire_time() > 1e12
 
 
 def test_generation_run():
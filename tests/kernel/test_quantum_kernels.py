@@ -0,0 +1,171 @@
+import numpy as np
+import pytest
+from scipy.linalg import sqrtm
+
+from sequence.kernel import quantum_kernels
+from sequence.kernel.quantum_kernels import *
+from sequence.kernel.quantum_utils import measure_multiple_with_cache_ket, measure_multiple_with_cache_density, \
+    measure_entangled_state_with_cache_fock_density, measure_multiple_with_cache_fock_density, density_partial_trace
+
+SEED = 0
+
+
+# reference implementations (padded projectors on the total Hilbert space)
+def reference_measure_multiple_ket(state, num_states, length_diff):
+    probabilities, states = [], []
+    for i in range(2 ** num_states):
+        M = np.zeros((1, 2 ** num_states))
+        M[0, i] = 1
+        proj = np.kron(M, np.identity(2 ** length_diff))
+        prob = np.clip((state.conj() @ proj.T @ proj @ state).real, 0, 1)
+        probabilities.append(prob)
+        states.append(proj @ state / np.sqrt(prob) if prob > 0 else None)
+    return states, probabilities
+
+
+def reference_measure_multiple_density(state, num_states, length_diff):
+    probabilities, states = [], []
+    for i in range(2 ** num_states):
+        M = np.zeros((2 ** num_states, 2 ** num_states))
+        M[i, i] = 1
+        proj = np.kron(M, np.identity(2 ** length_diff))
+        prob = np.clip(np.trace(state @ proj).real, 0, 1)
+        probabilities.append(prob)
+        states.append(proj @ state @ proj / prob if prob > 0 else None)
+    return states, probabilities
+
+
+def reference_measure_fock(state, first_index, num_measured, num_systems, povms, dim):
+    probabilities, states = [], []
+    left_dim = dim ** first_index
+    right_dim = dim ** (num_systems - first_index - num_measured)
+    for povm in povms:
+        povm_tot = np.kron(np.kron(np.identity(left_dim), povm), np.identity(right_dim))
+        prob = np.trace(state @ povm_tot).real
+        probabilities.append(prob)
+        measure_op = sqrtm(povm_tot)
+        states.append(measure_op @ state @ measure_op / prob if prob > 0 else None)
+    return states, probabilities
+
+
+def reference_partial_trace(state, indices, num_systems, dim):
+    temp = np.array(state)
+    for i, idx in enumerate(indices):
+        offset = num_systems - i
+        temp = temp.reshape((dim,) * offset * 2)
+        temp = np.trace(temp, axis1=(idx - i), axis2=(offset + idx - i))
+    output_dim = dim ** (num_systems - len(indices))
+    return temp.reshape((output_dim, output_dim))
+
+
+def random_density(rng, size, rank=3):
+    vectors = rng.normal(size=(size, rank)) + 1j * rng.normal(size=(size, rank))
+    state = vectors @ vectors.conj().T
+    return state / np.trace(state)
+
+
+def test_backend():
+    try:
+        import numba
+        assert quantum_kernels.BACKEND == "numba"
+    except ImportError:
+        assert quantum_kernels.BACKEND == "numpy"
+
+
+@pytest.mark.parametrize("backend", ["numpy", "numba"])
+def test_kernels(backend):
+    # each backend is checked against the reference and the NumPy kernels, regardless of the selected backend
+    if backend == "numba":
+        pytest.importorskip("numba")
+    ket_block_probabilities_kernel = getattr(quantum_kernels, "_ket_block_probabilities_" + backend)
+    density_block_probabilities_kernel = getattr(quantum_kernels, "_density_block_probabilities_" + backend)
+    partial_trace_kernel = getattr(quantum_kernels, "_partial_trace_" + backend)
+
+    rng = np.random.default_rng(SEED)
+    ket = rng.normal(size=16) + 1j * rng.normal(size=16)
+    density = random_density(rng, 27)
+
+    expected = [(np.abs(block) ** 2).sum() for block in ket.reshape((4, 4))]
+    result = ket_block_probabilities_kernel(ket, 4)
+    assert np.allclose(result, expected)
+    assert np.allclose(result, quantum_kernels._ket_block_probabilities_numpy(ket, 4))
+    expected = [np.trace(density[i * 9:(i + 1) * 9, i * 9:(i + 1) * 9]).real for i in range(3)]
+    result = density_block_probabilities_kernel(density, 3)
+    assert np.allclose(result, expected)
+    assert np.allclose(result, quantum_kernels._density_block_probabilities_numpy(density, 3))
+    for indices in [[0], [1, 2], [0, 2], []]:
+        traced = np.array([int(i in indices) for i in range(3)])
+        result = partial_trace_kernel(density, traced, 3)
+        assert np.allclose(result, reference_partial_trace(density, indices, 3, 3))
+        assert np.allclose(result, quantum_kernels._partial_trace_numpy(density, traced, 3))
+
+
+def test_measure_multiple():
+    rng = np.random.default_rng(SEED)
+    for num_states, length_diff in [(1, 0), (1, 2), (2, 1), (3, 0)]:
+        size = 2 ** (num_states + length_diff)
+        ket = rng.normal(size=size) + 1j * rng.normal(size=size)
+        ket /= np.linalg.norm(ket)
+        ket[:size // 2 ** num_states] = 0  # outcome with zero probability
+
+        states, probabilities = measure_multiple_with_cache_ket(tuple(ket), num_states, length_diff)
+        ref_states, ref_probabilities = reference_measure_multiple_ket(ket, num_states, length_diff)
+        assert np.allclose(probabilities, ref_probabilities)
+        assert ket_block_probabilities(ket, 2 ** num_states) == pytest.approx(ref_probabilities)
+        for state, ref_state in zip(states, ref_states):
+            assert (state is None) == (ref_state is None)
+            if state is not None:
+                assert np.allclose(state, ref_state)
+
+        density = np.outer(ket, ket.conj())
+        states, probabilities = measure_multiple_with_cache_density(tuple(map(tuple, density)),
+                                                                    num_states, length_diff)
+        ref_states, ref_probabilities = reference_measure_multiple_density(density, num_states, length_diff)
+        assert np.allclose(probabilities, ref_probabilities)
+        assert density_block_probabilities(density, 2 ** num_states) == pytest.approx(ref_probabilities)
+        for state, ref_state in zip(states, ref_states):
+            assert (state is None) == (ref_state is None)
+            if state is not None:
+                assert np.allclose(state, ref_state)
+
+
+def test_partial_trace():
+    rng = np.random.default_rng(SEED)
+    for dim, num_systems in [(2, 4), (3, 3)]:
+        state = random_density(rng, dim ** num_systems)
+        for indices in [[0], [num_systems - 1], [0, 2], list(range(num_systems - 1))]:
+            expected = reference_partial_trace(state, indices, num_systems, dim)
+            assert np.allclose(partial_trace(state, indices, num_systems, dim), expected)
+            assert np.allclose(density_partial_trace(tuple(map(tuple, state)), tuple(indices), num_systems, dim - 1),
+                               expected)
+
+
+def test_measure_fock():
+    rng = np.random.default_rng(SEED)
+    truncation = 2
+    dim = truncation + 1
+    num_systems = 3
+    state = random_density(rng, dim ** num_systems)
+
+    # single-mode photon number resolving POVMs
+    povms = [np.diag(np.eye(dim)[n]) for n in range(dim)]
+    for index in range(num_systems):
+        states, probabilities = measure_entangled_state_with_cache_fock_density(
+            tuple(map(tuple, state)), index, num_systems, tuple(tuple(map(tuple, p)) for p in povms), truncation)
+        ref_states, ref_probabilities = reference_measure_fock(state, index, 1, num_systems, povms, dim)
+        assert np.allclose(probabilities, ref_probabilities)
+        for new_state, ref_state in zip(states, ref_states):
+            assert np.allclose(new_state, ref_state)
+
+    # two-mode POVMs, including a non-diagonal (non-projective) operator
+    unitary = np.linalg.qr(rng.normal(size=(dim ** 2, dim ** 2)) + 1j * rng.normal(size=(dim ** 2, dim ** 2)))[0]
+    weights = rng.random(dim ** 2)
+    povms = [unitary @ np.diag(weights) @ unitary.conj().T, unitary @ np.diag(1 - weights) @ unitary.conj().T]
+    for indices in [(0, 1), (1, 2)]:
+        states, probabilities = measure_multiple_with_cache_fock_density(
+            tuple(map(tuple, state)), indices, num_systems, tuple(tuple(map(tuple, p)) for p in povms), truncation)
+        ref_states, ref_probabilities = reference_measure_fock(state, indices[0], 2, num_systems, povms, dim)
+        assert np.allclose(probabilities, ref_probabilities)
+        assert np.isclose(sum(probabilities), 1)
+        for new_state, ref_state in zip(states, ref_states):
+            assert np.allclose(new_state, ref_state)
@@ -1,5 +1,5 @@
 import numpy as np
-from scipy.linalg import fractional_matrix_power
+from scipy.linalg import fractional_matrix_power, expm
 import math
 
 from sequence.kernel.quantum_manager import *
@@ -59,6 +59,63 @@ def test_qmanager_remove():
     assert len(qm.states.keys()) == 0
 
 
+def test_qmanager_release():
+    qm = QuantumManagerKet()
+
+    # single key is freed and recycled immediately
+    key = qm.new()
+    qm.release(key)
+    assert key not in qm.states
+    assert qm.new() == key
+
+    # shared state is only freed once all keys are released
+    key1 = qm.new()
+    key2 = qm.new()
+    qm.set([key1, key2], [0.5 ** 0.5, 0, 0, 0.5 ** 0.5])
+    qm.release(key1)
+    assert key1 in qm.states and key2 in qm.states
+    qm.release(key2)
+    assert key1 not in qm.states and key2 not in qm.states
+    assert {qm.new(), qm.new()} == {key1, key2}
+
+    # released key split from its partners is freed by collection
+    key3 = qm.new()
+    key4 = qm.new()
+    qm.set([key3, key4], [0.5 ** 0.5, 0, 0, 0.5 ** 0.5])
+    qm.release(key3)
+    qm.set([key4], [1, 0])
+    assert key3 in qm.states
+    qm.collect()
+    assert key3 not in qm.states
+    assert key4 in qm.states
+
+    # disabled recycling
+    qm.recycle_keys = False
+    key5 = qm.new()
+    qm.release(key5)
+    assert qm.new() != key5
+
+
+def test_qmanager_leak_report():
+    class Owner:
+        pass
+
+    qm = QuantumManagerKet()
+    owner1 = Owner()
+    owner2 = Owner()
+    key1 = qm.new()
+    key2 = qm.new()
+    qm.set_owner(key1, owner1)
+    qm.set_owner(key2, owner2)
+    assert qm.get_leak_report() == []
+
+    del owner1
+    assert qm.get_leak_report() == [key1]
+
+    qm.release(key1)
+    assert qm.get_leak_report() == []
+
+
 def test_qmanager_circuit():
     qm = QuantumManagerKet()
 
@@ -197,6 +254,34 @@ def test_qmanager_circuit_density():
     assert np.array_equal(density1.state, density2.state)
 
 
+def test_qmanager_circuit_in_place():
+    NUM_QUBITS = 4
+    rng = np.random.default_rng(0)
+    unitary = np.linalg.qr(rng.normal(size=(4, 4)) + 1j * rng.normal(size=(4, 4)))[0]
+    circuit = DumbCircuit(2, unitary)
+
+    for qm in [QuantumManagerKet(), QuantumManagerDensity()]:
+        keys = [qm.new() for _ in range(NUM_QUBITS)]
+        amplitudes = rng.normal(size=2 ** NUM_QUBITS) + 1j * rng.normal(size=2 ** NUM_QUBITS)
+        qm.set(keys, amplitudes / np.linalg.norm(amplitudes))
+        state = qm.get(keys[0])
+        array = state.state
+
+        for circ_keys in [[keys[0], keys[1]], [keys[3], keys[1]], [keys[1], keys[2]]]:
+            ref_state, ref_keys, circ_mat = qm._prepare_circuit(circuit, circ_keys)
+            if qm.formalism == KET_STATE_FORMALISM:
+                ref_state = circ_mat @ ref_state
+            else:
+                ref_state = circ_mat @ ref_state @ circ_mat.conj().T
+
+            qm.run_circuit(circuit, circ_keys)
+            # state object and array are updated in place
+            assert all(qm.get(key) is state for key in keys)
+            assert state.state is array
+            assert state.keys == ref_keys
+            assert np.allclose(state.state, ref_state)
+
+
 def test_qmanager__measure():
     NUM_TESTS = 1000
 
@@ -553,3 +638,553 @@ def test_qmanager_measure_fock():
             raise Exception()
 
     assert abs((len(meas_0) / NUM_TESTS) - 0.5) < 0.1
+
+
+def test_qmanager_factorize_ket():
+    qm = QuantumManagerKet()
+
+    # GHZ-like state on (key1, key2) with key3 in |+>; measuring key1 leaves key2, key3 separable
+    key1 = qm.new()
+    key2 = qm.new()
+    key3 = qm.new()
+    bell = np.array([0.5 ** 0.5, 0, 0, 0.5 ** 0.5])
+    plus = np.array([0.5 ** 0.5, 0.5 ** 0.5])
+    qm.set([key1, key2, key3], np.kron(bell, plus))
+    circuit = Circuit(3)
+    circuit.measure(0)
+    res = qm.run_circuit(circuit, [key1, key2, key3], 0.25)
+
+    assert res[key1] == 0
+    assert qm.get(key2) is not qm.get(key3)
+    assert qm.get(key2).keys == [key2]
+    assert np.allclose(qm.get(key2).state, [1, 0])
+    assert qm.get(key3).keys == [key3]
+    assert np.allclose(np.abs(qm.get(key3).state), plus)
+    assert qm.split_counter == 1
+
+    # entangled remainder stays compound
+    key4 = qm.new()
+    key5 = qm.new()
+    key6 = qm.new()
+    qm.set([key4, key5, key6], np.kron(plus, bell))
+    circuit = Circuit(3)
+    circuit.measure(0)
+    qm.run_circuit(circuit, [key4, key5, key6], 0.25)
+    assert qm.get(key5) is qm.get(key6)
+    assert qm.split_counter == 1
+
+    # disabled factorization
+    qm.auto_factorize = False
+    qm.set([key1, key2, key3], np.kron(bell, plus))
+    circuit = Circuit(3)
+    circuit.measure(0)
+    qm.run_circuit(circuit, [key1, key2, key3], 0.25)
+    assert qm.get(key2) is qm.get(key3)
+
+
+def test_qmanager_factorize_density():
+    qm = QuantumManagerDensity()
+
+    key1 = qm.new()
+    key2 = qm.new()
+    key3 = qm.new()
+    bell = np.array([0.5 ** 0.5, 0, 0, 0.5 ** 0.5])
+    rho_bell = np.outer(bell, bell)
+    mixed = np.array([[0.5, 0], [0, 0.5]])
+    qm.set([key1, key2, key3], np.kron(rho_bell, mixed))
+    circuit = Circuit(3)
+    circuit.measure(0)
+    res = qm.run_circuit(circuit, [key1, key2, key3], 0.75)
+
+    assert res[key1] == 1
+    for key in [key1, key2, key3]:
+        assert qm.get(key).keys == [key]
+    assert np.allclose(qm.get(key1).state, [[0, 0], [0, 1]])
+    assert np.allclose(qm.get(key2).state, [[0, 0], [0, 1]])
+    assert np.allclose(qm.get(key3).state, mixed)
+    assert qm.split_counter == 2
+    assert qm.get_average_state_size() == 1
+
+    # measured key in the middle of the state; the entangled remainder stays compound
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(4, 2)) + 1j * rng.normal(size=(4, 2))
+    rest = vectors @ vectors.conj().T
+    rest /= np.trace(rest)
+    qm.set([key1, key2, key3], np.kron(rest, mixed).reshape((2, 2, 2, 2, 2, 2))
+           .transpose((0, 2, 1, 3, 5, 4)).reshape((8, 8)))
+    res = qm.run_circuit(circuit, [key2, key1, key3], 0.75)
+    assert qm.get(key2).keys == [key2]
+    assert np.allclose(qm.get(key2).state, [[0, 0], [0, 1]] if res[key2] else [[1, 0], [0, 0]])
+    assert qm.get(key1) is qm.get(key3)
+    assert qm.get(key1).keys == [key1, key3]
+    assert np.allclose(qm.get(key1).state, rest)
+
+    # all keys measured
+    circuit = Circuit(2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.measure(0)
+    circuit.measure(1)
+    qm.set([key1, key3], [1, 0, 0, 0])
+    split_counter = qm.split_counter
+    res = qm.run_circuit(circuit, [key1, key3], 0.75)
+    assert res[key1] == res[key3] == 1
+    for key in [key1, key3]:
+        assert qm.get(key).keys == [key]
+        assert np.allclose(qm.get(key).state, [[0, 0], [0, 1]])
+    assert qm.split_counter == split_counter + 1
+
+
+def test_qmanager_bell_diagonal():
+    qm = QuantumManagerBellDiagonal()
+    keys = [qm.new() for _ in range(40)]
+    pairs = list(zip(keys[::2], keys[1::2]))
+    for pair in pairs:
+        qm.set(list(pair), [0.9, 0.05, 0.03, 0.02])
+    state = qm.get(keys[0])
+    assert qm.get(keys[1]) is state
+    assert np.allclose(state.state, [0.9, 0.05, 0.03, 0.02])
+    assert len(qm.bds_array) >= len(pairs)
+
+    # lazy, vectorized decoherence
+    transform = np.full((4, 4), 0.25)
+    for key in keys[::2]:
+        qm.decohere(key, transform)
+    assert len(qm._pending) == len(pairs)
+    assert np.allclose(qm.get(keys[2]).state, [0.25] * 4)
+    assert len(qm._pending) == 0
+
+    # same pair decohered twice by one transform
+    transform = np.array([[0.9, 0.1, 0, 0], [0.1, 0.9, 0, 0], [0, 0, 0.9, 0.1], [0, 0, 0.1, 0.9]])
+    qm.set_to_noiseless(list(pairs[0]))
+    qm.decohere(pairs[0][0], transform)
+    qm.decohere(pairs[0][1], transform)
+    assert np.allclose(qm.get(pairs[0][0]).state, transform @ transform @ [1, 0, 0, 0])
+
+    # different transforms stacked in one flush
+    transform2 = np.array([[0.8, 0, 0.2, 0], [0, 0.8, 0, 0.2], [0.2, 0, 0.8, 0], [0, 0.2, 0, 0.8]])
+    qm.set_to_noiseless(list(pairs[2]))
+    qm.set_to_noiseless(list(pairs[3]))
+    qm.decohere_many([pairs[2][0], pairs[3][0], pairs[2][1]], np.stack([transform, transform2, transform2]))
+    assert len(qm._pending) == 3
+    assert np.allclose(qm.get(pairs[2][0]).state, transform2 @ transform @ [1, 0, 0, 0])
+    assert np.allclose(qm.get(pairs[3][1]).state, transform2 @ [1, 0, 0, 0])
+
+    # breaking a pair frees its row and detaches old views
+    old_state = qm.get(pairs[1][0])
+    old_values = old_state.state.copy()
+    qm.set([pairs[1][0]], [1, 0])
+    assert pairs[1][0] not in qm.states and pairs[1][1] in qm.states
+    qm.set([pairs[1][1]], [1, 0])
+    assert pairs[1][1] not in qm.states
+    qm.set([pairs[1][0], pairs[1][1]], [1, 0, 0, 0])
+    assert qm.get(pairs[1][0]).pair_id == old_state.pair_id
+    assert np.array_equal(old_state.state, old_values)
+
+
+def test_qmanager_bell_diagonal_snapshot():
+    qm = QuantumManagerBellDiagonal()
+    keys = [qm.new() for _ in range(4)]
+    qm.set(keys[0:2], [0.9, 0.05, 0.03, 0.02])
+    old_state = qm.get(keys[0])
+    old_values = old_state.state
+
+    # rewriting the same pair does not change states or arrays held by callers
+    qm.set(keys[0:2], [0.7, 0.1, 0.1, 0.1])
+    assert qm.get(keys[0]) is not old_state
+    assert qm.get(keys[0]).pair_id == old_state.pair_id
+    assert np.array_equal(old_state.state, [0.9, 0.05, 0.03, 0.02])
+    assert np.array_equal(old_values, [0.9, 0.05, 0.03, 0.02])
+
+    # nor does reusing a freed row for another pair
+    values = qm.get(keys[0]).state
+    qm.remove(keys[0])
+    qm.remove(keys[1])
+    qm.set(keys[2:4], [1, 0, 0, 0])
+    assert qm.get(keys[2]).pair_id == old_state.pair_id
+    assert np.array_equal(values, [0.7, 0.1, 0.1, 0.1])
+
+
+def test_qmanager_add_loss_fock():
+    TRUNCATION = 2
+    dim = TRUNCATION + 1
+    loss = 0.3
+    rng = np.random.default_rng(0)
+
+    qm = QuantumManagerDensityFock(truncation=TRUNCATION)
+    keys = [qm.new() for _ in range(3)]
+    ket = rng.random(dim ** 3) + 1j * rng.random(dim ** 3)
+    ket /= np.linalg.norm(ket)
+    qm.set(keys, ket)
+    qm.add_loss(keys[1], loss)
+
+    # reference: Kraus operators padded with identity on the full space
+    rho = np.outer(ket, ket.conj())
+    desired = np.zeros(rho.shape, dtype=complex)
+    for k in range(dim):
+        op = np.zeros((dim, dim))
+        for n in range(k, dim):
+            op[n - k, n] = math.sqrt(math.comb(n, k) * ((1 - loss) ** (n - k)) * (loss ** k))
+        full_op = np.kron(np.kron(np.eye(dim), op), np.eye(dim))
+        desired += full_op @ rho @ full_op.conj().T
+    assert np.allclose(qm.get(keys[0]).state, desired)
+
+    # Kraus operators are cached by (loss rate, truncation)
+    assert qm._build_loss_kraus_operators(loss) is qm._build_loss_kraus_operators(loss)
+
+
+def test_qmanager_sparse_fock():
+    TRUNCATION = 3
+    dim = TRUNCATION + 1
+
+    # two-mode squeezed vacuum on each pair of modes
+    tmsv = np.zeros(dim ** 2)
+    amps = np.array([0.5 ** n for n in range(dim)])
+    tmsv[[n * dim + n for n in range(dim)]] = amps / np.linalg.norm(amps)
+
+    results = []
+    for sparse in [False, True]:
+        qm = QuantumManagerDensityFock(truncation=TRUNCATION, sparse=sparse)
+        keys = [qm.new() for _ in range(4)]
+        qm.set(keys[0:2], tmsv)
+        qm.set(keys[2:4], tmsv)
+        qm.add_loss(keys[1], 0.2)
+
+        create, destroy = qm.build_ladder()
+        beam_splitter = expm((np.pi / 4) * (np.kron(create, destroy) - np.kron(destroy, create)))
+        qm.apply_operator(beam_splitter, [keys[1], keys[3]])
+
+        vacuum = np.zeros((dim ** 2, dim ** 2))
+        vacuum[0, 0] = 1
+        res = qm.measure([keys[1], keys[3]], [vacuum, np.eye(dim ** 2) - vacuum], 0.1)
+        results.append((res, qm.get(keys[0])))
+
+    (res_dense, state_dense), (res_sparse, state_sparse) = results
+    assert res_dense == res_sparse == 0
+    assert type(state_dense) is DensityState
+    assert type(state_sparse) is SparseDensityState
+    assert state_sparse.keys == state_dense.keys
+    assert np.allclose(state_sparse.state.toarray(), state_dense.state)
+
+    # states above the fill threshold are stored densely
+    qm = QuantumManagerDensityFock(truncation=TRUNCATION, sparse=True, sparse_fill_threshold=0.1)
+    keys = [qm.new(), qm.new()]
+    qm.set(keys, tmsv)
+    assert type(qm.get(keys[0])) is SparseDensityState
+    qm.set(keys, np.ones(dim ** 2) / dim)
+    assert type(qm.get(keys[0])) is DensityState
+
+
+def test_qmanager_apply_superoperator():
+    rng = np.random.default_rng(0)
+    amplitudes = rng.normal(size=8) + 1j * rng.normal(size=8)
+    amplitudes /= np.linalg.norm(amplitudes)
+
+    for channel, params in [("depolarizing", (0.3,)), ("dephasing", (0.2,)),
+                            ("amplitude_damping", (0.4,)), ("pauli", (0.1, 0.05, 0.2))]:
+        superop = build_channel_superoperator(channel, *params)
+        assert superop is build_channel_superoperator(channel, *params)
+        kraus_ops = CHANNEL_KRAUS_BUILDERS[channel](*params)
+
+        qm_superop = QuantumManagerDensity()
+        qm_kraus = QuantumManagerDensity()
+        keys = [qm_superop.new() for _ in range(4)]
+        assert [qm_kraus.new() for _ in range(4)] == keys
+        for qm in [qm_superop, qm_kraus]:
+            qm.set(keys[:3], amplitudes)
+
+        # shared state (in place)
+        state = qm_superop.get(keys[0])
+        qm_superop.apply_superoperator([keys[1]], superop)
+        qm_kraus.apply_channel([keys[1]], kraus_ops)
+        assert qm_superop.get(keys[0]) is state
+        assert np.allclose(state.state, qm_kraus.get(keys[0]).state)
+        assert np.isclose(np.trace(state.state), 1)
+
+        # separate states
+        two_qubit = kraus_to_superoperator(np.array([np.kron(k1, k2) for k1 in kraus_ops for k2 in kraus_ops]))
+        qm_superop.apply_superoperator([keys[3], keys[2]], two_qubit)
+        qm_kraus.apply_channel([keys[3], keys[2]], np.array([np.kron(k1, k2) for k1 in kraus_ops for k2 in kraus_ops]))
+        assert qm_superop.get(keys[0]).keys == qm_kraus.get(keys[0]).keys
+        assert np.allclose(qm_superop.get(keys[0]).state, qm_kraus.get(keys[0]).state)
+
+
+def test_qmanager_trajectory():
+    from sequence.components.memory import _p_xerr, _p_yerr, _p_zerr
+    from sequence.entanglement_management.purification import BBPSSW
+
+    # memory Pauli decoherence model
+    rates, t = (0.05, 0.01, 0.01), 1
+    kraus_ops = build_pauli_kraus_operators(_p_xerr(*rates, t), _p_yerr(*rates, t), _p_zerr(*rates, t))
+    phi_plus = np.array([1, 0, 0, 1]) / math.sqrt(2)
+
+    def purify(qm, samples, meas_samps):
+        # pairs (0, 1) and (2, 3); (0, 2) and (1, 3) are local to each node
+        keys = [qm.new() for _ in range(4)]
+        qm.set(keys[0:2], phi_plus)
+        qm.set(keys[2:4], phi_plus)
+        for key, samp in zip(keys, samples):
+            qm.apply_channel([key], kraus_ops, samp)
+        res0 = qm.run_circuit(BBPSSW.circuit, [keys[0], keys[2]], meas_samps[0])[keys[2]]
+        res1 = qm.run_circuit(BBPSSW.circuit, [keys[1], keys[3]], meas_samps[1])[keys[3]]
+        kept_state = qm.get(keys[0])
+        assert sorted(kept_state.keys) == sorted(keys[0:2])
+        for key in keys:
+            qm.release(key)
+        return res0, res1, kept_state.state
+
+    # density matrix reference (channel applied exactly, both outcomes forced to 0)
+    qm = QuantumManagerDensity()
+    keys = [qm.new(), qm.new()]
+    qm.set(keys, phi_plus)
+    qm.apply_channel([keys[0]], kraus_ops)
+    qm.apply_channel([keys[1]], kraus_ops)
+    noisy_fidelity = (phi_plus @ qm.get(keys[0]).state @ phi_plus).real
+    res0, res1, rho = purify(qm, [None] * 4, [1e-9] * 2)
+    assert res0 == res1 == 0
+    desired = (phi_plus @ rho @ phi_plus).real
+    assert desired > noisy_fidelity
+
+    # trajectories: average fidelity of runs with the same outcome
+    rng = np.random.default_rng(0)
+    qm = QuantumManagerTrajectory()
+    assert qm.formalism == KET_STATE_FORMALISM
+    fidelities = []
+    for _ in range(2000):
+        res0, res1, ket = purify(qm, rng.random(4), rng.random(2))
+        if res0 == res1 == 0:
+            fidelities.append(abs(phi_plus @ ket) ** 2)
+    assert len(fidelities) > 500
+    assert abs(np.mean(fidelities) - desired) < 0.03
+
+
+def test_qmanager_mps():
+    # same results and states as the ket vector manager
+    rng = np.random.default_rng(0)
+    circuit = Circuit(3)
+    circuit.h(0)
+    circuit.cx(0, 2)
+    circuit.cx(2, 1)
+    circuit.t(1)
+    circuit.measure(1)
+    for _ in range(20):
+        qm_ket = QuantumManagerKet()
+        qm_mps = QuantumManagerMPS()
+        keys_ket = [qm_ket.new() for _ in range(4)]
+        keys_mps = [qm_mps.new() for _ in range(4)]
+        ket = rng.random(4) + 1j * rng.random(4)
+        ket /= np.linalg.norm(ket)
+        qm_ket.set(keys_ket[2:], ket)
+        qm_mps.set(keys_mps[2:], ket)
+        samp = rng.random()
+        res_ket = qm_ket.run_circuit(circuit, [keys_ket[3], keys_ket[0], keys_ket[2]], samp)
+        res_mps = qm_mps.run_circuit(circuit, [keys_mps[3], keys_mps[0], keys_mps[2]], samp)
+        assert list(res_ket.values()) == list(res_mps.values())
+        for key_ket, key_mps in zip(keys_ket, keys_mps):
+            state_ket, state_mps = qm_ket.get(key_ket), qm_mps.get(key_mps)
+            assert [keys_ket.index(k) for k in state_ket.keys] == [keys_mps.index(k) for k in state_mps.keys]
+            assert np.isclose(abs(np.vdot(state_ket.state, state_mps.state)), 1)
+
+    # linear cluster state: bond dimension stays 2
+    num_qubits = 30
+    qm = QuantumManagerMPS()
+    keys = [qm.new() for _ in range(num_qubits)]
+    h, cz = Circuit(1), Circuit(2)
+    h.h(0)
+    cz.cz(0, 1)
+    for key in keys:
+        qm.run_circuit(h, [key])
+    for key1, key2 in zip(keys, keys[1:]):
+        qm.run_circuit(cz, [key1, key2])
+    assert qm.get(keys[0]).keys == keys
+    assert qm.get(keys[0]).bond_dims == [2] * (num_qubits - 1)
+
+    # measuring a middle qubit in the Z basis cuts the chain
+    meas = Circuit(1)
+    meas.measure(0)
+    qm.run_circuit(meas, [keys[10]], 0.5)
+    assert qm.get(keys[0]).keys == keys[:10]
+    assert qm.get(keys[11]).keys == keys[11:]
+    assert qm.get(keys[10]).keys == [keys[10]]
+    assert qm.truncation_error == 0
+
+    # bond dimension truncation
+    qm = QuantumManagerMPS(max_bond_dim=1)
+    keys = [qm.new(), qm.new()]
+    qm.set(keys, [math.sqrt(0.8), 0, 0, math.sqrt(0.2)])
+    assert qm.get(keys[0]).bond_dims == [1]
+    assert np.allclose(qm.get(keys[0]).state, [1, 0, 0, 0])
+    assert np.isclose(qm.truncation_error, 0.2)
+
+
+def test_qmanager_hybrid():
+    def as_density(state):
+        state = np.array(state)
+        return np.outer(state, state.conj()) if state.ndim == 1 else state
+
+    qm = QuantumManagerHybrid()
+    qm_density = QuantumManagerDensity()
+    keys = [qm.new() for _ in range(3)]
+    assert [qm_density.new() for _ in range(3)] == keys
+
+    def check(types):
+        for key, state_type in zip(keys, types):
+            assert type(qm.get(key)) is state_type
+            assert qm.get(key).keys == qm_density.get(key).keys
+            assert np.allclose(as_density(qm.get(key).state), qm_density.get(key).state)
+
+    # unitary circuits keep kets
+    circuit = Circuit(2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    for manager in [qm, qm_density]:
+        manager.run_circuit(circuit, keys[:2])
+    check([KetState, KetState, KetState])
+
+    # noise promotes only the affected compound state
+    superop = build_channel_superoperator("depolarizing", 0.2)
+    for manager in [qm, qm_density]:
+        manager.apply_superoperator([keys[1]], superop)
+    check([DensityState, DensityState, KetState])
+
+    # circuits combining promoted and ket states run on density matrices
+    circuit = Circuit(2)
+    circuit.cx(0, 1)
+    for manager in [qm, qm_density]:
+        manager.run_circuit(circuit, [keys[1], keys[2]])
+    check([DensityState] * 3)
+
+    # measurement results in pure states, which are demoted
+    circuit = Circuit(3)
+    for i in range(3):
+        circuit.measure(i)
+    assert qm.run_circuit(circuit, keys, 0.6) == qm_density.run_circuit(circuit, keys, 0.6)
+    check([KetState] * 3)
+
+    # channels preserving purity, and pure density matrices given to set
+    kraus_ops = build_amplitude_damping_kraus_operators(1)
+    for manager in [qm, qm_density]:
+        manager.apply_channel([keys[0]], kraus_ops)
+        manager.set(keys[1:], np.diag([0, 0, 1, 0]))
+    check([KetState] * 3)
+
+
+def test_qmanager_state_limits():
+    import pytest
+
+    qm = QuantumManagerKet()
+    keys = [qm.new() for _ in range(4)]
+    qm.set(keys[2:], [0.5] * 4)
+    stats = qm.get_state_statistics()
+    assert stats["num_states"] == 3
+    assert stats["size_histogram"] == {1: 2, 2: 1}
+    assert stats["total_bytes"] == 2 * 32 + 64
+
+    circuit = Circuit(2)
+    circuit.cx(0, 1)
+    qm.set_state_limits(max_state_size=3)
+    qm.run_circuit(circuit, keys[1:3])
+    assert len(qm.get(keys[1]).keys) == 3
+    with pytest.raises(StateLimitError, match="run_circuit on keys"):
+        qm.run_circuit(circuit, keys[:2])
+    with pytest.raises(StateLimitError, match="set"):
+        qm.set(keys, [0.25] * 16)
+    # states are unchanged after the error
+    assert len(qm.get(keys[0]).keys) == 1
+
+    # memory of the replaced states is not counted
+    qm.set_state_limits(max_total_bytes=200)
+    qm.set(keys[1:], [1 / np.sqrt(8)] * 8)
+    with pytest.raises(StateLimitError, match="max_total_bytes"):
+        qm.run_circuit(circuit, keys[:2])
+
+    # density matrices are estimated as such
+    qm = QuantumManagerDensity()
+    keys = [qm.new() for _ in range(2)]
+    qm.set_state_limits(max_total_bytes=256)
+    qm.run_circuit(circuit, keys)
+    assert qm.get_state_statistics()["total_bytes"] == 256
+    key = qm.new()
+    with pytest.raises(StateLimitError, match="apply_channel"):
+        qm.apply_channel([keys[0], key], np.array([np.identity(4)]))
+
+    # promotion from ket to density matrix in the hybrid manager
+    qm = QuantumManagerHybrid()
+    keys = [qm.new() for _ in range(2)]
+    qm.set_state_limits(max_total_bytes=200)
+    qm.run_circuit(circuit, keys)
+    with pytest.raises(StateLimitError, match="apply_superoperator"):
+        qm.apply_superoperator([keys[0]], build_channel_superoperator("dephasing", 0.1))
+
+
+def test_qmanager_state_dict_total_bytes():
+    def check(qm):
+        assert qm.states.total_bytes == qm.get_state_statistics()["total_bytes"]
+
+    circuit = Circuit(2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.measure(1)
+
+    # states are only tracked while a memory limit is set
+    qm = QuantumManagerKet()
+    keys = [qm.new() for _ in range(4)]
+    assert type(qm.states) is dict
+    qm.set_state_limits(max_total_bytes=10 ** 6)
+    assert type(qm.states) is StateDict
+    check(qm)
+    qm.run_circuit(circuit, keys[:2], meas_samp=0.2)
+    qm.set(keys[1:], [0.5] * 4 + [0] * 4)
+    check(qm)
+    qm.remove(keys[0])
+    qm.release(keys[1])
+    check(qm)
+    qm.states.pop(keys[2])
+    del qm.states[keys[3]]
+    check(qm)
+    qm.set_state_limits()
+    assert type(qm.states) is dict
+
+    qm = QuantumManagerBellDiagonal()
+    qm.set_state_limits(max_total_bytes=10 ** 6)
+    keys = [qm.new() for _ in range(4)]
+    qm.set(keys[:2], [1, 0, 0, 0])
+    qm.set(keys[2:], [1, 0, 0, 0])
+    qm.set(keys[:2], [0.7, 0.1, 0.1, 0.1])
+    check(qm)
+    qm.set([keys[0]], [1, 0])
+    assert qm.states.total_bytes == 64
+    qm.remove(keys[1])
+    check(qm)
+
+    # states given to set_states are tracked
+    qm = QuantumManagerHybrid()
+    qm.set_state_limits(max_total_bytes=10 ** 6)
+    assert qm._density_manager.states is qm.states
+    qm.set_states({0: KetState([1, 0], [0])})
+    assert qm._ket_manager.states is qm.states
+    assert qm.states.total_bytes == 32
+
+
+def test_qmanager_checkpoint(tmp_path):
+    path = str(tmp_path / "states.ckpt")
+    rng = np.random.default_rng(0)
+    amplitudes = rng.normal(size=4) + 1j * rng.normal(size=4)
+    amplitudes /= np.linalg.norm(amplitudes)
+
+    for manager_class, values in [(QuantumManagerKet, amplitudes),
+                                  (QuantumManagerDensity, np.outer(amplitudes, amplitudes.conj())),
+                                  (QuantumManagerBellDiagonal, [0.9, 0.05, 0.03, 0.02])]:
+        qm = manager_class()
+        keys = [qm.new() for _ in range(3)]
+        qm.set(keys[1:], values)
+        qm.save_checkpoint(path)
+
+        restored = manager_class()
+        restored.load_checkpoint(path)
+        assert restored.states.keys() == qm.states.keys()
+        for key in qm.states:
+            assert restored.get(key).keys == qm.get(key).keys
+            assert np.array_equal(restored.get(key).state, qm.get(key).state)
+        assert restored.get(keys[1]) is restored.get(keys[2])
+        assert restored.new() not in keys
@@ -1,8 +1,9 @@
 from math import sqrt
+import numpy as np
 from numpy.random import default_rng
 import pytest
 
-from sequence.kernel.quantum_state import KetState, FreeQuantumState
+from sequence.kernel.quantum_state import KetState, DensityState, BellDiagonalState, FreeQuantumState, State
 from sequence.utils.encoding import polarization
 
 
@@ -44,6 +45,34 @@ def test_build_ket():
         _ = KetState(amps, keys)
 
 
+def test_build_trusted():
+    keys = [0]
+
+    amps = [complex(0), complex(1.j)]
+    ket = KetState.trusted(amps, keys)
+    assert type(ket) is KetState
+    assert ket.keys == keys and ket.truncation == 1
+    assert np.array_equal(ket.state, KetState(amps, keys).state)
+
+    density = DensityState.trusted(amps, keys)
+    assert np.array_equal(density.state, DensityState(amps, keys).state)
+
+    # validation is skipped
+    amps = [complex(3/2), complex(0)]
+    _ = KetState.trusted(amps, keys)
+    _ = DensityState.trusted(amps, keys)
+
+    # unless enabled in debug mode
+    State.validate_all = True
+    try:
+        with pytest.raises(AssertionError, match="Illegal value with abs > 1 in ket vector"):
+            _ = KetState.trusted(amps, keys)
+        with pytest.raises(AssertionError, match="density matrix trace must be 1"):
+            _ = DensityState.trusted(amps, keys)
+    finally:
+        State.validate_all = False
+
+
 def test_measure():
     qs = FreeQuantumState()
     states = [(complex(1), complex(0)),
@@ -128,3 +157,29 @@ def test_polarization_noise():
     qs = FreeQuantumState()
     pass
 
+
+
+def test_serialize_binary():
+    keys = [2 ** 127 + 5, 3]  # uuid-sized key
+    ket = KetState([sqrt(1 / 2), 0, 0, 1j * sqrt(1 / 2)], keys)
+    density = DensityState([[0.5, 0.5], [0.5, 0.5]], [7], truncation=1)
+    bds = BellDiagonalState([0.7, 0.1, 0.1, 0.1], keys)
+
+    for state in [ket, density, bds]:
+        header, payload = state.serialize_binary()
+        assert len(header) % 16 == 0
+        data = bytearray(header + payload)
+        new_state = State.deserialize_binary(data)
+
+        assert type(new_state) is type(state)
+        assert new_state.keys == state.keys
+        assert np.array_equal(new_state.state, state.state)
+        # state array is a view of the received buffer, not a copy
+        assert np.shares_memory(new_state.state, np.frombuffer(data, dtype=np.uint8))
+
+    # state buffer is sent without copying
+    header, payload = ket.serialize_binary()
+    assert np.shares_memory(np.asarray(payload), ket.state)
+
+    with pytest.raises(NotImplementedError):
+        FreeQuantumState().serialize_binary()
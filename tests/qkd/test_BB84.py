@@ -70,6 +70,9 @@ def test_BB84_polarization():
     tl.init()
     tl.run()
     assert pa.counter == pb.counter == 10
+    # sifted key bits are stored as Python integers
+    for node in [alice, bob]:
+        assert all(type(bit) is int for bit in node.protocol_stack[0].key_bits)
 
 
 def test_BB84_time_bin():
@@ -141,3 +141,59 @@ def test_ClassicalNode_send_message():
     expect_node2_log = [(CC_DELAY + i, "node1", str(i)) for i in range(MSG_NUM)]
     for actual, expect in zip(node2.log, expect_node2_log):
         assert actual == expect
+
+
+def test_QKDNode_get_bits():
+    import numpy as np
+    from sequence.topology.node import QKDNode
+    from sequence.components.detector import TimeBuffer
+    from sequence.utils.encoding import time_bin
+
+    FREQ = 1e8
+    START = 1000
+    LIGHT_TIME = 1e-5
+    NUM_BITS = 1000
+    period = 1e12 / FREQ
+    rng = np.random.default_rng(0)
+
+    def set_times(qsdetector, times_list):
+        for buffer, times in zip(qsdetector.trigger_times, times_list):
+            for t in sorted(times):
+                buffer.append(t)
+
+    # polarization: single clicks give the bit, clicks on both detectors are ambiguous
+    tl = Timeline()
+    node = QKDNode("node", tl, stack_size=0)
+    periods = rng.permutation(NUM_BITS)
+    ones, zeros, both = periods[:300], periods[300:600], periods[600:700]
+    jitter = lambda n: rng.integers(-int(period) // 3, int(period) // 3, n)
+    times_0 = list(START + zeros * period + jitter(len(zeros))) + list(START + both * period)
+    times_1 = list(START + ones * period + jitter(len(ones))) + list(START + both * period + 5)
+    times_0.append(START - 10 * period)  # out of range
+    set_times(node.components["node.qsdetector"], [times_0, times_1])
+
+    bits = node.get_bits(LIGHT_TIME, START, FREQ, "node.qsdetector")
+    assert bits.dtype == np.int8 and len(bits) == NUM_BITS
+    expected = np.full(NUM_BITS, -1)
+    expected[zeros] = 0
+    expected[ones] = 1
+    assert (bits == expected).all()
+
+    # time bin: early/late detector and interferometer detectors, with window checks
+    tl = Timeline()
+    node = QKDNode("node", tl, encoding=time_bin, stack_size=0)
+    sep = time_bin["bin_separation"]
+    early, late, x_0, x_1, both, outside, _ = np.split(rng.permutation(NUM_BITS), [150, 300, 450, 600, 700, 800])
+    times_0 = list(START + early * period) + list(START + late * period + sep) \
+        + list(START + both * period) + list(START + outside * period + 3 * sep)
+    times_1 = list(START + x_0 * period + sep) + list(START + both * period + sep)
+    times_2 = list(START + x_1 * period + sep + 100)
+    set_times(node.components["node.qsdetector"], [times_0, times_1, times_2])
+
+    bits = node.get_bits(LIGHT_TIME, START, FREQ, "node.qsdetector")
+    expected = np.full(NUM_BITS, -1)
+    expected[early] = 0
+    expected[late] = 1
+    expected[x_0] = 0
+    expected[x_1] = 1
+    assert (bits == expected).all()
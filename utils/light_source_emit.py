@@ -0,0 +1,45 @@
+"""Throughput of LightSource.emit for a BB84 pulse train.
+
+Times emission of a train of polarization-encoded pulses at 80 MHz, including delivery of photons to a receiver
+by the timeline.
+"""
+
+import time
+import numpy as np
+
+from sequence.components.light_source import LightSource
+from sequence.kernel.timeline import Timeline
+from sequence.utils.encoding import polarization
+
+
+NUM_TRIALS = 3
+NUM_PULSES = 200000
+FREQUENCY = 8e7
+MEAN_PHOTON_NUM = 0.1
+
+
+class Receiver:
+    def __init__(self):
+        self.counter = 0
+
+    def get(self, photon):
+        self.counter += 1
+
+
+rng = np.random.default_rng(0)
+bases = rng.integers(2, size=NUM_PULSES)
+bits = rng.integers(2, size=NUM_PULSES)
+state_list = [polarization["bases"][basis][bit] for basis, bit in zip(bases, bits)]
+
+rates = []
+for _ in range(NUM_TRIALS):
+    tl = Timeline()
+    ls = LightSource("ls", tl, frequency=FREQUENCY, mean_photon_num=MEAN_PHOTON_NUM)
+    receiver = Receiver()
+    ls.add_receiver(receiver)
+    tl.init()
+    start = time.time()
+    ls.emit(state_list)
+    tl.run()
+    rates.append(NUM_PULSES / (time.time() - start))
+print("{:.0f} pulses/s ({} photons per run)".format(np.mean(rates), receiver.counter))
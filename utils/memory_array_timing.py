@@ -0,0 +1,45 @@
+"""Timing of parameter updates and state queries on a large MemoryArray.
+
+Times updating every memory parameter set in the examples (`update_memory_params`),
+and reading the fidelity and expiration time of all memories.
+"""
+
+import time
+import numpy as np
+
+from sequence.kernel.timeline import Timeline
+from sequence.components.memory import MemoryArray
+
+
+NUM_TRIALS = 5
+NUM_MEMORIES = 2000
+NUM_RUNS = 100
+
+tl = Timeline()
+memory_array = MemoryArray("memory_array", tl, num_memories=NUM_MEMORIES)
+
+update_times = []
+query_times = []
+for _ in range(NUM_TRIALS):
+    start = time.time()
+    for _ in range(NUM_RUNS):
+        memory_array.update_memory_params("frequency", 2e3)
+        memory_array.update_memory_params("coherence_time", 1.3)
+        memory_array.update_memory_params("efficiency", 0.75)
+        memory_array.update_memory_params("raw_fidelity", 0.9)
+    update_times.append((time.time() - start) / NUM_RUNS)
+
+    start = time.time()
+    for _ in range(NUM_RUNS):
+        fidelities = np.array([memory.fidelity for memory in memory_array])
+        expire_times = np.array([memory.get_expire_time() for memory in memory_array])
+    query_times.append((time.time() - start) / NUM_RUNS)
+
+print("update parameters: {:.3e} s".format(np.mean(update_times)))
+print("query memories (per-memory access): {:.3e} s".format(np.mean(query_times)))
+if hasattr(memory_array, "get_memory_params"):
+    start = time.time()
+    for _ in range(NUM_RUNS):
+        fidelities = memory_array.get_memory_params("fidelity")
+        expire_times = memory_array.get_memory_params("expire_time")
+    print("query memories (columns): {:.3e} s".format((time.time() - start) / NUM_RUNS))
@@ -0,0 +1,38 @@
+"""Timing of memory expiration scheduling under entanglement churn.
+
+Memories of a large memory array are repeatedly written (scheduling expiration) and reset (cancelling it),
+as during entanglement generation, while simulation time advances.
+Reports the time per write/reset and the number of events pushed to the timeline.
+"""
+
+import time
+import numpy as np
+
+from sequence.kernel.timeline import Timeline
+from sequence.components.memory import MemoryArray
+
+
+NUM_TRIALS = 3
+NUM_MEMORIES = 1000
+NUM_ROUNDS = 50
+ROUND_TIME = int(1e9)  # 1 ms
+
+rng = np.random.default_rng(0)
+times = []
+for _ in range(NUM_TRIALS):
+    tl = Timeline()
+    memory_array = MemoryArray("memory_array", tl, num_memories=NUM_MEMORIES, coherence_time=1)
+    tl.init()
+
+    start = time.time()
+    for i in range(NUM_ROUNDS):
+        tl.time = i * ROUND_TIME
+        for memory in memory_array:
+            memory.update_state([complex(1), complex(0)])
+        for index in rng.choice(NUM_MEMORIES, NUM_MEMORIES // 2, replace=False):
+            memory_array[index].reset()
+    times.append(time.time() - start)
+
+print("time per write/reset: {:.3e} s".format(np.mean(times) / (NUM_ROUNDS * NUM_MEMORIES * 1.5)))
+print("events scheduled: {}".format(tl.schedule_counter))
+print("events in timeline heap: {}".format(len(tl.events)))
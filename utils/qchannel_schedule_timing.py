@@ -0,0 +1,37 @@
+"""Timing of QuantumChannel.schedule_transmit on a router with many memories.
+
+Every round, each memory of a router reserves a transmission time bin on the quantum channel to a BSM node
+(as in entanglement generation), with all memories requesting the same minimum time.
+"""
+
+import time
+import numpy as np
+
+from sequence.kernel.timeline import Timeline
+from sequence.topology.node import QuantumRouter, BSMNode
+from sequence.components.optical_channel import QuantumChannel
+
+
+NUM_TRIALS = 3
+NUM_MEMORIES = 200
+NUM_ROUNDS = 50
+ROUND_TIME = int(1e9)  # 1 ms
+
+times = []
+for _ in range(NUM_TRIALS):
+    tl = Timeline()
+    router = QuantumRouter("router", tl, memo_size=NUM_MEMORIES)
+    bsm_node = BSMNode("bsm_node", tl, ["router", "other"])
+    qc = QuantumChannel("qc", tl, attenuation=0.0002, distance=1e3)
+    qc.set_ends(router, bsm_node.name)
+    tl.init()
+
+    start = time.time()
+    for i in range(NUM_ROUNDS):
+        tl.time = i * ROUND_TIME
+        for _ in range(NUM_MEMORIES):
+            router.schedule_qubit(bsm_node.name, tl.now())
+    times.append(time.time() - start)
+
+print("{} memories, {} rounds: {:.3f} s ({:.0f} reservations/s)".format(
+    NUM_MEMORIES, NUM_ROUNDS, np.mean(times), NUM_MEMORIES * NUM_ROUNDS / np.mean(times)))
@@ -0,0 +1,41 @@
+"""Timing of QKDNode.get_bits on a BB84 frame of 10^6 pulses.
+
+Detection times are written directly to the detector buffers of a QKD node (polarization and time bin encodings),
+with one detection in 10% of periods, then converted to bits.
+"""
+
+import time
+import numpy as np
+
+from sequence.kernel.timeline import Timeline
+from sequence.topology.node import QKDNode
+from sequence.utils.encoding import polarization, time_bin
+
+
+NUM_TRIALS = 3
+NUM_PULSES = 10 ** 6
+FREQUENCY = 8e7
+DETECTION_RATE = 0.1
+START_TIME = 0
+
+rng = np.random.default_rng(0)
+period = 1e12 / FREQUENCY
+light_time = NUM_PULSES / FREQUENCY
+
+for encoding in [polarization, time_bin]:
+    num_detectors = 2 if encoding is polarization else 3
+    times = []
+    for _ in range(NUM_TRIALS):
+        tl = Timeline()
+        node = QKDNode("node", tl, encoding=encoding, stack_size=0)
+        qsdetector = node.components["node.qsdetector"]
+        pulses = np.flatnonzero(rng.random(NUM_PULSES) < DETECTION_RATE)
+        detectors = rng.integers(num_detectors, size=len(pulses))
+        for i, buffer in enumerate(qsdetector.trigger_times):
+            for t in (START_TIME + pulses[detectors == i] * period).astype(np.int64):
+                buffer.append(t)
+
+        start = time.time()
+        node.get_bits(light_time, START_TIME, FREQUENCY, "node.qsdetector")
+        times.append(time.time() - start)
+    print("{}: {:.3f} s per frame".format(encoding["name"], np.mean(times)))
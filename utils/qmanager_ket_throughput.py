@@ -0,0 +1,65 @@
+"""Throughput of QuantumManagerKet.run_circuit.
+
+Times single-qubit gates, two-qubit gates on an existing entangled state, and entanglement generation with
+measurement, with state validation disabled (default) and enabled (debug mode, see `State.validate_all`).
+"""
+
+import time
+import numpy as np
+
+from sequence.kernel.quantum_manager import QuantumManagerKet
+from sequence.kernel.quantum_state import State
+from sequence.components.circuit import Circuit
+
+
+NUM_TRIALS = 5
+NUM_RUNS = 20000
+NUM_QUBITS = 8
+
+h_circ = Circuit(1)
+h_circ.h(0)
+cx_circ = Circuit(2)
+cx_circ.cx(0, 1)
+bell_circ = Circuit(2)
+bell_circ.h(0)
+bell_circ.cx(0, 1)
+bell_circ.measure(0)
+bell_circ.measure(1)
+
+
+def single_qubit(qm, rng):
+    key = qm.new()
+    for _ in range(NUM_RUNS):
+        qm.run_circuit(h_circ, [key])
+    return NUM_RUNS
+
+
+def two_qubit(qm, rng):
+    keys = [qm.new() for _ in range(NUM_QUBITS)]
+    qm.set(keys, np.ones(2 ** NUM_QUBITS) / np.sqrt(2 ** NUM_QUBITS))
+    num_runs = NUM_RUNS // 10
+    for i in range(num_runs):
+        qm.run_circuit(cx_circ, [keys[i % NUM_QUBITS], keys[(i + 1) % NUM_QUBITS]])
+    return num_runs
+
+
+def entangle_measure(qm, rng):
+    keys = [qm.new(), qm.new()]
+    for _ in range(NUM_RUNS):
+        qm.run_circuit(bell_circ, keys, rng.random())
+    return NUM_RUNS
+
+
+rng = np.random.default_rng(0)
+for validate in [False, True]:
+    State.validate_all = validate
+    print("validate_all = {}".format(validate))
+    for func in [single_qubit, two_qubit, entangle_measure]:
+        rates = []
+        for _ in range(NUM_TRIALS):
+            qm = QuantumManagerKet()
+            start = time.time()
+            num_runs = func(qm, rng)
+            rates.append(num_runs / (time.time() - start))
+        print("\t{}: {:.0f} circuits/s".format(func.__name__, np.mean(rates)))
+State.validate_all = False